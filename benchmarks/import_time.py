@@ -0,0 +1,101 @@
+"""
+Import cost of lifecycle_manager.py, measured with python -X importtime.
+
+Run from the plugin root:
+
+    python benchmarks/import_time.py [--runs 5] [--budget-ms 60] [--json]
+
+Each scenario imports the module in a fresh interpreter and touches what a
+caller of that kind needs: 'profile' only the profile store API, 'lifecycle'
+the lifecycle manager class as well. Reported is the cumulative import time
+of lifecycle_manager (best and median over the runs) and the heavy modules
+the scenario pulled in. The 'profile' scenario must not load SQLAlchemy,
+structlog or asyncio; with --budget-ms it also has to stay under the budget.
+The exit status is 1 when either check fails, so this can gate CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = ('sqlalchemy', 'structlog', 'asyncio', 'concurrent.futures', 'sqlite3', 'uuid')
+PROFILE_FORBIDDEN = ('sqlalchemy', 'structlog', 'asyncio')
+
+SCENARIOS = {
+    'profile': "lm.handle_profile_api",
+    'lifecycle': "lm.handle_profile_api; lm.BrainDriveWhyDetectorLifecycleManager",
+}
+
+
+def run_once(touch: str):
+    code = (
+        f"import sys, json; sys.path.insert(0, {ROOT!r}); "
+        f"import lifecycle_manager as lm; {touch}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    # Bytecode must be cached, as it is in a deployed plugin
+    env = {key: value for key, value in os.environ.items() if key != 'PYTHONDONTWRITEBYTECODE'}
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, cwd=ROOT, env=env, check=True)
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, self_us, cumulative, name = (part.strip() for part in line.replace('import time:', '|', 1).split('|'))
+        if name == 'lifecycle_manager':
+            cumulative_us = int(cumulative)
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return cumulative_us / 1000.0, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="fail when the 'profile' import takes longer (best run)")
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    # Warm-up writes the bytecode cache so compilation is not counted
+    run_once(SCENARIOS['profile'])
+
+    results = {}
+    for name, touch in SCENARIOS.items():
+        timings, loaded = [], []
+        for _ in range(args.runs):
+            ms, loaded = run_once(touch)
+            timings.append(ms)
+        results[name] = {
+            'best_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'heavy_modules': loaded,
+        }
+
+    failures = []
+    forbidden = [m for m in results['profile']['heavy_modules'] if m in PROFILE_FORBIDDEN]
+    if forbidden:
+        failures.append(f"profile import loaded {', '.join(forbidden)}")
+    if args.budget_ms is not None and results['profile']['best_ms'] > args.budget_ms:
+        failures.append(f"profile import took {results['profile']['best_ms']} ms "
+                        f"(budget {args.budget_ms} ms)")
+
+    if args.json:
+        print(json.dumps({'runs': args.runs, 'scenarios': results, 'failures': failures}, indent=2))
+    else:
+        print(f"lifecycle_manager import, {args.runs} runs")
+        print(f"{'scenario':<10} {'best ms':>8} {'median ms':>10}  heavy modules loaded")
+        for name, result in results.items():
+            print(f"{name:<10} {result['best_ms']:>8.1f} {result['median_ms']:>10.1f}  "
+                  f"{', '.join(result['heavy_modules']) or '-'}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
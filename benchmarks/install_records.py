@@ -0,0 +1,70 @@
+"""
+Per-install CPU spent building the rows and statements for one user.
+
+Run from the plugin root:
+
+    python benchmarks/install_records.py [--users 10000] [--rounds 5]
+
+"cached" is the normal path: statements are module constants and the static
+plugin/module/page columns are serialized once per manager class, so each
+install only fills in ids and timestamps. "uncached" clears the class
+templates and rebuilds the text() statements for every user, which is the
+work every install did before they were cached. No database is involved.
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lifecycle_manager as lm  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+
+def build_rows(manager, user_id: str, current_time: str, uncached: bool):
+    if uncached:
+        type(manager)._install_row_templates = None
+        statements = [text(sql) for sql in (lm.PLUGIN_INSERT_SQL, lm.MODULE_INSERT_SQL, lm.PAGE_INSERT_SQL)]
+    else:
+        statements = [lm.STATEMENTS.PLUGIN_INSERT, lm.STATEMENTS.MODULE_INSERT, lm.STATEMENTS.PAGE_INSERT]
+    plugin_row = manager._plugin_record(user_id, current_time)
+    module_rows = manager._module_records(user_id, plugin_row['id'], current_time)
+    page_row = manager._page_record(user_id, module_rows[0]['id'])
+    return statements, plugin_row, module_rows, page_row
+
+
+def measure(manager, user_ids, uncached: bool, rounds: int) -> float:
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for user_id in user_ids:
+            build_rows(manager, user_id, current_time, uncached)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    manager = lm.BrainDriveWhyDetectorLifecycleManager()
+    user_ids = [f"user_{i:06d}" for i in range(args.users)]
+
+    uncached = measure(manager, user_ids, True, args.rounds)
+    cached = measure(manager, user_ids, False, args.rounds)
+    print(f"{args.users} installs, best of {args.rounds} rounds")
+    print(f"{'path':<10} {'us/install':>11}")
+    print(f"{'uncached':<10} {uncached / args.users * 1e6:>11.1f}")
+    print(f"{'cached':<10} {cached / args.users * 1e6:>11.1f}")
+    print(f"saved {(uncached - cached) / args.users * 1e6:.1f} us per install "
+          f"({1 - cached / uncached:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Size and speed of the profile store encodings on realistic Ikigai profiles.
+
+Run from the plugin root:
+
+    python benchmarks/profile_encoding.py [--profiles 1000] [--rounds 5]
+
+Each profile has the four Ikigai buckets, the four overlaps and keyPatterns,
+at the lengths the frontend caps them to (5 bullets / 3 for overlaps,
+200-character summaries). Every encoding is measured with the stdlib json
+module and, if it is installed, with orjson.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lifecycle_manager as lm  # noqa: E402
+
+WORDS = (
+    "helping people grow teaching mentoring building tools that make work "
+    "simpler writing clear explanations listening closely to what others need "
+    "solving hard problems patiently designing systems sharing knowledge openly "
+    "community learning creativity craft curiosity trust impact fairness"
+).split()
+
+
+def sentence(rng: random.Random, max_len: int = 200) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(12, 40))]
+    return (' '.join(words).capitalize() + '.')[:max_len]
+
+
+def bucket(rng: random.Random, bullets: int) -> dict:
+    return {
+        'bullets': [sentence(rng, 80) for _ in range(bullets)],
+        'summary': sentence(rng),
+    }
+
+
+def make_ikigai_profile(rng: random.Random, i: int) -> dict:
+    return {
+        'id': f"ikigai_{1700000000000 + i}_{rng.getrandbits(32):08x}",
+        'name': f"Profile {i}",
+        'createdAt': f"2025-01-{1 + i % 28:02d}T12:00:00.000Z",
+        'sourceWhyProfileId': f"why_{1700000000000 + i}",
+        'whyStatement': sentence(rng),
+        'love': bucket(rng, 5),
+        'goodAt': bucket(rng, 5),
+        'worldNeeds': bucket(rng, 5),
+        'paidFor': bucket(rng, 5),
+        'overlaps': {name: bucket(rng, 3) for name in ('passion', 'mission', 'profession', 'vocation')},
+        'keyPatterns': [sentence(rng, 120) for _ in range(5)],
+        'autoFilledPhases': {'love': False, 'goodAt': False, 'worldNeeds': True, 'paidFor': False},
+        'isComplete': True,
+        '_filename': f"ab/cd/ikigai_{i}.json",
+        '_savedAt': "2025-01-01T12:00:00",
+    }
+
+
+def measure(profiles, encoding: str, rounds: int):
+    best_encode = best_decode = float('inf')
+    total = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        payloads = [lm.encode_profile_payload(p, encoding) for p in profiles]
+        best_encode = min(best_encode, time.perf_counter() - start)
+        start = time.perf_counter()
+        for payload in payloads:
+            lm.decode_profile_payload(payload)
+        best_decode = min(best_decode, time.perf_counter() - start)
+        total = sum(len(payload) for payload in payloads)
+    return total, best_encode, best_decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    profiles = [make_ikigai_profile(rng, i) for i in range(args.profiles)]
+
+    codecs = [('stdlib', None)]
+    if lm.orjson is not None:
+        codecs.append(('orjson', lm.orjson))
+
+    # Sizes are relative to stdlib indented JSON, which is what older versions wrote
+    lm.orjson = None
+    baseline = measure(profiles, 'json-indent', 1)[0]
+    print(f"{args.profiles} Ikigai profiles, best of {args.rounds} rounds")
+    print(f"{'encoding':<12} {'codec':<7} {'avg bytes':>10} {'size':>7} {'encode us':>10} {'decode us':>10}")
+    for codec_name, module in codecs:
+        lm.orjson = module
+        for encoding in lm.PROFILE_ENCODINGS:
+            total, encode_s, decode_s = measure(profiles, encoding, args.rounds)
+            print(f"{encoding:<12} {codec_name:<7} {total / len(profiles):>10.0f} "
+                  f"{total / baseline:>6.0%} "
+                  f"{encode_s / len(profiles) * 1e6:>10.1f} {decode_s / len(profiles) * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+Benchmark suite for the profile store and the plugin lifecycle.
+
+Run from the plugin root:
+
+    python benchmarks/suite.py [--scales 10,1000,10000,100000]
+                               [--backends json,sqlite] [--sample 200]
+                               [--lifecycle-users 200] [--output results.json]
+                               [--compare previous.json]
+
+Profile store: for every backend and scale, a fresh temporary plugin
+directory is seeded with that many synthetic Why and Ikigai profiles
+through save_*_profile (the seeding itself is the save measurement), then
+load_*_profiles, get_*_profile, handle_profile_api ('list', 'get', 'load',
+'search') and delete_*_profile are timed. Single-call operations are
+sampled --sample times and reported with mean/p50/p95.
+
+Lifecycle: install_plugin, get_plugin_status, get_plugin_status_many and
+delete_plugin run against an in-memory SQLite AsyncSession (aiosqlite)
+holding the plugin, module and pages tables.
+
+Results are written as JSON (stdout by default) together with the git
+commit, so runs can be compared across commits; --compare prints the
+ratio of every mean against an earlier results file.
+"""
+
+import argparse
+import asyncio
+import datetime
+import importlib.util
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import lifecycle_manager as lm  # noqa: E402
+from profile_encoding import WORDS, make_ikigai_profile, sentence  # noqa: E402
+
+LIFECYCLE_SCHEMA = (
+    """
+    CREATE TABLE plugin (
+        id TEXT PRIMARY KEY, name TEXT, description TEXT, version TEXT, type TEXT,
+        enabled BOOLEAN, icon TEXT, category TEXT, status TEXT, official BOOLEAN,
+        author TEXT, last_updated TEXT, compatibility TEXT, downloads INTEGER,
+        scope TEXT, bundle_method TEXT, bundle_location TEXT, is_local BOOLEAN,
+        long_description TEXT, config_fields TEXT, messages TEXT, dependencies TEXT,
+        created_at TEXT, updated_at TEXT, user_id TEXT, plugin_slug TEXT,
+        source_type TEXT, source_url TEXT, update_check_url TEXT,
+        last_update_check TEXT, update_available BOOLEAN, latest_version TEXT,
+        installation_type TEXT, permissions TEXT,
+        UNIQUE (user_id, plugin_slug)
+    )
+    """,
+    """
+    CREATE TABLE module (
+        id TEXT PRIMARY KEY, plugin_id TEXT, name TEXT, display_name TEXT,
+        description TEXT, icon TEXT, category TEXT, enabled BOOLEAN,
+        priority INTEGER, props TEXT, config_fields TEXT, messages TEXT,
+        required_services TEXT, dependencies TEXT, layout TEXT, tags TEXT,
+        created_at TEXT, updated_at TEXT, user_id TEXT
+    )
+    """,
+    """
+    CREATE TABLE pages (
+        id TEXT PRIMARY KEY, name TEXT, route TEXT, content TEXT, creator_id TEXT,
+        created_at TEXT, updated_at TEXT, is_published INTEGER, publish_date TEXT
+    )
+    """,
+    "CREATE INDEX idx_pages_creator_route ON pages (creator_id, route)",
+)
+
+
+def make_why_profile(rng: random.Random, i: int) -> dict:
+    return {
+        'id': f"why_{1700000000000 + i}_{rng.getrandbits(32):08x}",
+        'name': f"Why {i}",
+        'createdAt': f"2025-01-{1 + i % 28:02d}T12:{i // 60 % 60:02d}:{i % 60:02d}.000Z",
+        'whyStatement': sentence(rng),
+        'summary': sentence(rng),
+        'whyExplanation': sentence(rng),
+        'patterns': [sentence(rng, 120) for _ in range(5)],
+        'whatYouLove': [sentence(rng, 80) for _ in range(5)],
+        'whatYouAreGoodAt': [sentence(rng, 80) for _ in range(5)],
+    }
+
+
+def summarize(samples_s):
+    """Per-call latency stats in microseconds"""
+    samples_us = sorted(s * 1e6 for s in samples_s)
+    return {
+        'ops': len(samples_us),
+        'mean_us': round(statistics.fmean(samples_us), 2),
+        'p50_us': round(samples_us[len(samples_us) // 2], 2),
+        'p95_us': round(samples_us[min(len(samples_us) - 1, int(len(samples_us) * 0.95))], 2),
+    }
+
+
+def bulk(ops: int, seconds: float):
+    """Stats for an operation timed as one batch"""
+    return {'ops': ops, 'total_s': round(seconds, 4), 'mean_us': round(seconds / max(ops, 1) * 1e6, 2)}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def sample_calls(func, args_list):
+    return summarize([timed(func, *args)[0] for args in args_list])
+
+
+def bench_profile_store(backend: str, scale: int, sample: int, seed: int):
+    plugin_dir = Path(tempfile.mkdtemp(prefix=f'whydetector-bench-{backend}-'))
+    lm.get_plugin_dir = lambda: plugin_dir
+    store = lm.set_profile_backend(backend)
+    rng = random.Random(seed)
+    user_id = 'bench_user'
+    kinds = {
+        'why': (make_why_profile, lm.save_why_profile, lm.load_why_profiles,
+                lm.get_why_profile, lm.delete_why_profile),
+        'ikigai': (make_ikigai_profile, lm.save_ikigai_profile, lm.load_ikigai_profiles,
+                   lm.get_ikigai_profile, lm.delete_ikigai_profile),
+    }
+    results = {}
+    try:
+        for kind, (make, save, load, get, delete) in kinds.items():
+            profiles = [make(rng, i) for i in range(scale)]
+            for profile in profiles:
+                profile.pop('_filename', None)
+                profile.pop('_savedAt', None)
+            ids = [profile['id'] for profile in profiles]
+            picks = [rng.choice(ids) for _ in range(sample)]
+            ops = {}
+
+            # Seeding is the save benchmark; parked writes are flushed inside the timing
+            start = time.perf_counter()
+            for profile in profiles:
+                save(profile, user_id)
+            lm.flush_profile_writes()
+            ops['save'] = bulk(scale, time.perf_counter() - start)
+
+            seconds, loaded = timed(load, user_id)
+            ops['load_first'] = bulk(len(loaded), seconds)
+            ops['load'] = sample_calls(load, [(user_id,)] * max(1, min(sample, 5)))
+            ops['get'] = sample_calls(get, [(profile_id, user_id) for profile_id in picks])
+
+            api = lm.handle_profile_api
+            ops['api_list'] = sample_calls(api, [('list', kind, {'limit': 50}, user_id)] * sample)
+            ops['api_get'] = sample_calls(api, [('get', kind, {'id': profile_id}, user_id)
+                                                for profile_id in picks])
+            ops['api_load'] = sample_calls(api, [('load', kind, {}, user_id)] * max(1, min(sample, 5)))
+            ops['api_search'] = sample_calls(api, [('search', kind, {'query': rng.choice(WORDS), 'limit': 10},
+                                                    user_id) for _ in range(sample)])
+
+            victims = rng.sample(ids, min(sample, len(ids)))
+            ops['delete'] = sample_calls(delete, [(profile_id, user_id) for profile_id in victims])
+            results[kind] = ops
+    finally:
+        lm.flush_profile_writes()
+        lm.flush_search_indexes()
+        if hasattr(store, 'close'):
+            store.close()
+        shutil.rmtree(plugin_dir, ignore_errors=True)
+    return results
+
+
+async def bench_lifecycle(users: int):
+    try:
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    except ImportError as e:
+        return {'skipped': f"needs sqlalchemy: {e}"}
+    if importlib.util.find_spec('aiosqlite') is None:
+        return {'skipped': "needs aiosqlite"}
+
+    base_dir = Path(tempfile.mkdtemp(prefix='whydetector-bench-plugins-'))
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as conn:
+            for statement in LIFECYCLE_SCHEMA:
+                await conn.execute(text(statement))
+        user_ids = [f"bench_user_{i:06d}" for i in range(users)]
+        ops = {}
+        async with AsyncSession(engine) as db:
+            manager = lm.get_lifecycle_manager(str(base_dir))
+
+            async def sample(call, ids):
+                samples = []
+                for user_id in ids:
+                    start = time.perf_counter()
+                    result = await call(user_id, db)
+                    samples.append(time.perf_counter() - start)
+                    if isinstance(result, dict) and result.get('success') is False:
+                        raise RuntimeError(f"{call.__name__} failed for {user_id}: {result.get('error')}")
+                return summarize(samples)
+
+            ops['install_plugin'] = await sample(manager.install_plugin, user_ids)
+            ops['get_plugin_status'] = await sample(manager.get_plugin_status, user_ids)
+            start = time.perf_counter()
+            await manager.get_plugin_status_many(user_ids, db)
+            ops['get_plugin_status_many'] = bulk(users, time.perf_counter() - start)
+            ops['delete_plugin'] = await sample(manager.delete_plugin, user_ids)
+
+            start = time.perf_counter()
+            bulk_result = await manager.install_plugin_bulk(user_ids, db)
+            ops['install_plugin_bulk'] = bulk(bulk_result['succeeded'], time.perf_counter() - start)
+            start = time.perf_counter()
+            bulk_result = await manager.delete_plugin_bulk(user_ids, db)
+            ops['delete_plugin_bulk'] = bulk(bulk_result['succeeded'], time.perf_counter() - start)
+        return {'users': users, 'ops': ops}
+    finally:
+        await engine.dispose()
+        lm.invalidate_lifecycle_managers(str(base_dir))
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous, path=()):
+    """Yield (path, previous mean, current mean) for every op present in both"""
+    if isinstance(current, dict) and 'mean_us' in current:
+        if isinstance(previous, dict) and 'mean_us' in previous:
+            yield '/'.join(path), previous['mean_us'], current['mean_us']
+        return
+    if isinstance(current, dict) and isinstance(previous, dict):
+        for key, value in current.items():
+            if key in previous:
+                yield from compare(value, previous[key], path + (str(key),))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default='10,1000,10000,100000')
+    parser.add_argument('--backends', default=','.join(lm.PROFILE_BACKENDS))
+    parser.add_argument('--sample', type=int, default=200, help='calls per sampled operation')
+    parser.add_argument('--lifecycle-users', type=int, default=200, help='0 skips the lifecycle benchmark')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    parser.add_argument('--compare', help='earlier results file to compare means against')
+    args = parser.parse_args()
+
+    # Keep the per-call info logs out of the timings and the output
+    import structlog
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+                        logger_factory=structlog.PrintLoggerFactory(sys.stderr))
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'orjson': lm.orjson is not None,
+            'args': vars(args),
+        },
+        'profile_store': {},
+    }
+    for backend in args.backends.split(','):
+        results['profile_store'][backend] = {}
+        for scale in (int(value) for value in args.scales.split(',')):
+            print(f"profile store: {backend} x {scale}", file=sys.stderr)
+            results['profile_store'][backend][str(scale)] = bench_profile_store(backend, scale, args.sample, args.seed)
+    if args.lifecycle_users > 0:
+        print(f"lifecycle: {args.lifecycle_users} users", file=sys.stderr)
+        results['lifecycle'] = asyncio.run(bench_lifecycle(args.lifecycle_users))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        print(f"{'operation':<48} {'before us':>10} {'after us':>10} {'ratio':>7}", file=sys.stderr)
+        for path, before, after in compare(results, previous):
+            print(f"{path:<48} {before:>10.1f} {after:>10.1f} {after / before if before else 0:>6.2f}x",
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,94 +4,640 @@ BrainDriveWhyDetector Plugin Lifecycle Manager
 
 Handles install/update/delete operations for the BrainDriveWhyDetector plugin
 using BrainDrive's multi-user plugin lifecycle management architecture.
+
+Importing this module stays light: SQLAlchemy, structlog, asyncio and the
+BrainDrive base class are only loaded when the lifecycle manager or an
+async API is first used, so the profile store functions can be imported on
+their own.
 """
 
+from __future__ import annotations
+
 import json
 import logging
 import datetime
+import fnmatch
+import functools
 import os
 import shutil
-import asyncio
+import sys
+import atexit
+import base64
+import bisect
+import gzip
+import hashlib
+import heapq
+import itertools
+import math
+import re
+import sqlite3
+import threading
+import time
 import uuid
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-import structlog
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Set, Tuple, Callable, NamedTuple, Iterable, Iterator, IO
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class _LazyLogger:
+    """Stands in for the structlog logger until the first log call imports structlog"""
+    
+    def __getattr__(self, name: str) -> Any:
+        global logger
+        import structlog
+        logger = structlog.get_logger()
+        return getattr(logger, name)
+
+logger = _LazyLogger()
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Profile CLI (see profile_cli): keep stdout free for NDJSON
+    import structlog
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(sys.stderr))
 
-logger = structlog.get_logger()
+# Optional fast JSON codec for the profile store; the stdlib json module is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Import the base lifecycle manager
+# Used for reflink (FICLONE) copies of the shared plugin files; not available on Windows
 try:
-    from app.plugins.base_lifecycle_manager import BaseLifecycleManager
-    logger.info("BrainDriveWhyDetector: Using BaseLifecycleManager from app.plugins")
+    import fcntl
 except ImportError:
+    fcntl = None
+
+@functools.lru_cache(maxsize=None)
+def _resolve_base_lifecycle_manager() -> type:
+    """
+    BrainDrive's BaseLifecycleManager, resolved on first use and cached.
+    
+    Tries app.plugins, then the backend four directories up, and falls back
+    to a minimal implementation for remote installations.
+    """
     try:
-        import sys
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        backend_path = os.path.join(current_dir, "..", "..", "..", "..", "app", "plugins")
-        backend_path = os.path.abspath(backend_path)
+        from app.plugins.base_lifecycle_manager import BaseLifecycleManager
+        logger.info("BrainDriveWhyDetector: Using BaseLifecycleManager from app.plugins")
+        return BaseLifecycleManager
+    except ImportError:
+        try:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            backend_path = os.path.join(current_dir, "..", "..", "..", "..", "app", "plugins")
+            backend_path = os.path.abspath(backend_path)
         
-        if os.path.exists(backend_path):
-            if backend_path not in sys.path:
-                sys.path.insert(0, backend_path)
-            from base_lifecycle_manager import BaseLifecycleManager
-            logger.info(f"BrainDriveWhyDetector: Using BaseLifecycleManager from: {backend_path}")
-        else:
-            # Minimal implementation for remote installations
-            logger.warning(f"BrainDriveWhyDetector: BaseLifecycleManager not found, using minimal implementation")
-            from abc import ABC, abstractmethod
-            from datetime import datetime
-            from pathlib import Path
-            from typing import Set
-            
-            class BaseLifecycleManager(ABC):
-                """Minimal base class for remote installations"""
-                def __init__(self, plugin_slug: str, version: str, shared_storage_path: Path):
-                    self.plugin_slug = plugin_slug
-                    self.version = version
-                    self.shared_path = shared_storage_path
-                    self.active_users: Set[str] = set()
-                    self.instance_id = f"{plugin_slug}_{version}"
-                    self.created_at = datetime.now()
-                    self.last_used = datetime.now()
+            if os.path.exists(backend_path):
+                if backend_path not in sys.path:
+                    sys.path.insert(0, backend_path)
+                from base_lifecycle_manager import BaseLifecycleManager
+                logger.info(f"BrainDriveWhyDetector: Using BaseLifecycleManager from: {backend_path}")
+                return BaseLifecycleManager
+            else:
+                # Minimal implementation for remote installations
+                logger.warning(f"BrainDriveWhyDetector: BaseLifecycleManager not found, using minimal implementation")
                 
-                async def install_for_user(self, user_id: str, db, shared_plugin_path: Path):
-                    if user_id in self.active_users:
-                        return {'success': False, 'error': 'Plugin already installed for user'}
-                    result = await self._perform_user_installation(user_id, db, shared_plugin_path)
-                    if result['success']:
-                        self.active_users.add(user_id)
-                        self.last_used = datetime.now()
-                    return result
+                class BaseLifecycleManager(ABC):
+                    """Minimal base class for remote installations"""
+                    def __init__(self, plugin_slug: str, version: str, shared_storage_path: Path):
+                        self.plugin_slug = plugin_slug
+                        self.version = version
+                        self.shared_path = shared_storage_path
+                        self.active_users: Set[str] = set()
+                        self.instance_id = f"{plugin_slug}_{version}"
+                        self.created_at = datetime.datetime.now()
+                        self.last_used = datetime.datetime.now()
                 
-                async def uninstall_for_user(self, user_id: str, db):
-                    if user_id not in self.active_users:
-                        return {'success': False, 'error': 'Plugin not installed for user'}
-                    result = await self._perform_user_uninstallation(user_id, db)
-                    if result['success']:
-                        self.active_users.discard(user_id)
-                        self.last_used = datetime.now()
-                    return result
+                    async def install_for_user(self, user_id: str, db, shared_plugin_path: Path):
+                        if user_id in self.active_users:
+                            return {'success': False, 'error': 'Plugin already installed for user'}
+                        result = await self._perform_user_installation(user_id, db, shared_plugin_path)
+                        if result['success']:
+                            self.active_users.add(user_id)
+                            self.last_used = datetime.datetime.now()
+                        return result
                 
-                @abstractmethod
-                async def get_plugin_metadata(self): pass
-                @abstractmethod
-                async def get_module_metadata(self): pass
-                @abstractmethod
-                async def _perform_user_installation(self, user_id, db, shared_plugin_path): pass
-                @abstractmethod
-                async def _perform_user_uninstallation(self, user_id, db): pass
+                    async def uninstall_for_user(self, user_id: str, db):
+                        if user_id not in self.active_users:
+                            return {'success': False, 'error': 'Plugin not installed for user'}
+                        result = await self._perform_user_uninstallation(user_id, db)
+                        if result['success']:
+                            self.active_users.discard(user_id)
+                            self.last_used = datetime.datetime.now()
+                        return result
+                
+                    @abstractmethod
+                    async def get_plugin_metadata(self): pass
+                    @abstractmethod
+                    async def get_module_metadata(self): pass
+                    @abstractmethod
+                    async def _perform_user_installation(self, user_id, db, shared_plugin_path): pass
+                    @abstractmethod
+                    async def _perform_user_uninstallation(self, user_id, db): pass
             
-            logger.info("BrainDriveWhyDetector: Using minimal BaseLifecycleManager implementation")
+                logger.info("BrainDriveWhyDetector: Using minimal BaseLifecycleManager implementation")
+                return BaseLifecycleManager
             
-    except ImportError as e:
-        logger.error(f"BrainDriveWhyDetector: Failed to import BaseLifecycleManager: {e}")
-        raise ImportError("BrainDriveWhyDetector plugin requires BaseLifecycleManager")
+        except ImportError as e:
+            logger.error(f"BrainDriveWhyDetector: Failed to import BaseLifecycleManager: {e}")
+            raise ImportError("BrainDriveWhyDetector plugin requires BaseLifecycleManager")
+
+
+# Statements shared by the single-user and bulk install paths
+PLUGIN_INSERT_SQL = """
+INSERT INTO plugin
+(id, name, description, version, type, enabled, icon, category, status,
+official, author, last_updated, compatibility, downloads, scope,
+bundle_method, bundle_location, is_local, long_description,
+config_fields, messages, dependencies, created_at, updated_at, user_id,
+plugin_slug, source_type, source_url, update_check_url, last_update_check,
+update_available, latest_version, installation_type, permissions)
+VALUES
+(:id, :name, :description, :version, :type, :enabled, :icon, :category,
+:status, :official, :author, :last_updated, :compatibility, :downloads,
+:scope, :bundle_method, :bundle_location, :is_local, :long_description,
+:config_fields, :messages, :dependencies, :created_at, :updated_at, :user_id,
+:plugin_slug, :source_type, :source_url, :update_check_url, :last_update_check,
+:update_available, :latest_version, :installation_type, :permissions)
+"""
+
+MODULE_INSERT_SQL = """
+INSERT INTO module
+(id, plugin_id, name, display_name, description, icon, category,
+enabled, priority, props, config_fields, messages, required_services,
+dependencies, layout, tags, created_at, updated_at, user_id)
+VALUES
+(:id, :plugin_id, :name, :display_name, :description, :icon, :category,
+:enabled, :priority, :props, :config_fields, :messages, :required_services,
+:dependencies, :layout, :tags, :created_at, :updated_at, :user_id)
+"""
+
+PAGE_INSERT_SQL = """
+INSERT INTO pages (
+    id, name, route, content, creator_id,
+    created_at, updated_at, is_published, publish_date
+) VALUES (
+    :id, :name, :route, :content, :creator_id,
+    :created_at, :updated_at, :is_published, :publish_date
+)
+"""
+
+PAGE_EXISTS_SQL = """
+SELECT id FROM pages
+WHERE creator_id = :user_id AND route = :route
+"""
+
+PLUGIN_LOOKUP_SQL = """
+SELECT id, name, version, enabled, created_at, updated_at, plugin_slug
+FROM plugin
+WHERE user_id = :user_id AND plugin_slug = :plugin_slug
+"""
+
+PLUGIN_LOOKUP_MANY_SQL = """
+SELECT user_id, id, name, version, enabled, created_at, updated_at, plugin_slug
+FROM plugin
+WHERE plugin_slug = :plugin_slug AND user_id IN :user_ids
+"""
+
+class _Statements:
+    """
+    text() statements shared by every manager, e.g. STATEMENTS.PLUGIN_INSERT.
+    
+    Each is compiled on first use and kept (text() objects are immutable),
+    so importing this module does not import SQLAlchemy.
+    """
+    
+    # name -> (SQL, parameters bound as expanding IN lists)
+    SOURCES = {
+        'PLUGIN_INSERT': (PLUGIN_INSERT_SQL, ()),
+        'PLUGIN_UPSERT_RETURNING': (PLUGIN_INSERT_SQL + "ON CONFLICT DO NOTHING RETURNING id", ()),
+        'MODULE_INSERT': (MODULE_INSERT_SQL, ()),
+        'PAGE_INSERT': (PAGE_INSERT_SQL, ()),
+        'PAGE_EXISTS': (PAGE_EXISTS_SQL, ()),
+        'PLUGIN_LOOKUP': (PLUGIN_LOOKUP_SQL, ()),
+        'PLUGIN_LOOKUP_MANY': (PLUGIN_LOOKUP_MANY_SQL, ('user_ids',)),
+        'PLUGIN_IDS_BY_USER': ("SELECT user_id, id FROM plugin WHERE plugin_slug = :plugin_slug AND user_id IN :user_ids",
+                               ('user_ids',)),
+        'PAGE_IDS_BY_USER': ("SELECT creator_id, id FROM pages WHERE route = :route AND creator_id IN :user_ids",
+                             ('user_ids',)),
+        'MODULE_LOOKUP': ("SELECT id FROM module WHERE user_id = :user_id AND plugin_id = :plugin_id AND name = :name", ()),
+        'PAGE_DELETE': ("DELETE FROM pages WHERE creator_id = :user_id AND route = :route", ()),
+        'MODULE_DELETE': ("DELETE FROM module WHERE plugin_id = :plugin_id AND user_id = :user_id", ()),
+        'PLUGIN_DELETE': ("DELETE FROM plugin WHERE id = :plugin_id AND user_id = :user_id", ()),
+    }
+    
+    def __getattr__(self, name: str) -> Any:
+        try:
+            sql, expanding = self.SOURCES[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        from sqlalchemy import bindparam, text
+        statement = text(sql)
+        if expanding:
+            statement = statement.bindparams(*(bindparam(param, expanding=True) for param in expanding))
+        setattr(self, name, statement)
+        return statement
+
+STATEMENTS = _Statements()
+
+# Dialects where the plugin row can be inserted with ON CONFLICT DO NOTHING
+# RETURNING, so an existing install is detected by the insert itself
+UPSERT_RETURNING_DIALECTS = {
+    'postgresql': lambda: True,
+    'sqlite': lambda: sqlite3.sqlite_version_info >= (3, 35, 0),
+}
+
+PLUGIN_VERSION = "1.0.0"
+PAGE_ROUTE = "why-finder-v1"
+
+# Placeholders in the pre-serialized page content, replaced per user
+PAGE_MODULE_ID_TOKEN = "@@module_id@@"
+PAGE_TIMESTAMP_TOKEN = "@@timestamp_ms@@"
+BULK_INSTALL_BATCH_SIZE = 500
+STATUS_QUERY_CHUNK_SIZE = 500
+
+# Written into the shared plugin path; maps each materialized file to the
+# [size, mtime_ns, sha256] of the source it came from
+SHARED_FILES_MANIFEST = '.whydetector_files.json'
+# ioctl request for a copy-on-write clone on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Names never materialized into the shared path. Matched once per directory
+# entry; an excluded directory is pruned without being descended into. The
+# profile store keeps its data in the plugin directory (every user's
+# profiles, manifests and search logs, and the SQLite database with its
+# WAL, shared memory and search indexes); none of it ships with the plugin
+PLUGIN_COPY_EXCLUDES = (
+    'node_modules', 'package-lock.json', '.git', '.gitignore',
+    '__pycache__', '*.pyc', '.DS_Store', 'Thumbs.db', 'benchmarks', 'tests', '.pytest_cache',
+    'why_profiles', 'ikigai_profiles', 'profiles.sqlite3*',
+    SHARED_FILES_MANIFEST, '.*.tmp'
+)
+_PLUGIN_COPY_EXCLUDE_RE = re.compile('|'.join(fnmatch.translate(pattern) for pattern in PLUGIN_COPY_EXCLUDES))
+
+PLUGIN_COPY_WORKERS = max(1, int(os.environ.get('WHYDETECTOR_COPY_WORKERS', '4')))
+
+# Seconds a shared-path health check is trusted without re-stat'ing the files
+PLUGIN_HEALTH_TTL = float(os.environ.get('WHYDETECTOR_HEALTH_TTL_S', '30'))
+
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of path, or None when it does not exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _reflink_file(source: Path, target: Path) -> bool:
+    """Clone source into target copy-on-write; False where the filesystem cannot"""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, target)
+        return True
+    except OSError:
+        try:
+            target.unlink()
+        except OSError:
+            pass
+        return False
+
+def _kernel_copy_file(source: Path, target: Path) -> str:
+    """
+    Copy source to target without moving the bytes through Python.
+    
+    Uses os.copy_file_range, then os.sendfile, then a buffered copy where
+    neither is available; metadata is copied as copy2 would. Returns which
+    one was used.
+    """
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        method = 'copy'
+        for name in ('copy_file_range', 'sendfile'):
+            kernel_copy = getattr(os, name, None)
+            if kernel_copy is None or remaining == 0:
+                continue
+            try:
+                while remaining > 0:
+                    if name == 'copy_file_range':
+                        sent = kernel_copy(src.fileno(), dst.fileno(), remaining)
+                    else:
+                        sent = kernel_copy(dst.fileno(), src.fileno(), None, remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                method = name
+                break
+            except OSError:
+                # Not supported for this pair of files; start over with the next one
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+                remaining = os.fstat(src.fileno()).st_size
+        if remaining > 0:
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, 1 << 20)
+            method = 'copy'
+    shutil.copystat(source, target)
+    return method
+
+def _link_or_copy_file(source: Path, target: Path) -> str:
+    """
+    Atomically replace target with the content of source.
+    
+    Tries a hardlink (same filesystem), then a reflink, then a kernel-side
+    copy; returns which one was used.
+    """
+    try:
+        if os.path.samefile(source, target):
+            # Already a hardlink to source; renaming a link over itself is a no-op
+            return 'hardlink'
+    except OSError:
+        pass
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        try:
+            os.link(source, tmp_path)
+            method = 'hardlink'
+        except OSError:
+            if _reflink_file(source, tmp_path):
+                method = 'reflink'
+            else:
+                method = _kernel_copy_file(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return method
+
+
+def _scan_plugin_files(source_dir: Path, skip_dirs: Iterable[Path] = ()) -> List[Tuple[str, Path, os.stat_result]]:
+    """
+    (relative posix path, source path, stat) of every plugin file to materialize.
+    
+    Excluded directories, and any of skip_dirs (such as a shared path nested
+    in the source), are pruned before being descended into.
+    """
+    skip = {os.path.realpath(path) for path in skip_dirs}
+    files = []
+    stack = [(str(source_dir), '')]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if _PLUGIN_COPY_EXCLUDE_RE.match(entry.name):
+                    continue
+                relpath = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.realpath(entry.path) not in skip:
+                        stack.append((entry.path, relpath + '/'))
+                elif entry.is_file():
+                    files.append((relpath, Path(entry.path), entry.stat()))
+    return files
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """Process-wide bounded thread pool for one kind of blocking work, created on first use"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=f'whydetector-{name}'
+                )
+    return executor
+
+def _shutdown_executor(name: str, wait: bool = True) -> None:
+    """Stop one named pool; the next _get_executor call recreates it"""
+    with _executors_lock:
+        executor = _executors.pop(name, None)
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def _get_file_copy_executor() -> ThreadPoolExecutor:
+    """Bounded pool that shared-file materialization runs on, off the event loop"""
+    return _get_executor('file-copy', PLUGIN_COPY_WORKERS)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+MetricLabels = Tuple[Tuple[str, str], ...]
+
+
+class OperationStats:
+    """Call count, error count, latency histogram and bytes moved for one operation"""
+    __slots__ = ('count', 'errors', 'seconds', 'buckets', 'bytes_read', 'bytes_written')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        # Per-bucket (not cumulative) counts; the last slot is +Inf
+        self.buckets = [0] * (len(METRICS_LATENCY_BUCKETS) + 1)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
+def _prometheus_labels(operation: str, labels: MetricLabels, **extra: str) -> str:
+    pairs = [('operation', operation)] + list(labels) + list(extra.items())
+    return '{' + ','.join(
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in pairs
+    ) + '}'
+
+
+class MetricsRegistry:
+    """
+    In-process counters for the lifecycle and profile store operations.
+
+    Recording is a dict lookup and a few integer adds under one lock, so
+    it is always on; nothing is formatted until snapshot() or
+    render_prometheus() is called.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, MetricLabels], OperationStats] = {}
+
+    def _get(self, operation: str, labels: MetricLabels) -> OperationStats:
+        stats = self._stats.get((operation, labels))
+        if stats is None:
+            stats = self._stats.setdefault((operation, labels), OperationStats())
+        return stats
+
+    def observe(self, operation: str, seconds: float, failed: bool = False, bytes_read: int = 0,
+                bytes_written: int = 0, labels: MetricLabels = ()) -> None:
+        """Record one call of operation"""
+        bucket = bisect.bisect_left(METRICS_LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._get(operation, labels)
+            stats.count += 1
+            stats.seconds += seconds
+            stats.buckets[bucket] += 1
+            if failed:
+                stats.errors += 1
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
 
+    def add_bytes(self, operation: str, bytes_read: int = 0, bytes_written: int = 0,
+                  labels: MetricLabels = ()) -> None:
+        """Record bytes moved by operation without counting a call"""
+        with self._lock:
+            stats = self._get(operation, labels)
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
 
-class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
-    """Lifecycle manager for BrainDriveWhyDetector plugin"""
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _copy(self) -> List[Tuple[str, MetricLabels, OperationStats]]:
+        with self._lock:
+            copies = []
+            for (operation, labels), stats in sorted(self._stats.items()):
+                copy = OperationStats()
+                copy.count, copy.errors, copy.seconds = stats.count, stats.errors, stats.seconds
+                copy.buckets = list(stats.buckets)
+                copy.bytes_read, copy.bytes_written = stats.bytes_read, stats.bytes_written
+                copies.append((operation, labels, copy))
+            return copies
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        All recorded operations, keyed by operation name plus label values
+        (e.g. 'profile_api.save.why'). Histogram buckets are cumulative, as
+        in Prometheus.
+        """
+        operations = {}
+        for operation, labels, stats in self._copy():
+            cumulative, buckets = 0, {}
+            for bound, hits in zip(METRICS_LATENCY_BUCKETS + (float('inf'),), stats.buckets):
+                cumulative += hits
+                buckets['+Inf' if math.isinf(bound) else repr(bound)] = cumulative
+            key = '.'.join([operation] + [value for _, value in labels])
+            operations[key] = {
+                'operation': operation,
+                'labels': dict(labels),
+                'count': stats.count,
+                'errors': stats.errors,
+                'seconds_total': stats.seconds,
+                'mean_ms': round(stats.seconds / stats.count * 1000, 3) if stats.count else None,
+                'latency_buckets': buckets,
+                'bytes_read': stats.bytes_read,
+                'bytes_written': stats.bytes_written,
+            }
+        return {'operations': operations}
+
+    def render_prometheus(self, prefix: str = 'whydetector') -> str:
+        """Render every operation in the Prometheus text exposition format"""
+        copies = self._copy()
+        timed = [entry for entry in copies if entry[2].count]
+        lines = [
+            f"# HELP {prefix}_operation_duration_seconds Latency of plugin lifecycle and profile operations",
+            f"# TYPE {prefix}_operation_duration_seconds histogram",
+        ]
+        for operation, labels, stats in timed:
+            cumulative = 0
+            for bound, hits in zip(METRICS_LATENCY_BUCKETS + (float('inf'),), stats.buckets):
+                cumulative += hits
+                le = '+Inf' if math.isinf(bound) else repr(bound)
+                lines.append(f"{prefix}_operation_duration_seconds_bucket"
+                             f"{_prometheus_labels(operation, labels, le=le)} {cumulative}")
+            label_text = _prometheus_labels(operation, labels)
+            lines.append(f"{prefix}_operation_duration_seconds_sum{label_text} {stats.seconds!r}")
+            lines.append(f"{prefix}_operation_duration_seconds_count{label_text} {stats.count}")
+        for name, help_text, entries, value in (
+            ('operation_errors_total', 'Plugin operations that failed', timed, lambda s: s.errors),
+            ('operation_bytes_read_total', 'Bytes read by plugin operations', copies, lambda s: s.bytes_read),
+            ('operation_bytes_written_total', 'Bytes written by plugin operations', copies, lambda s: s.bytes_written),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for operation, labels, stats in entries:
+                lines.append(f"{prefix}_{name}{_prometheus_labels(operation, labels)} {value(stats)}")
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+def get_metrics_snapshot() -> Dict[str, Any]:
+    """Counts, errors, latency histograms and bytes moved per instrumented operation"""
+    return METRICS.snapshot()
+
+def render_metrics_prometheus() -> str:
+    """The same metrics in the Prometheus text exposition format, for a /metrics endpoint"""
+    return METRICS.render_prometheus()
+
+def reset_metrics() -> None:
+    METRICS.reset()
+
+
+def _result_failed(result: Any) -> bool:
+    return isinstance(result, dict) and result.get('success') is False
+
+def _instrumented(operation: str, failed: Callable[[Dict[str, Any]], bool] = _result_failed,
+                  io_bytes: Callable[[Dict[str, Any]], Tuple[int, int]] = None):
+    """
+    Record an async method's latency in METRICS under operation.
+
+    A call fails if it raises or failed(result) is true; io_bytes(result)
+    gives the (read, written) bytes to record.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = None
+            try:
+                result = await method(*args, **kwargs)
+                return result
+            finally:
+                elapsed = time.perf_counter() - started
+                if result is None:
+                    METRICS.observe(operation, elapsed, failed=True)
+                else:
+                    bytes_read, bytes_written = io_bytes(result) if io_bytes else (0, 0)
+                    METRICS.observe(operation, elapsed, failed(result), bytes_read, bytes_written)
+        return wrapper
+    return decorate
+
+
+class _WhyDetectorLifecycleMethods:
+    """
+    Lifecycle manager for BrainDriveWhyDetector plugin.
+    
+    Combined with BrainDrive's BaseLifecycleManager on first use to form
+    BrainDriveWhyDetectorLifecycleManager (see _lifecycle_manager_class).
+    """
     
     def __init__(self, plugins_base_dir: str = None):
         """Initialize the lifecycle manager"""
@@ -99,7 +645,7 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
         self.plugin_data = {
             "name": "BrainDriveWhyDetector",
             "description": "Find Your Why - Multi-agent coaching flow to discover your core purpose",
-            "version": "1.0.0",
+            "version": PLUGIN_VERSION,
             "type": "frontend",
             "icon": "Target",
             "category": "coaching",
@@ -169,6 +715,9 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             shared_path = Path(__file__).parent
         logger.info(f"BrainDriveWhyDetector: shared_path - {shared_path}")
         
+        # plugin dir -> (file signatures, checked at, inspection); see _inspect_plugin_dir
+        self._health_cache: Dict[str, Tuple[Any, float, Dict[str, Any]]] = {}
+        
         super().__init__(
             plugin_slug=self.plugin_data['plugin_slug'],
             version=self.plugin_data['version'],
@@ -189,21 +738,20 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
         return self.module_data
     
     async def _perform_user_installation(self, user_id: str, db: AsyncSession, shared_plugin_path: Path) -> Dict[str, Any]:
-        """Perform user-specific installation"""
+        """Perform user-specific installation as a single transaction"""
         try:
             db_result = await self._create_database_records(user_id, db)
             if not db_result['success']:
+                await db.rollback()
                 return db_result
             
-            # Create plugin page
+            # Create plugin page; any failure rolls back the plugin rows too
             page_result = await self._create_plugin_page(user_id, db, db_result['modules_created'])
             if not page_result.get('success'):
-                # Rollback plugin records if page creation fails
-                plugin_id = db_result.get('plugin_id')
-                if plugin_id:
-                    await self._delete_database_records(user_id, plugin_id, db)
+                await db.rollback()
                 return page_result
             
+            await db.commit()
             logger.info(f"BrainDriveWhyDetector: User installation completed for {user_id}")
             return {
                 'success': True,
@@ -217,6 +765,7 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             
         except Exception as e:
             logger.error(f"BrainDriveWhyDetector: User installation failed for {user_id}: {e}")
+            await db.rollback()
             return {'success': False, 'error': str(e)}
     
     async def _perform_user_uninstallation(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
@@ -249,76 +798,202 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             logger.error(f"BrainDriveWhyDetector: User uninstallation failed for {user_id}: {e}")
             return {'success': False, 'error': str(e)}
     
+    @_instrumented('copy_plugin_files', io_bytes=lambda result: (0, result.get('progress', {}).get('bytes_written', 0)))
     async def _copy_plugin_files_impl(self, user_id: str, target_dir: Path, update: bool = False) -> Dict[str, Any]:
-        """Copy plugin files to target directory"""
+        """
+        Materialize the plugin files in target_dir.
+        
+        A content-hash manifest in target_dir records what was materialized,
+        so when nothing changed this is a walk of the source plus one stat per
+        file. Changed files are rewritten atomically, as hardlinks or reflinks
+        when possible; update forces every file to be rewritten. All file work
+        runs on a bounded thread pool, never on the event loop.
+        """
         try:
             source_dir = Path(__file__).parent
-            copied_files = []
+            if target_dir.resolve() == source_dir.resolve():
+                return {'success': True, 'copied_files': [], 'unchanged_files': 0, 'removed_files': []}
             
-            exclude_patterns = {
-                'node_modules', 'package-lock.json', '.git', '.gitignore',
-                '__pycache__', '*.pyc', '.DS_Store', 'Thumbs.db'
-            }
-            
-            def should_copy(path: Path) -> bool:
-                for part in path.parts:
-                    if part in exclude_patterns:
-                        return False
-                for pattern in exclude_patterns:
-                    if '*' in pattern and path.name.endswith(pattern.replace('*', '')):
-                        return False
-                return True
-            
-            for item in source_dir.rglob('*'):
-                if item.name == 'lifecycle_manager.py' and item == Path(__file__):
-                    continue
-                    
-                relative_path = item.relative_to(source_dir)
-                
-                if not should_copy(relative_path):
-                    continue
-                
-                target_path = target_dir / relative_path
-                
-                try:
-                    if item.is_file():
-                        target_path.parent.mkdir(parents=True, exist_ok=True)
-                        if update and target_path.exists():
-                            target_path.unlink()
-                        shutil.copy2(item, target_path)
-                        copied_files.append(str(relative_path))
-                    elif item.is_dir():
-                        target_path.mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    logger.warning(f"BrainDriveWhyDetector: Failed to copy {relative_path}: {e}")
-                    continue
+            result = await self._materialize_shared_files(source_dir, target_dir, force=update)
             
-            # Copy lifecycle_manager.py
-            lifecycle_manager_source = source_dir / 'lifecycle_manager.py'
-            lifecycle_manager_target = target_dir / 'lifecycle_manager.py'
-            if lifecycle_manager_source.exists():
-                lifecycle_manager_target.parent.mkdir(parents=True, exist_ok=True)
-                if update and lifecycle_manager_target.exists():
-                    lifecycle_manager_target.unlink()
-                shutil.copy2(lifecycle_manager_source, lifecycle_manager_target)
-                copied_files.append('lifecycle_manager.py')
+            if result['failed_files']:
+                self._health_cache.pop(str(target_dir), None)
+                logger.error(f"BrainDriveWhyDetector: Failed to copy {len(result['failed_files'])} files to {target_dir}",
+                             failed=result['failed_files'])
+                return {'success': False, 'error': f"Failed to copy plugin files: {', '.join(result['failed_files'])}",
+                        **result}
             
-            logger.info(f"BrainDriveWhyDetector: Copied {len(copied_files)} files to {target_dir}")
-            return {'success': True, 'copied_files': copied_files}
+            if result['copied_files'] or result['removed_files']:
+                self._health_cache.pop(str(target_dir), None)
+                logger.info(f"BrainDriveWhyDetector: Copied {len(result['copied_files'])} files to {target_dir}",
+                            unchanged=result['unchanged_files'], removed=len(result['removed_files']),
+                            elapsed_ms=result['timing']['total_ms'])
+            else:
+                logger.info(f"BrainDriveWhyDetector: Shared files up to date in {target_dir}",
+                            elapsed_ms=result['timing']['total_ms'])
+            return {'success': True, **result}
             
         except Exception as e:
             logger.error(f"BrainDriveWhyDetector: Error copying plugin files: {e}")
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _read_files_manifest(manifest_path: Path) -> Dict[str, List[Any]]:
+        """Files recorded by the last materialization, or {} if there is no usable manifest"""
+        try:
+            return _loads_json(manifest_path.read_bytes()).get('files', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    @staticmethod
+    def _sync_shared_file(relpath: str, source: Path, st: os.stat_result,
+                          entry: Optional[List[Any]], target: Path) -> Tuple[List[Any], Optional[str]]:
+        """Bring one shared file up to date; returns its manifest record and the copy method, if rewritten"""
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            digest = entry[2]
+        else:
+            digest = _file_sha256(source)
+        record = [st.st_size, st.st_mtime_ns, digest]
+        
+        # Targets carry the source's mtime (hardlink or copystat), so a target
+        # rewritten or truncated since is caught by its signature
+        if entry and entry[2] == digest and _file_signature(target) == (st.st_mtime_ns, st.st_size):
+            return record, None
+        
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return record, _link_or_copy_file(source, target)
+    
+    async def _materialize_shared_files(self, source_dir: Path, target_dir: Path, force: bool = False) -> Dict[str, Any]:
+        """Bring target_dir in line with source_dir, rewriting only files whose content changed"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        executor = _get_file_copy_executor()
+        started = time.perf_counter()
+        manifest_path = target_dir / SHARED_FILES_MANIFEST
+        
+        # Read even when forcing, so files dropped from the source are still removed
+        previous = await loop.run_in_executor(executor, self._read_files_manifest, manifest_path)
+        sources = await loop.run_in_executor(executor, _scan_plugin_files, source_dir, [target_dir])
+        scanned = time.perf_counter()
+        
+        jobs = [
+            loop.run_in_executor(executor, self._sync_shared_file, relpath, source, st,
+                                 None if force else previous.get(relpath), target_dir / relpath)
+            for relpath, source, st in sources
+        ]
+        outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+        
+        current: Dict[str, List[Any]] = {}
+        copied_files, failed_files, link_methods = [], [], {}
+        bytes_written = 0
+        for (relpath, source, st), outcome in zip(sources, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"BrainDriveWhyDetector: Failed to copy {relpath}: {outcome}")
+                failed_files.append(relpath)
+                # Copies replace the target atomically, so whatever was there
+                # is still intact and still matches its old record; the
+                # changed signature makes the next run retry it
+                if relpath in previous:
+                    current[relpath] = previous[relpath]
+                continue
+            record, method = outcome
+            current[relpath] = record
+            if method is not None:
+                copied_files.append(relpath)
+                link_methods[method] = link_methods.get(method, 0) + 1
+                bytes_written += st.st_size
+        copied = time.perf_counter()
+        
+        # Only files gone from the source are removed, never ones that failed to copy
+        removed_files = sorted(set(previous) - {relpath for relpath, _, _ in sources})
+        
+        def finish() -> None:
+            for relpath in removed_files:
+                try:
+                    (target_dir / relpath).unlink()
+                except FileNotFoundError:
+                    pass
+            if current != previous:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                _write_json_atomic(manifest_path, {'version': self.plugin_data['version'], 'files': current})
+        
+        await loop.run_in_executor(executor, finish)
+        finished = time.perf_counter()
+        
+        return {
+            'copied_files': copied_files,
+            'unchanged_files': len(sources) - len(copied_files) - len(failed_files),
+            'removed_files': removed_files,
+            'failed_files': failed_files,
+            'link_methods': link_methods,
+            'progress': {
+                'files_total': len(sources),
+                'files_done': len(sources) - len(failed_files),
+                'files_failed': len(failed_files),
+                'bytes_total': sum(st.st_size for _, _, st in sources),
+                'bytes_written': bytes_written
+            },
+            'timing': {
+                'scan_ms': round((scanned - started) * 1000, 3),
+                'copy_ms': round((copied - scanned) * 1000, 3),
+                'finish_ms': round((finished - copied) * 1000, 3),
+                'total_ms': round((finished - started) * 1000, 3)
+            }
+        }
+    
+    def _inspect_plugin_dir(self, plugin_dir: Path) -> Dict[str, Any]:
+        """
+        Bundle and package.json facts for plugin_dir.
+        
+        Cached per directory: within PLUGIN_HEALTH_TTL the cached facts are
+        returned as is; after it, the two files are stat'ed and package.json
+        is only re-parsed if its or the bundle's (mtime, size) changed.
+        """
+        cache_key = str(plugin_dir)
+        now = time.monotonic()
+        cached = self._health_cache.get(cache_key)
+        if cached and now - cached[1] < PLUGIN_HEALTH_TTL:
+            return cached[2]
+        
+        bundle_path = plugin_dir / "dist" / "remoteEntry.js"
+        package_json_path = plugin_dir / "package.json"
+        signature = (_file_signature(bundle_path), _file_signature(package_json_path))
+        if cached and cached[0] == signature:
+            self._health_cache[cache_key] = (signature, now, cached[2])
+            return cached[2]
+        
+        bundle_signature, package_signature = signature
+        inspection = {
+            'bundle_exists': bundle_signature is not None,
+            'bundle_size': bundle_signature[1] if bundle_signature else 0,
+            'package_json_exists': package_signature is not None,
+            'package_json_valid': False,
+            'package_json_error': None,
+            'package_json_missing_fields': []
+        }
+        if package_signature is not None:
+            try:
+                package_data = json.loads(package_json_path.read_bytes())
+                inspection['package_json_valid'] = True
+                inspection['package_json_missing_fields'] = [
+                    field for field in ("name", "version") if field not in package_data
+                ]
+            except (OSError, ValueError) as e:
+                inspection['package_json_error'] = str(e)
+        
+        self._health_cache[cache_key] = (signature, now, inspection)
+        return inspection
+    
     async def _validate_installation_impl(self, user_id: str, plugin_dir: Path) -> Dict[str, Any]:
         """Validate plugin installation"""
         try:
-            required_files = ["package.json", "dist/remoteEntry.js"]
-            missing_files = []
+            inspection = self._inspect_plugin_dir(plugin_dir)
             
-            for file_path in required_files:
-                if not (plugin_dir / file_path).exists():
-                    missing_files.append(file_path)
+            missing_files = []
+            if not inspection['package_json_exists']:
+                missing_files.append("package.json")
+            if not inspection['bundle_exists']:
+                missing_files.append("dist/remoteEntry.js")
             
             if missing_files:
                 return {
@@ -327,28 +1002,19 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
                 }
             
             # Validate package.json
-            package_json_path = plugin_dir / "package.json"
-            try:
-                with open(package_json_path, 'r') as f:
-                    package_data = json.load(f)
-                
-                required_fields = ["name", "version"]
-                for field in required_fields:
-                    if field not in package_data:
-                        return {
-                            'valid': False,
-                            'error': f'BrainDriveWhyDetector: package.json missing field: {field}'
-                        }
-                        
-            except (json.JSONDecodeError, FileNotFoundError) as e:
+            if not inspection['package_json_valid']:
+                return {
+                    'valid': False,
+                    'error': f"BrainDriveWhyDetector: Invalid package.json: {inspection['package_json_error']}"
+                }
+            if inspection['package_json_missing_fields']:
                 return {
                     'valid': False,
-                    'error': f'BrainDriveWhyDetector: Invalid package.json: {e}'
+                    'error': f"BrainDriveWhyDetector: package.json missing field: {inspection['package_json_missing_fields'][0]}"
                 }
             
             # Validate bundle
-            bundle_path = plugin_dir / "dist" / "remoteEntry.js"
-            if bundle_path.stat().st_size == 0:
+            if inspection['bundle_size'] == 0:
                 return {
                     'valid': False,
                     'error': 'BrainDriveWhyDetector: Bundle file is empty'
@@ -361,35 +1027,70 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             logger.error(f"BrainDriveWhyDetector: Error validating installation: {e}")
             return {'valid': False, 'error': str(e)}
     
-    async def _get_plugin_health_impl(self, user_id: str, plugin_dir: Path) -> Dict[str, Any]:
-        """Check plugin health"""
+    @staticmethod
+    def _verify_file_digest(path: Path, expected: str) -> Tuple[str, int]:
+        """
+        Compare path against its install-time sha256.
+        
+        Returns ('ok' | 'mismatch' | 'missing', bytes hashed). The file is
+        always hashed: corruption that keeps mtime and size (bit rot, tools
+        that restore mtimes) is what this check exists to catch, so the
+        (mtime, size) shortcut is left to the cheap health check.
+        """
+        signature = _file_signature(path)
+        if signature is None:
+            return 'missing', 0
+        digest = _file_sha256(path)
+        return ('ok' if digest == expected else 'mismatch'), signature[1]
+    
+    async def _verify_shared_files(self, plugin_dir: Path, prefix: str = 'dist/') -> Dict[str, Any]:
+        """Hash every shipped file under prefix against the install-time manifest, off the event loop"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        executor = _get_file_copy_executor()
+        manifest = await loop.run_in_executor(executor, self._read_files_manifest, plugin_dir / SHARED_FILES_MANIFEST)
+        expected = {relpath: record[2] for relpath, record in manifest.items() if relpath.startswith(prefix)}
+        if not expected:
+            return {'checked': False, 'ok': True, 'reason': 'No install manifest'}
+        
+        relpaths = sorted(expected)
+        outcomes = await asyncio.gather(*(
+            loop.run_in_executor(executor, self._verify_file_digest, plugin_dir / relpath, expected[relpath])
+            for relpath in relpaths
+        ))
+        mismatched = [relpath for relpath, (state, _) in zip(relpaths, outcomes) if state == 'mismatch']
+        missing = [relpath for relpath, (state, _) in zip(relpaths, outcomes) if state == 'missing']
+        return {
+            'checked': True,
+            'ok': not mismatched and not missing,
+            'files_verified': len(relpaths),
+            'mismatched': mismatched,
+            'missing': missing,
+            'bytes_hashed': sum(hashed for _, hashed in outcomes)
+        }
+    
+    @_instrumented('plugin_health', failed=lambda result: 'error' in result['details'],
+                   io_bytes=lambda result: (result['details'].get('integrity', {}).get('bytes_hashed', 0), 0))
+    async def _get_plugin_health_impl(self, user_id: str, plugin_dir: Path, deep_verify: bool = False) -> Dict[str, Any]:
+        """Check plugin health; deep_verify also hashes dist/ against the install manifest"""
         try:
+            inspection = self._inspect_plugin_dir(plugin_dir)
             health_info = {
-                'bundle_exists': False,
-                'bundle_size': 0,
-                'package_json_valid': False
+                'bundle_exists': inspection['bundle_exists'],
+                'bundle_size': inspection['bundle_size'],
+                'package_json_valid': inspection['package_json_valid']
             }
             
-            bundle_path = plugin_dir / "dist" / "remoteEntry.js"
-            if bundle_path.exists():
-                health_info['bundle_exists'] = True
-                health_info['bundle_size'] = bundle_path.stat().st_size
-            
-            package_json_path = plugin_dir / "package.json"
-            if package_json_path.exists():
-                try:
-                    with open(package_json_path, 'r') as f:
-                        json.load(f)
-                    health_info['package_json_valid'] = True
-                except json.JSONDecodeError:
-                    pass
-            
             is_healthy = (
                 health_info['bundle_exists'] and 
                 health_info['bundle_size'] > 0 and
                 health_info['package_json_valid']
             )
             
+            if deep_verify:
+                health_info['integrity'] = await self._verify_shared_files(plugin_dir)
+                is_healthy = is_healthy and health_info['integrity']['ok']
+            
             return {
                 'healthy': is_healthy,
                 'details': health_info
@@ -407,13 +1108,7 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
         try:
             plugin_slug = self.plugin_data['plugin_slug']
             
-            plugin_query = text("""
-            SELECT id, name, version, enabled, created_at, updated_at, plugin_slug
-            FROM plugin
-            WHERE user_id = :user_id AND plugin_slug = :plugin_slug
-            """)
-            
-            result = await db.execute(plugin_query, {
+            result = await db.execute(STATEMENTS.PLUGIN_LOOKUP, {
                 'user_id': user_id,
                 'plugin_slug': plugin_slug
             })
@@ -423,14 +1118,7 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
                 return {
                     'exists': True,
                     'plugin_id': plugin_row.id,
-                    'plugin_info': {
-                        'id': plugin_row.id,
-                        'name': plugin_row.name,
-                        'version': plugin_row.version,
-                        'enabled': plugin_row.enabled,
-                        'created_at': plugin_row.created_at,
-                        'updated_at': plugin_row.updated_at
-                    }
+                    'plugin_info': self._plugin_info(plugin_row)
                 }
             else:
                 return {'exists': False}
@@ -439,138 +1127,208 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             logger.error(f"BrainDriveWhyDetector: Error checking existing plugin: {e}")
             return {'exists': False, 'error': str(e)}
     
-    async def _create_database_records(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
-        """Create plugin and module records in database"""
-        try:
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            plugin_slug = self.plugin_data['plugin_slug']
-            plugin_id = f"{user_id}_{plugin_slug}"
-            
-            logger.info(f"BrainDriveWhyDetector: Creating database records for {plugin_id}")
-            
-            plugin_stmt = text("""
-            INSERT INTO plugin
-            (id, name, description, version, type, enabled, icon, category, status,
-            official, author, last_updated, compatibility, downloads, scope,
-            bundle_method, bundle_location, is_local, long_description,
-            config_fields, messages, dependencies, created_at, updated_at, user_id,
-            plugin_slug, source_type, source_url, update_check_url, last_update_check,
-            update_available, latest_version, installation_type, permissions)
-            VALUES
-            (:id, :name, :description, :version, :type, :enabled, :icon, :category,
-            :status, :official, :author, :last_updated, :compatibility, :downloads,
-            :scope, :bundle_method, :bundle_location, :is_local, :long_description,
-            :config_fields, :messages, :dependencies, :created_at, :updated_at, :user_id,
-            :plugin_slug, :source_type, :source_url, :update_check_url, :last_update_check,
-            :update_available, :latest_version, :installation_type, :permissions)
-            """)
-            
-            await db.execute(plugin_stmt, {
-                'id': plugin_id,
-                'name': self.plugin_data['name'],
-                'description': self.plugin_data['description'],
-                'version': self.plugin_data['version'],
-                'type': self.plugin_data['type'],
-                'enabled': True,
-                'icon': self.plugin_data['icon'],
-                'category': self.plugin_data['category'],
-                'status': 'activated',
-                'official': self.plugin_data['official'],
-                'author': self.plugin_data['author'],
-                'last_updated': current_time,
-                'compatibility': self.plugin_data['compatibility'],
-                'downloads': 0,
-                'scope': self.plugin_data['scope'],
-                'bundle_method': self.plugin_data['bundle_method'],
-                'bundle_location': self.plugin_data['bundle_location'],
-                'is_local': self.plugin_data['is_local'],
-                'long_description': self.plugin_data['long_description'],
-                'config_fields': json.dumps({}),
-                'messages': None,
-                'dependencies': None,
+    @staticmethod
+    def _plugin_info(plugin_row: Any) -> Dict[str, Any]:
+        """Status fields of a plugin row"""
+        return {
+            'id': plugin_row.id,
+            'name': plugin_row.name,
+            'version': plugin_row.version,
+            'enabled': plugin_row.enabled,
+            'created_at': plugin_row.created_at,
+            'updated_at': plugin_row.updated_at
+        }
+    
+    # Install rows with every static column already serialized, built once per
+    # class by _install_templates(); per-user rows only fill in ids and times
+    _install_row_templates: Optional[Dict[str, Any]] = None
+    
+    def _install_templates(self) -> Dict[str, Any]:
+        """Static plugin, module and page columns, serialized once per manager class"""
+        cls = type(self)
+        templates = cls.__dict__.get('_install_row_templates')
+        if templates is None:
+            templates = {
+                'plugin': self._plugin_template(),
+                'modules': [(module_data['name'], self._module_template(module_data))
+                            for module_data in self.module_data],
+                'page_content': json.dumps(self._page_content(PAGE_MODULE_ID_TOKEN, PAGE_TIMESTAMP_TOKEN))
+            }
+            cls._install_row_templates = templates
+        return templates
+    
+    def _plugin_template(self) -> Dict[str, Any]:
+        """Plugin row columns that are the same for every user"""
+        return {
+            'name': self.plugin_data['name'],
+            'description': self.plugin_data['description'],
+            'version': self.plugin_data['version'],
+            'type': self.plugin_data['type'],
+            'enabled': True,
+            'icon': self.plugin_data['icon'],
+            'category': self.plugin_data['category'],
+            'status': 'activated',
+            'official': self.plugin_data['official'],
+            'author': self.plugin_data['author'],
+            'compatibility': self.plugin_data['compatibility'],
+            'downloads': 0,
+            'scope': self.plugin_data['scope'],
+            'bundle_method': self.plugin_data['bundle_method'],
+            'bundle_location': self.plugin_data['bundle_location'],
+            'is_local': self.plugin_data['is_local'],
+            'long_description': self.plugin_data['long_description'],
+            'config_fields': json.dumps({}),
+            'messages': None,
+            'dependencies': None,
+            'plugin_slug': self.plugin_data['plugin_slug'],
+            'source_type': self.plugin_data['source_type'],
+            'source_url': self.plugin_data['source_url'],
+            'update_check_url': self.plugin_data['update_check_url'],
+            'last_update_check': self.plugin_data['last_update_check'],
+            'update_available': self.plugin_data['update_available'],
+            'latest_version': self.plugin_data['latest_version'],
+            'installation_type': self.plugin_data['installation_type'],
+            'permissions': json.dumps(self.plugin_data['permissions'])
+        }
+    
+    def _module_template(self, module_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Module row columns that are the same for every user"""
+        return {
+            'name': module_data['name'],
+            'display_name': module_data['display_name'],
+            'description': module_data['description'],
+            'icon': module_data['icon'],
+            'category': module_data['category'],
+            'enabled': True,
+            'priority': module_data['priority'],
+            'props': json.dumps(module_data['props']),
+            'config_fields': json.dumps(module_data['config_fields']),
+            'messages': json.dumps(module_data['messages']),
+            'required_services': json.dumps(module_data['required_services']),
+            'dependencies': json.dumps(module_data['dependencies']),
+            'layout': json.dumps(module_data['layout']),
+            'tags': json.dumps(module_data['tags'])
+        }
+    
+    def _plugin_record(self, user_id: str, current_time: str) -> Dict[str, Any]:
+        """Bind parameters for one user's plugin row"""
+        return {
+            **self._install_templates()['plugin'],
+            'id': f"{user_id}_{self.plugin_data['plugin_slug']}",
+            'last_updated': current_time,
+            'created_at': current_time,
+            'updated_at': current_time,
+            'user_id': user_id
+        }
+    
+    def _module_records(self, user_id: str, plugin_id: str, current_time: str) -> List[Dict[str, Any]]:
+        """Bind parameters for one user's module rows"""
+        plugin_slug = self.plugin_data['plugin_slug']
+        return [
+            {
+                **module_template,
+                'id': f"{user_id}_{plugin_slug}_{module_name}",
+                'plugin_id': plugin_id,
                 'created_at': current_time,
                 'updated_at': current_time,
-                'user_id': user_id,
-                'plugin_slug': plugin_slug,
-                'source_type': self.plugin_data['source_type'],
-                'source_url': self.plugin_data['source_url'],
-                'update_check_url': self.plugin_data['update_check_url'],
-                'last_update_check': self.plugin_data['last_update_check'],
-                'update_available': self.plugin_data['update_available'],
-                'latest_version': self.plugin_data['latest_version'],
-                'installation_type': self.plugin_data['installation_type'],
-                'permissions': json.dumps(self.plugin_data['permissions'])
-            })
-            
-            # Create modules
-            modules_created = []
-            for module_data in self.module_data:
-                module_id = f"{user_id}_{plugin_slug}_{module_data['name']}"
-                
-                module_stmt = text("""
-                INSERT INTO module
-                (id, plugin_id, name, display_name, description, icon, category,
-                enabled, priority, props, config_fields, messages, required_services,
-                dependencies, layout, tags, created_at, updated_at, user_id)
-                VALUES
-                (:id, :plugin_id, :name, :display_name, :description, :icon, :category,
-                :enabled, :priority, :props, :config_fields, :messages, :required_services,
-                :dependencies, :layout, :tags, :created_at, :updated_at, :user_id)
-                """)
-                
-                await db.execute(module_stmt, {
-                    'id': module_id,
-                    'plugin_id': plugin_id,
-                    'name': module_data['name'],
-                    'display_name': module_data['display_name'],
-                    'description': module_data['description'],
-                    'icon': module_data['icon'],
-                    'category': module_data['category'],
-                    'enabled': True,
-                    'priority': module_data['priority'],
-                    'props': json.dumps(module_data['props']),
-                    'config_fields': json.dumps(module_data['config_fields']),
-                    'messages': json.dumps(module_data['messages']),
-                    'required_services': json.dumps(module_data['required_services']),
-                    'dependencies': json.dumps(module_data['dependencies']),
-                    'layout': json.dumps(module_data['layout']),
-                    'tags': json.dumps(module_data['tags']),
-                    'created_at': current_time,
-                    'updated_at': current_time,
-                    'user_id': user_id
-                })
-                
-                modules_created.append(module_id)
-            
-            await db.commit()
-            
-            # Verify
-            verify_query = text("SELECT id FROM plugin WHERE id = :plugin_id AND user_id = :user_id")
-            verify_result = await db.execute(verify_query, {'plugin_id': plugin_id, 'user_id': user_id})
-            verify_row = verify_result.fetchone()
-            
-            if verify_row:
-                logger.info(f"BrainDriveWhyDetector: Created records for {plugin_id}")
-            else:
-                return {'success': False, 'error': 'Plugin creation verification failed'}
-            
-            return {'success': True, 'plugin_id': plugin_id, 'modules_created': modules_created}
-            
-        except Exception as e:
-            logger.error(f"BrainDriveWhyDetector: Error creating database records: {e}")
-            await db.rollback()
-            return {'success': False, 'error': str(e)}
+                'user_id': user_id
+            }
+            for module_name, module_template in self._install_templates()['modules']
+        ]
+    
+    def _page_content(self, module_id: str, timestamp_ms: str) -> Dict[str, Any]:
+        """Page layout placing the coach module full-width on every breakpoint"""
+        layout_id = f"WhyDetector_{module_id}_{timestamp_ms}"
+        
+        def layout_item(w: int, h: int) -> Dict[str, Any]:
+            return {
+                "i": layout_id,
+                "x": 0,
+                "y": 0,
+                "w": w,
+                "h": h,
+                "pluginId": self.plugin_data["plugin_slug"],
+                "args": {
+                    "moduleId": module_id,
+                    "displayName": "Why Discovery Coach"
+                }
+            }
+        
+        return {
+            "layouts": {
+                "desktop": [layout_item(12, 10)],
+                "tablet": [layout_item(4, 6)],
+                "mobile": [layout_item(4, 6)]
+            },
+            "modules": {}
+        }
+    
+    def _page_record(self, user_id: str, module_id: str) -> Dict[str, Any]:
+        """Bind parameters for one user's plugin page row"""
+        utcnow = datetime.datetime.utcnow()
+        now = utcnow.strftime("%Y-%m-%d %H:%M:%S")
+        content = self._install_templates()['page_content']
+        content = content.replace(PAGE_MODULE_ID_TOKEN, json.dumps(module_id)[1:-1])
+        content = content.replace(PAGE_TIMESTAMP_TOKEN, str(int(utcnow.timestamp() * 1000)))
+        return {
+            "id": uuid.uuid4().hex,
+            "name": "Why Finder v1",
+            "route": PAGE_ROUTE,
+            "content": content,
+            "creator_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+            "is_published": 1,
+            "publish_date": now
+        }
+    
+    def _supports_upsert_returning(self, db: AsyncSession) -> bool:
+        """Whether the session's dialect takes INSERT ... ON CONFLICT DO NOTHING RETURNING"""
+        try:
+            dialect_name = db.get_bind().dialect.name
+        except Exception:
+            return False
+        check = UPSERT_RETURNING_DIALECTS.get(dialect_name)
+        return bool(check and check())
+    
+    @_instrumented('create_database_records')
+    async def _create_database_records(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
+        """Insert plugin and module records; the caller commits or rolls back"""
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        plugin_record = self._plugin_record(user_id, current_time)
+        plugin_id = plugin_record['id']
+        
+        logger.info(f"BrainDriveWhyDetector: Creating database records for {plugin_id}")
+        
+        if self._supports_upsert_returning(db):
+            result = await db.execute(STATEMENTS.PLUGIN_UPSERT_RETURNING, plugin_record)
+            installed = result.fetchone() is None
+        else:
+            existing_check = await self._check_existing_plugin(user_id, db)
+            if existing_check.get('error'):
+                return {'success': False, 'error': existing_check['error']}
+            installed = existing_check['exists']
+            if not installed:
+                await db.execute(STATEMENTS.PLUGIN_INSERT, plugin_record)
+        
+        if installed:
+            logger.warning(f"BrainDriveWhyDetector: Already installed for {user_id}")
+            return {'success': False, 'error': 'Plugin already installed', 'plugin_id': plugin_id}
+        
+        # Create modules
+        module_records = self._module_records(user_id, plugin_id, current_time)
+        await db.execute(STATEMENTS.MODULE_INSERT, module_records)
+        modules_created = [module_record['id'] for module_record in module_records]
+        
+        logger.info(f"BrainDriveWhyDetector: Created records for {plugin_id}")
+        return {'success': True, 'plugin_id': plugin_id, 'modules_created': modules_created}
     
+    @_instrumented('delete_database_records')
     async def _delete_database_records(self, user_id: str, plugin_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Delete plugin and module records from database"""
         try:
             # Delete modules first
-            module_delete_stmt = text("""
-            DELETE FROM module 
-            WHERE plugin_id = :plugin_id AND user_id = :user_id
-            """)
-            
-            module_result = await db.execute(module_delete_stmt, {
+            module_result = await db.execute(STATEMENTS.MODULE_DELETE, {
                 'plugin_id': plugin_id,
                 'user_id': user_id
             })
@@ -578,12 +1336,7 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             deleted_modules = module_result.rowcount
             
             # Delete plugin
-            plugin_delete_stmt = text("""
-            DELETE FROM plugin 
-            WHERE id = :plugin_id AND user_id = :user_id
-            """)
-            
-            plugin_result = await db.execute(plugin_delete_stmt, {
+            plugin_result = await db.execute(STATEMENTS.PLUGIN_DELETE, {
                 'plugin_id': plugin_id,
                 'user_id': user_id
             })
@@ -602,17 +1355,14 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             await db.rollback()
             return {'success': False, 'error': str(e)}
     
+    @_instrumented('create_plugin_page')
     async def _create_plugin_page(self, user_id: str, db: AsyncSession, modules_created: List[str]) -> Dict[str, Any]:
-        """Create a page for the WhyDetector plugin"""
+        """Create a page for the WhyDetector plugin; the caller commits or rolls back"""
         try:
             # Check if page already exists
-            check_stmt = text("""
-                SELECT id FROM pages
-                WHERE creator_id = :user_id AND route = :route
-            """)
-            existing_result = await db.execute(check_stmt, {
+            existing_result = await db.execute(STATEMENTS.PAGE_EXISTS, {
                 "user_id": user_id,
-                "route": "why-finder-v1"
+                "route": PAGE_ROUTE
             })
             existing = existing_result.fetchone()
             
@@ -630,12 +1380,8 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             
             if not module_id:
                 # Fallback query
-                module_stmt = text("""
-                    SELECT id FROM module
-                    WHERE user_id = :user_id AND plugin_id = :plugin_id AND name = :name
-                """)
                 plugin_id = f"{user_id}_{self.plugin_data['plugin_slug']}"
-                module_result = await db.execute(module_stmt, {
+                module_result = await db.execute(STATEMENTS.MODULE_LOOKUP, {
                     "user_id": user_id,
                     "plugin_id": plugin_id,
                     "name": "BrainDriveWhyDetector"
@@ -648,103 +1394,23 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
                 logger.error(f"BrainDriveWhyDetector: Failed to resolve module ID for {user_id}")
                 return {"success": False, "error": "Unable to resolve WhyDetector module ID"}
             
-            # Create page content with layouts
-            timestamp_ms = int(datetime.datetime.utcnow().timestamp() * 1000)
-            layout_id = f"WhyDetector_{module_id}_{timestamp_ms}"
-            
-            content = {
-                "layouts": {
-                    "desktop": [
-                        {
-                            "i": layout_id,
-                            "x": 0,
-                            "y": 0,
-                            "w": 12,
-                            "h": 10,
-                            "pluginId": self.plugin_data["plugin_slug"],
-                            "args": {
-                                "moduleId": module_id,
-                                "displayName": "Why Discovery Coach"
-                            }
-                        }
-                    ],
-                    "tablet": [
-                        {
-                            "i": layout_id,
-                            "x": 0,
-                            "y": 0,
-                            "w": 4,
-                            "h": 6,
-                            "pluginId": self.plugin_data["plugin_slug"],
-                            "args": {
-                                "moduleId": module_id,
-                                "displayName": "Why Discovery Coach"
-                            }
-                        }
-                    ],
-                    "mobile": [
-                        {
-                            "i": layout_id,
-                            "x": 0,
-                            "y": 0,
-                            "w": 4,
-                            "h": 6,
-                            "pluginId": self.plugin_data["plugin_slug"],
-                            "args": {
-                                "moduleId": module_id,
-                                "displayName": "Why Discovery Coach"
-                            }
-                        }
-                    ]
-                },
-                "modules": {}
-            }
-            
-            # Insert page
-            page_id = uuid.uuid4().hex
-            now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-            
-            insert_stmt = text("""
-                INSERT INTO pages (
-                    id, name, route, content, creator_id,
-                    created_at, updated_at, is_published, publish_date
-                ) VALUES (
-                    :id, :name, :route, :content, :creator_id,
-                    :created_at, :updated_at, :is_published, :publish_date
-                )
-            """)
-            
-            await db.execute(insert_stmt, {
-                "id": page_id,
-                "name": "Why Finder v1",
-                "route": "why-finder-v1",
-                "content": json.dumps(content),
-                "creator_id": user_id,
-                "created_at": now,
-                "updated_at": now,
-                "is_published": 1,
-                "publish_date": now
-            })
+            page_record = self._page_record(user_id, module_id)
+            page_id = page_record['id']
+            await db.execute(STATEMENTS.PAGE_INSERT, page_record)
             
-            await db.commit()
             logger.info(f"BrainDriveWhyDetector: Created page for {user_id}", page_id=page_id)
             return {"success": True, "page_id": page_id, "created": True}
             
         except Exception as e:
-            await db.rollback()
             logger.error(f"BrainDriveWhyDetector: Failed to create page for {user_id}: {e}")
             return {"success": False, "error": str(e)}
     
     async def _delete_plugin_page(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Delete the WhyDetector plugin page"""
         try:
-            delete_stmt = text("""
-                DELETE FROM pages
-                WHERE creator_id = :user_id AND route = :route
-            """)
-            result = await db.execute(delete_stmt, {
+            result = await db.execute(STATEMENTS.PAGE_DELETE, {
                 "user_id": user_id,
-                "route": "why-finder-v1"
+                "route": PAGE_ROUTE
             })
             await db.commit()
             logger.info(f"BrainDriveWhyDetector: Deleted page for {user_id}", deleted_rows=result.rowcount)
@@ -770,15 +1436,6 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
         try:
             logger.info(f"BrainDriveWhyDetector: Starting installation for {user_id}")
             
-            existing_check = await self._check_existing_plugin(user_id, db)
-            if existing_check['exists']:
-                logger.warning(f"BrainDriveWhyDetector: Already installed for {user_id}")
-                return {
-                    'success': False,
-                    'error': 'Plugin already installed',
-                    'plugin_id': existing_check['plugin_id']
-                }
-            
             shared_path = self.shared_path
             shared_path.mkdir(parents=True, exist_ok=True)
 
@@ -786,13 +1443,14 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             if not copy_result['success']:
                 return copy_result
             
-            result = await self.install_for_user(user_id, db, shared_path)
+            # Call _perform_user_installation directly: the base class's
+            # install_for_user gates on the in-process active_users set, which
+            # goes stale once rows are removed elsewhere. An existing install
+            # is detected inside the install transaction instead
+            result = await self._perform_user_installation(user_id, db, shared_path)
             
             if result.get('success'):
-                verify_check = await self._check_existing_plugin(user_id, db)
-                if not verify_check['exists']:
-                    return {'success': False, 'error': 'Installation verification failed'}
-                
+                self.active_users.add(user_id)
                 result.update({
                     'plugin_slug': self.plugin_data['plugin_slug'],
                     'plugin_name': self.plugin_data['name']
@@ -811,19 +1469,162 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
             # Call _perform_user_uninstallation directly (don't use base class uninstall_for_user 
             # which checks active_users runtime set)
             result = await self._perform_user_uninstallation(user_id, db)
+            if result.get('success'):
+                self.active_users.discard(user_id)
             return result
         except Exception as e:
             logger.error(f"BrainDriveWhyDetector: Delete failed: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def get_plugin_status(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
-        """Get plugin status"""
+    async def _select_by_user(self, statement: Any, user_ids: List[str], db: AsyncSession, **params: Any) -> Dict[str, str]:
+        """Run a two-column (user id, row id) STATEMENTS lookup for a batch of users as one IN query"""
+        result = await db.execute(statement, {'user_ids': user_ids, **params})
+        return {row[0]: row[1] for row in result.fetchall()}
+    
+    async def _install_batch(self, user_ids: List[str], db: AsyncSession) -> Dict[str, Dict[str, Any]]:
+        """Install for one batch of users in a single transaction"""
+        installed = await self._select_by_user(STATEMENTS.PLUGIN_IDS_BY_USER, user_ids, db,
+                                               plugin_slug=self.plugin_data['plugin_slug'])
+        pages = await self._select_by_user(STATEMENTS.PAGE_IDS_BY_USER, user_ids, db, route=PAGE_ROUTE)
+        
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        plugin_rows, module_rows, page_rows = [], [], []
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        for user_id in user_ids:
+            if user_id in installed:
+                outcomes[user_id] = {'success': False, 'error': 'Plugin already installed', 'plugin_id': installed[user_id]}
+                continue
+            
+            plugin_row = self._plugin_record(user_id, current_time)
+            user_modules = self._module_records(user_id, plugin_row['id'], current_time)
+            plugin_rows.append(plugin_row)
+            module_rows.extend(user_modules)
+            
+            page_id = pages.get(user_id)
+            if page_id is None:
+                module_id = next(m['id'] for m in user_modules if m['id'].endswith("_BrainDriveWhyDetector"))
+                page_row = self._page_record(user_id, module_id)
+                page_rows.append(page_row)
+                page_id = page_row['id']
+            
+            outcomes[user_id] = {
+                'success': True,
+                'plugin_id': plugin_row['id'],
+                'modules_created': [m['id'] for m in user_modules],
+                'page_id': page_id,
+                'page_created': user_id not in pages
+            }
+        
+        # One executemany per table, committed together
+        if plugin_rows:
+            await db.execute(STATEMENTS.PLUGIN_INSERT, plugin_rows)
+            await db.execute(STATEMENTS.MODULE_INSERT, module_rows)
+        if page_rows:
+            await db.execute(STATEMENTS.PAGE_INSERT, page_rows)
+        await db.commit()
+        
+        self.active_users.update(user_id for user_id, outcome in outcomes.items() if outcome['success'])
+        return outcomes
+    
+    async def _install_one(self, user_id: str, db: AsyncSession) -> Dict[str, Any]:
+        result = await self._perform_user_installation(user_id, db, self.shared_path)
+        if result.get('success'):
+            self.active_users.add(user_id)
+        return result
+    
+    async def _delete_batch(self, user_ids: List[str], db: AsyncSession) -> Dict[str, Dict[str, Any]]:
+        """Uninstall for one batch of users in a single transaction"""
+        installed = await self._select_by_user(STATEMENTS.PLUGIN_IDS_BY_USER, user_ids, db,
+                                               plugin_slug=self.plugin_data['plugin_slug'])
+        outcomes: Dict[str, Dict[str, Any]] = {
+            user_id: {'success': True, 'plugin_id': installed[user_id]} if user_id in installed
+            else {'success': False, 'error': 'Plugin not found for user'}
+            for user_id in user_ids
+        }
+        
+        if installed:
+            records = [{'user_id': user_id, 'plugin_id': plugin_id} for user_id, plugin_id in installed.items()]
+            await db.execute(STATEMENTS.PAGE_DELETE, [{'user_id': user_id, 'route': PAGE_ROUTE} for user_id in installed])
+            await db.execute(STATEMENTS.MODULE_DELETE, records)
+            await db.execute(STATEMENTS.PLUGIN_DELETE, records)
+            await db.commit()
+        
+        self.active_users.difference_update(installed)
+        return outcomes
+    
+    async def _run_bulk(self, operation: str, user_ids: List[str], db: AsyncSession, batch_size: int,
+                        run_batch: Callable, run_one: Callable) -> Dict[str, Any]:
+        # A failed batch is rolled back and retried user by user, so one bad
+        # row only fails its own user
+        user_ids = list(dict.fromkeys(user_ids))
+        batch_size = max(1, int(batch_size))
+        results: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            try:
+                results.update(await run_batch(batch, db))
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"BrainDriveWhyDetector: Bulk {operation} batch of {len(batch)} failed, retrying per user: {e}")
+                for user_id in batch:
+                    try:
+                        results[user_id] = await run_one(user_id, db)
+                    except Exception as user_error:
+                        await db.rollback()
+                        results[user_id] = {'success': False, 'error': str(user_error)}
+        
+        succeeded = sum(1 for outcome in results.values() if outcome.get('success'))
+        logger.info(f"BrainDriveWhyDetector: Bulk {operation} finished: {succeeded}/{len(user_ids)} users")
+        return {
+            'success': succeeded == len(user_ids),
+            'total': len(user_ids),
+            'succeeded': succeeded,
+            'failed': len(user_ids) - succeeded,
+            'results': results
+        }
+    
+    async def install_plugin_bulk(self, user_ids: List[str], db: AsyncSession,
+                                  batch_size: int = BULK_INSTALL_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Install the plugin for many users.
+        
+        Per batch of users: one IN query finds existing plugins, one finds
+        existing pages, then the plugin, module and page rows go in as one
+        executemany each inside a single transaction. Returns per-user
+        outcomes under 'results', shaped like install_plugin's result.
+        """
+        try:
+            if user_ids:
+                shared_path = self.shared_path
+                shared_path.mkdir(parents=True, exist_ok=True)
+                copy_result = await self._copy_plugin_files_impl(user_ids[0], shared_path)
+                if not copy_result['success']:
+                    return copy_result
+            
+            return await self._run_bulk('install', user_ids, db, batch_size, self._install_batch, self._install_one)
+            
+        except Exception as e:
+            logger.error(f"BrainDriveWhyDetector: Bulk install failed: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    async def delete_plugin_bulk(self, user_ids: List[str], db: AsyncSession,
+                                 batch_size: int = BULK_INSTALL_BATCH_SIZE) -> Dict[str, Any]:
+        """Uninstall the plugin for many users with batched DELETEs, one transaction per batch"""
+        try:
+            return await self._run_bulk('delete', user_ids, db, batch_size,
+                                        self._delete_batch, self._perform_user_uninstallation)
+        except Exception as e:
+            logger.error(f"BrainDriveWhyDetector: Bulk delete failed: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    async def get_plugin_status(self, user_id: str, db: AsyncSession, deep_verify: bool = False) -> Dict[str, Any]:
+        """Get plugin status; deep_verify re-hashes the shipped dist/ files"""
         try:
             existing_check = await self._check_existing_plugin(user_id, db)
             if not existing_check['exists']:
                 return {'exists': False, 'status': 'not_installed'}
             
-            plugin_health = await self._get_plugin_health_impl(user_id, self.shared_path)
+            plugin_health = await self._get_plugin_health_impl(user_id, self.shared_path, deep_verify)
             
             return {
                 'exists': True,
@@ -836,20 +1637,154 @@ class BrainDriveWhyDetectorLifecycleManager(BaseLifecycleManager):
         except Exception as e:
             logger.error(f"BrainDriveWhyDetector: Error checking status: {e}")
             return {'exists': False, 'status': 'error', 'error': str(e)}
+    
+    async def get_plugin_status_many(self, user_ids: List[str], db: AsyncSession,
+                                     deep_verify: bool = False,
+                                     chunk_size: int = STATUS_QUERY_CHUNK_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Plugin status for many users, as user_id -> get_plugin_status result.
+        
+        Plugin rows are fetched with one IN query per chunk of users, and the
+        shared path's health is checked once for the whole call.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        try:
+            plugin_rows = {}
+            for start in range(0, len(user_ids), chunk_size):
+                result = await db.execute(STATEMENTS.PLUGIN_LOOKUP_MANY, {
+                    'user_ids': user_ids[start:start + chunk_size],
+                    'plugin_slug': self.plugin_data['plugin_slug']
+                })
+                plugin_rows.update((row.user_id, row) for row in result.fetchall())
+            
+            plugin_health = None
+            if plugin_rows:
+                plugin_health = await self._get_plugin_health_impl(None, self.shared_path, deep_verify)
+            
+            statuses = {}
+            for user_id in user_ids:
+                plugin_row = plugin_rows.get(user_id)
+                if plugin_row is None:
+                    statuses[user_id] = {'exists': False, 'status': 'not_installed'}
+                    continue
+                statuses[user_id] = {
+                    'exists': True,
+                    'status': 'healthy' if plugin_health['healthy'] else 'unhealthy',
+                    'plugin_id': plugin_row.id,
+                    'plugin_info': self._plugin_info(plugin_row),
+                    'health_details': plugin_health['details']
+                }
+            return statuses
+            
+        except Exception as e:
+            logger.error(f"BrainDriveWhyDetector: Error checking status for {len(user_ids)} users: {e}")
+            return {user_id: {'exists': False, 'status': 'error', 'error': str(e)} for user_id in user_ids}
+
+
+_lifecycle_manager_class_lock = threading.Lock()
+
+def _lifecycle_manager_class() -> type:
+    """BrainDriveWhyDetectorLifecycleManager, built against the base class on first use"""
+    manager_class = globals().get('BrainDriveWhyDetectorLifecycleManager')
+    if manager_class is None:
+        with _lifecycle_manager_class_lock:
+            manager_class = globals().get('BrainDriveWhyDetectorLifecycleManager')
+            if manager_class is None:
+                manager_class = type('BrainDriveWhyDetectorLifecycleManager',
+                                     (_WhyDetectorLifecycleMethods, _resolve_base_lifecycle_manager()),
+                                     {'__module__': __name__, '__doc__': _WhyDetectorLifecycleMethods.__doc__})
+                globals()['BrainDriveWhyDetectorLifecycleManager'] = manager_class
+    return manager_class
+
+_LAZY_ATTRIBUTES = {
+    'BrainDriveWhyDetectorLifecycleManager': _lifecycle_manager_class,
+    'BaseLifecycleManager': _resolve_base_lifecycle_manager,
+}
+
+def __getattr__(name: str) -> Any:
+    # Module attributes resolved on first access (PEP 562)
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# One manager per plugins_base_dir for the whole process, so setup runs once
+# and in-memory state (active users, health cache) survives between calls
+_lifecycle_managers: Dict[Optional[str], Any] = {}
+_lifecycle_managers_lock = threading.Lock()
+
+def _manager_registry_key(plugins_base_dir: Optional[str]) -> Optional[str]:
+    return os.path.abspath(plugins_base_dir) if plugins_base_dir else None
+
+def get_lifecycle_manager(plugins_base_dir: str = None) -> Any:
+    """
+    Shared lifecycle manager for plugins_base_dir.
+    
+    Built on first use and reused afterwards; after a plugin update, drop
+    stale managers with invalidate_lifecycle_managers. Safe to call from any
+    thread or task.
+    """
+    key = _manager_registry_key(plugins_base_dir)
+    manager = _lifecycle_managers.get(key)
+    if manager is not None:
+        return manager
+    with _lifecycle_managers_lock:
+        manager = _lifecycle_managers.get(key)
+        if manager is None:
+            manager = _lifecycle_manager_class()(plugins_base_dir)
+            _lifecycle_managers[key] = manager
+        return manager
+
+def invalidate_lifecycle_managers(plugins_base_dir: str = None, version: str = None) -> int:
+    """
+    Drop shared managers so the next call builds fresh ones.
+    
+    Limited to plugins_base_dir when given, and to managers whose version
+    differs from version when given (e.g. after updating the plugin).
+    Returns how many were dropped.
+    """
+    with _lifecycle_managers_lock:
+        keys = [
+            key for key, manager in _lifecycle_managers.items()
+            if (plugins_base_dir is None or key == _manager_registry_key(plugins_base_dir))
+            and (version is None or manager.plugin_data['version'] != version)
+        ]
+        for key in keys:
+            del _lifecycle_managers[key]
+    if keys:
+        logger.info(f"BrainDriveWhyDetector: Dropped {len(keys)} cached lifecycle managers")
+    return len(keys)
 
 
 # Standalone functions for compatibility with BrainDrive installer
 async def install_plugin(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveWhyDetectorLifecycleManager(plugins_base_dir)
+    manager = get_lifecycle_manager(plugins_base_dir)
     return await manager.install_plugin(user_id, db)
 
 async def delete_plugin(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveWhyDetectorLifecycleManager(plugins_base_dir)
+    manager = get_lifecycle_manager(plugins_base_dir)
     return await manager.delete_plugin(user_id, db)
 
-async def get_plugin_status(user_id: str, db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
-    manager = BrainDriveWhyDetectorLifecycleManager(plugins_base_dir)
-    return await manager.get_plugin_status(user_id, db)
+async def get_plugin_status(user_id: str, db: AsyncSession, plugins_base_dir: str = None,
+                            deep_verify: bool = False) -> Dict[str, Any]:
+    manager = get_lifecycle_manager(plugins_base_dir)
+    return await manager.get_plugin_status(user_id, db, deep_verify)
+
+async def get_plugin_status_many(user_ids: List[str], db: AsyncSession, plugins_base_dir: str = None,
+                                 deep_verify: bool = False) -> Dict[str, Dict[str, Any]]:
+    manager = get_lifecycle_manager(plugins_base_dir)
+    return await manager.get_plugin_status_many(user_ids, db, deep_verify)
+
+async def install_plugin_bulk(user_ids: List[str], db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
+    manager = get_lifecycle_manager(plugins_base_dir)
+    return await manager.install_plugin_bulk(user_ids, db)
+
+async def delete_plugin_bulk(user_ids: List[str], db: AsyncSession, plugins_base_dir: str = None) -> Dict[str, Any]:
+    manager = get_lifecycle_manager(plugins_base_dir)
+    return await manager.delete_plugin_bulk(user_ids, db)
 
 
 # ===========================================================================
@@ -879,206 +1814,2344 @@ def sanitize_filename(name: str) -> str:
     safe_name = safe_name.strip().replace(' ', '_')
     return safe_name[:100]  # Limit length
 
-# WHY PROFILES
-def save_why_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Save a Why profile to JSON file"""
-    try:
-        profiles_dir = get_why_profiles_dir()
-        
-        # Use profile name for filename, fallback to id
-        profile_name = profile_data.get('name', profile_data.get('id', 'unnamed'))
-        safe_name = sanitize_filename(profile_name)
-        profile_id = profile_data.get('id', f"why_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        # Create filename: name_id.json
-        filename = f"{safe_name}_{profile_id[-8:]}.json"
-        filepath = profiles_dir / filename
-        
-        # Add metadata
-        profile_data['_filename'] = filename
-        profile_data['_savedAt'] = datetime.datetime.now().isoformat()
-        
-        # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        logger.info(f"WhyDetector: Saved Why profile to {filepath}")
-        return {'success': True, 'filename': filename, 'path': str(filepath)}
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: Error saving Why profile: {e}")
-        return {'success': False, 'error': str(e)}
 
-def load_why_profiles() -> List[Dict[str, Any]]:
-    """Load all Why profiles from JSON files"""
-    try:
-        profiles_dir = get_why_profiles_dir()
-        profiles = []
-        
-        for filepath in profiles_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    profile['_filename'] = filepath.name
-                    profiles.append(profile)
-            except Exception as e:
-                logger.warning(f"WhyDetector: Error loading profile {filepath}: {e}")
-                continue
-        
-        # Sort by creation date, newest first
-        profiles.sort(key=lambda p: p.get('createdAt', ''), reverse=True)
-        
-        logger.info(f"WhyDetector: Loaded {len(profiles)} Why profiles")
-        return profiles
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: Error loading Why profiles: {e}")
-        return []
+class ProfileKind(NamedTuple):
+    """Static description of one profile type handled by the profile store"""
+    key: str
+    label: str
+    id_prefix: str
+    get_dir: Callable[[], Path]
+    summarize: Callable[[Dict[str, Any]], Dict[str, Any]]
+    search_text: Callable[[Dict[str, Any]], List[str]]
 
-def delete_why_profile(profile_id: str) -> Dict[str, Any]:
-    """Delete a Why profile JSON file"""
-    try:
-        profiles_dir = get_why_profiles_dir()
-        
-        # Find file with matching id
-        for filepath in profiles_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    if profile.get('id') == profile_id:
-                        filepath.unlink()
-                        logger.info(f"WhyDetector: Deleted Why profile {filepath}")
-                        return {'success': True, 'deleted': str(filepath)}
-            except:
-                continue
-        
-        return {'success': False, 'error': 'Profile not found'}
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: Error deleting Why profile: {e}")
-        return {'success': False, 'error': str(e)}
 
-# IKIGAI PROFILES
-def save_ikigai_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Save an Ikigai profile to JSON file"""
+def _count(value: Any) -> int:
+    return len(value) if isinstance(value, (list, tuple)) else 0
+
+def summarize_why_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the WhyProfileSummary shape for a Why profile"""
+    return {
+        'id': profile.get('id'),
+        'name': profile.get('name'),
+        'whyStatement': profile.get('whyStatement'),
+        'createdAt': profile.get('createdAt'),
+        'loveCount': _count(profile.get('whatYouLove')),
+        'goodAtCount': _count(profile.get('whatYouAreGoodAt'))
+    }
+
+def summarize_ikigai_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the IkigaiProfileSummary shape for an Ikigai profile"""
+    return {
+        'id': profile.get('id'),
+        'name': profile.get('name'),
+        'whyStatement': profile.get('whyStatement'),
+        'isComplete': bool(profile.get('isComplete', False)),
+        'createdAt': profile.get('createdAt')
+    }
+
+
+def _collect_text(value: Any, out: List[str]) -> List[str]:
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_text(item, out)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_text(item, out)
+    return out
+
+def why_profile_search_text(profile: Dict[str, Any]) -> List[str]:
+    """Text of a Why profile that the search index covers"""
+    fields = ('name', 'whyStatement', 'summary', 'patterns', 'whyExplanation', 'whatYouLove', 'whatYouAreGoodAt')
+    return _collect_text([profile.get(field) for field in fields], [])
+
+def ikigai_profile_search_text(profile: Dict[str, Any]) -> List[str]:
+    """Text of an Ikigai profile that the search index covers (buckets and overlaps included)"""
+    fields = ('name', 'whyStatement', 'keyPatterns', 'love', 'goodAt', 'worldNeeds', 'paidFor', 'overlaps')
+    return _collect_text([profile.get(field) for field in fields], [])
+
+
+WHY_PROFILES = ProfileKind('why', 'Why', 'why', get_why_profiles_dir,
+                           summarize_why_profile, why_profile_search_text)
+IKIGAI_PROFILES = ProfileKind('ikigai', 'Ikigai', 'ikigai', get_ikigai_profiles_dir,
+                              summarize_ikigai_profile, ikigai_profile_search_text)
+
+PROFILE_KINDS: Dict[str, ProfileKind] = {
+    WHY_PROFILES.key: WHY_PROFILES,
+    IKIGAI_PROFILES.key: IKIGAI_PROFILES
+}
+
+def profile_scope_key(user_id: Optional[str] = None) -> str:
+    """Directory/partition name for a user's profiles ('default' when no user is given)"""
+    if not user_id:
+        return 'default'
+    return 'u' + hashlib.sha256(str(user_id).encode('utf-8')).hexdigest()[:32]
+
+def profile_relpath(profile_id: str) -> str:
+    """Hashed fan-out location of a profile inside its scope, e.g. 'ab/cd/<id>.<sha1 of id>.json'"""
+    digest = hashlib.sha1(profile_id.encode('utf-8')).hexdigest()
+    # The readable part is lossy (sanitized and truncated), so the full
+    # digest keeps ids that sanitize to the same name in separate files
+    name = sanitize_filename(profile_id)[:64]
+    return f"{digest[:2]}/{digest[2:4]}/{name + '.' if name else ''}{digest}.json"
+
+def get_profile_scope_dir(kind: ProfileKind, user_id: Optional[str] = None) -> Path:
+    """Get the directory holding one user's profiles of a kind"""
+    scope_dir = kind.get_dir() / 'users' / profile_scope_key(user_id)
+    scope_dir.mkdir(parents=True, exist_ok=True)
+    if not user_id:
+        _migrate_legacy_profiles(kind, scope_dir)
+    return scope_dir
+
+
+class ProfileIndex:
+    """
+    Process-wide cache of the parsed profiles under one profiles directory.
+
+    Every parsed profile is keyed by the (inode, mtime, size) of its file, so
+    a refresh only has to stat the directory tree and re-parse the files
+    that were added or changed since the previous call.
+    """
+
+    def __init__(self, profiles_dir: Path):
+        self.profiles_dir = profiles_dir
+        self._entries: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+        self._sorted: Optional[List[Dict[str, Any]]] = None
+        self._failures: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def _walk(self):
+        """Yield (relpath, DirEntry) for every profile file"""
+        pending = [('', self.profiles_dir)]
+        while pending:
+            rel_dir, abs_dir = pending.pop()
+            with os.scandir(abs_dir) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((rel, entry.path))
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name.endswith('.json'):
+                        yield rel, entry
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Revalidate the cache against the directory tree and return profiles, newest first"""
+        return self.refresh_with_errors()[0]
+
+    def refresh_with_errors(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """
+        Revalidate the cache and return (profiles newest first, per-file errors).
+
+        Files that fail to parse are remembered by the same stat key, so a
+        broken file is reported on every call but only re-read once it
+        changes.
+        """
+        with self._lock:
+            entries = {}
+            failures = {}
+            to_parse = []
+
+            for rel, entry in self._walk():
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                key = (st.st_ino, st.st_mtime_ns, st.st_size)
+                cached = self._entries.get(rel)
+                if cached is not None and cached[0] == key:
+                    entries[rel] = cached
+                    continue
+                failed = self._failures.get(rel)
+                if failed is not None and failed[0] == key:
+                    failures[rel] = failed
+                    continue
+                to_parse.append((rel, entry.path, key))
+
+            for rel, key, profile, error in _parse_profile_files(to_parse):
+                if error is not None:
+                    logger.warning(f"WhyDetector: Error loading profile {self.profiles_dir / rel}: {error}")
+                    failures[rel] = (key, error)
+                else:
+                    entries[rel] = (key, profile)
+
+            if to_parse or len(entries) != len(self._entries):
+                self._entries = entries
+                self._sorted = None
+            self._failures = failures
+
+            if self._sorted is None:
+                # Newest first by (createdAt, id), the order the manifest lists in
+                self._sorted = sorted(
+                    (profile for _, profile in self._entries.values()),
+                    key=lambda p: (str(p.get('createdAt') or ''), str(p.get('id') or '')),
+                    reverse=True
+                )
+
+            # Hand out shallow copies so callers cannot mutate the cache
+            errors = [{'file': rel, 'error': error} for rel, (_, error) in sorted(failures.items())]
+            return [dict(profile) for profile in self._sorted], errors
+
+    def invalidate(self, filename: str = None) -> None:
+        """Drop one cached file (or everything) so the next refresh re-reads it"""
+        with self._lock:
+            if filename is None:
+                self._entries = {}
+                self._failures = {}
+            else:
+                self._entries.pop(filename, None)
+                self._failures.pop(filename, None)
+            self._sorted = None
+
+    def read(self, filename: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Return (profile, error) for one file without walking the tree.
+
+        A file whose stat still matches its cached entry is served from the
+        cache; any other file is read on its own and not added to the cache,
+        so one pass over many files keeps a single profile in memory.
+        (None, None) means the file is gone.
+        """
+        path = self.profiles_dir / filename
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None, None
+        except OSError as e:
+            return None, str(e)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(filename)
+            if cached is not None and cached[0] == key:
+                return dict(cached[1]), None
+            failed = self._failures.get(filename)
+            if failed is not None and failed[0] == key:
+                return None, failed[1]
+        try:
+            return _read_profile_file(path, filename), None
+        except FileNotFoundError:
+            return None, None
+        except Exception as e:
+            logger.warning(f"WhyDetector: Error loading profile {path}: {e}")
+            return None, str(e)
+
+
+PROFILE_LOAD_WORKERS = max(1, int(os.environ.get('WHYDETECTOR_PROFILE_LOAD_WORKERS', '8')))
+PROFILE_PARALLEL_LOAD_MIN_FILES = 16
+
+def _get_profile_load_executor() -> ThreadPoolExecutor:
+    # Kept apart from the async API executor: a refresh running on that pool
+    # must never wait on its own workers
+    return _get_executor('profile-load', PROFILE_LOAD_WORKERS)
+
+def _parse_one_profile(job: Tuple[str, str, Tuple[int, int, int]]):
+    rel, path, key = job
     try:
-        profiles_dir = get_ikigai_profiles_dir()
-        
-        profile_name = profile_data.get('name', profile_data.get('id', 'unnamed'))
-        safe_name = sanitize_filename(profile_name)
-        profile_id = profile_data.get('id', f"ikigai_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        filename = f"{safe_name}_{profile_id[-8:]}.json"
-        filepath = profiles_dir / filename
-        
-        profile_data['_filename'] = filename
-        profile_data['_savedAt'] = datetime.datetime.now().isoformat()
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(profile_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        logger.info(f"WhyDetector: Saved Ikigai profile to {filepath}")
-        return {'success': True, 'filename': filename, 'path': str(filepath)}
-        
+        return rel, key, _read_profile_file(Path(path), rel), None
     except Exception as e:
-        logger.error(f"WhyDetector: Error saving Ikigai profile: {e}")
-        return {'success': False, 'error': str(e)}
+        return rel, key, None, str(e)
+
+def _parse_profile_files(jobs: List[Tuple[str, str, Tuple[int, int, int]]]):
+    """
+    Parse profile files, concurrently once there are enough of them.
+
+    Cold loads on network or overlay filesystems are dominated by per-file
+    latency, so reads are overlapped on PROFILE_LOAD_WORKERS threads;
+    small warm refreshes stay on the calling thread.
+    """
+    if PROFILE_LOAD_WORKERS == 1 or len(jobs) < PROFILE_PARALLEL_LOAD_MIN_FILES:
+        return [_parse_one_profile(job) for job in jobs]
+    return list(_get_profile_load_executor().map(_parse_one_profile, jobs))
+
+
+# Per-scope caches (parsed profiles, manifests, search indexes) are kept
+# for this many scopes each; the least recently used scope is dropped first
+PROFILE_CACHE_MAX_SCOPES = max(1, int(os.environ.get('WHYDETECTOR_PROFILE_CACHE_MAX_SCOPES', '256')))
+
+
+class ScopeCache:
+    """
+    Thread-safe LRU of per-scope objects, built on first use.
+
+    Holds at most ``max_size`` objects; adding one more drops the least
+    recently used, after handing it to ``on_evict`` (e.g. to persist it).
+    An evicted object is simply rebuilt on its scope's next use.
+    """
+
+    def __init__(self, max_size: int, on_evict: Callable[[Any], None] = None):
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._items: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """Return the object cached under key, building it with factory if needed"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                return item
+            item = self._items[key] = factory()
+            evicted = []
+            while len(self._items) > self.max_size:
+                evicted.append(self._items.popitem(last=False)[1])
+        if self.on_evict is not None:
+            for old in evicted:
+                self.on_evict(old)
+        return item
+
+    def values(self) -> List[Any]:
+        with self._lock:
+            return list(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+_profile_indexes = ScopeCache(PROFILE_CACHE_MAX_SCOPES)
+
+def get_profile_index(profiles_dir: Path) -> ProfileIndex:
+    """Get the process-wide ProfileIndex for a profiles directory"""
+    return _profile_indexes.get(str(profiles_dir), lambda: ProfileIndex(profiles_dir))
+
 
-def load_ikigai_profiles() -> List[Dict[str, Any]]:
-    """Load all Ikigai profiles from JSON files"""
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry change (rename/unlink) to disk where the OS allows it"""
+    if os.name != 'posix':
+        return
+    fd = os.open(str(path), os.O_RDONLY)
     try:
-        profiles_dir = get_ikigai_profiles_dir()
-        profiles = []
-        
-        for filepath in profiles_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    profile['_filename'] = filepath.name
-                    profiles.append(profile)
-            except Exception as e:
-                logger.warning(f"WhyDetector: Error loading profile {filepath}: {e}")
-                continue
-        
-        profiles.sort(key=lambda p: p.get('createdAt', ''), reverse=True)
-        
-        logger.info(f"WhyDetector: Loaded {len(profiles)} Ikigai profiles")
-        return profiles
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: Error loading Ikigai profiles: {e}")
-        return []
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-def delete_ikigai_profile(profile_id: str) -> Dict[str, Any]:
-    """Delete an Ikigai profile JSON file"""
+def _write_bytes_atomic(path: Path, payload: bytes, durable: bool = True) -> None:
+    """
+    Replace path with payload so readers see either the old or the new file.
+
+    The bytes go to a hidden temp file in the same directory, which is
+    renamed over the target with os.replace. With durable set, the file is
+    fsynced before the rename and the directory after it, so a crash at
+    any point leaves a complete file behind, never a truncated one.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        profiles_dir = get_ikigai_profiles_dir()
-        
-        for filepath in profiles_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    if profile.get('id') == profile_id:
-                        filepath.unlink()
-                        logger.info(f"WhyDetector: Deleted Ikigai profile {filepath}")
-                        return {'success': True, 'deleted': str(filepath)}
-            except:
-                continue
-        
-        return {'success': False, 'error': 'Profile not found'}
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: Error deleting Ikigai profile: {e}")
-        return {'success': False, 'error': str(e)}
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_dir(path.parent)
 
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write compact JSON atomically (no fsync; used for rebuildable caches)"""
+    _write_bytes_atomic(path, _dumps_json(data), durable=False)
 
-# API endpoint handlers (called via BrainDrive plugin API)
-def handle_profile_api(action: str, profile_type: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+
+# Records appended to a manifest before it is compacted back to one line per
+# profile: whichever is larger of this and the number of profiles
+PROFILE_MANIFEST_COMPACT_MIN_RECORDS = 1000
+
+# Source of ProfileManifest.generation values, unique across instances
+_manifest_generations = itertools.count(1)
+
+
+class ProfileManifest:
     """
-    Handle profile API requests.
-    
-    Args:
-        action: 'save', 'load', 'delete'
-        profile_type: 'why' or 'ikigai'
-        data: Profile data for save, or {'id': ...} for delete
-    
-    Returns:
-        Response dict with success status and data/error
+    Persistent id -> (file, summary header) map for one user's profiles of a kind.
+
+    The manifest lives next to the scope directory (``users/<scope>.manifest``)
+    as an append-only log: a header line, then one ``[id, entry]`` record per
+    save and ``[id, null]`` per delete. Saves and deletes append their records
+    instead of rewriting the file, and the log is compacted to one record per
+    profile once it has grown to twice that.
+
+    The log doubles as the scope's generation marker: every use costs one
+    stat of it, and records appended by another process are picked up by
+    reading only the new tail. Appends are fsynced like the profile files
+    they describe. A missing or unreadable manifest, or one ending in a
+    torn record, is rebuilt from the ProfileIndex on next use. An entry
+    whose file was removed outside the store is dropped as soon as a get
+    or delete of that id finds the file missing; files copied in by hand
+    are not detected, call ``rebuild`` after such changes.
+
+    The summary header kept per id is what the ``list`` action serves, so
+    paging through profiles never parses a full profile body.
     """
-    try:
-        if profile_type == 'why':
-            if action == 'save':
-                return save_why_profile(data)
-            elif action == 'load':
-                profiles = load_why_profiles()
-                return {'success': True, 'profiles': profiles}
-            elif action == 'delete':
-                return delete_why_profile(data.get('id'))
-        elif profile_type == 'ikigai':
-            if action == 'save':
-                return save_ikigai_profile(data)
-            elif action == 'load':
-                profiles = load_ikigai_profiles()
-                return {'success': True, 'profiles': profiles}
-            elif action == 'delete':
-                return delete_ikigai_profile(data.get('id'))
-        
-        return {'success': False, 'error': f'Invalid action or profile type: {action}/{profile_type}'}
-        
-    except Exception as e:
-        logger.error(f"WhyDetector: API error: {e}")
-        return {'success': False, 'error': str(e)}
 
+    VERSION = 1
 
-# Test script
-if __name__ == "__main__":
-    import asyncio
+    def __init__(self, profiles_dir: Path, kind: ProfileKind):
+        self.profiles_dir = profiles_dir
+        self.kind = kind
+        self.path = profiles_dir.parent / f"{profiles_dir.name}.manifest"
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._order: Optional[List[Tuple[str, str]]] = None
+        # (inode, bytes applied) of the log the entries were read from
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._records = 0
+        # Changes whenever entries are taken from disk rather than from this
+        # instance's own appends, i.e. another writer touched the scope
+        self.generation = next(_manifest_generations)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _sort_key(profile_id: str, entry: Dict[str, Any]) -> Tuple[str, str]:
+        return str(entry['summary'].get('createdAt') or ''), profile_id
+
+    def _apply(self, profile_id: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Apply one record to the in-memory entries, keeping the sorted order in step"""
+        previous = self._entries.pop(profile_id, None)
+        if self._order is not None and previous is not None:
+            position = bisect.bisect_left(self._order, self._sort_key(profile_id, previous))
+            del self._order[position]
+        if entry is not None:
+            self._entries[profile_id] = entry
+            if self._order is not None:
+                bisect.insort(self._order, self._sort_key(profile_id, entry))
+
+    def _apply_lines(self, raw: bytes) -> int:
+        """Apply the complete records in raw; returns how many bytes were consumed"""
+        end = raw.rfind(b'\n') + 1
+        for line in raw[:end].splitlines():
+            profile_id, entry = _loads_json(line)
+            self._apply(profile_id, entry)
+            self._records += 1
+        return end
+
+    def _load(self) -> bool:
+        """Read the whole log into memory; False if it is missing, outdated or unreadable"""
+        try:
+            with open(self.path, 'rb') as f:
+                inode = os.fstat(f.fileno()).st_ino
+                raw = f.read()
+        except OSError:
+            return False
+        header_end = raw.find(b'\n') + 1
+        try:
+            header = _loads_json(raw[:header_end]) if header_end else None
+            if not isinstance(header, dict) or header.get('version') != self.VERSION:
+                return False
+            self._entries, self._order, self._records = {}, None, 0
+            self._offset = header_end + self._apply_lines(raw[header_end:])
+        except (ValueError, TypeError):
+            self._entries = None
+            return False
+        self._inode = inode
+        return True
+
+    def _ensure(self) -> Dict[str, Dict[str, Any]]:
+        """Return the entries, catching up on appended records or rebuilding if the log is unusable"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+        if self._entries is not None and st is not None and st.st_ino == self._inode:
+            if st.st_size == self._offset:
+                return self._entries
+            if st.st_size > self._offset:
+                try:
+                    with open(self.path, 'rb') as f:
+                        f.seek(self._offset)
+                        consumed = self._apply_lines(f.read())
+                    if consumed:
+                        self._offset += consumed
+                        self.generation = next(_manifest_generations)
+                    return self._entries
+                except (OSError, ValueError, TypeError):
+                    pass
+        if st is not None and self._load():
+            self.generation = next(_manifest_generations)
+            return self._entries
+        return self.rebuild()
+
+    def _encode_log(self, entries: Dict[str, Dict[str, Any]]) -> bytes:
+        return b''.join([_dumps_json({'version': self.VERSION}) + b'\n'] +
+                        [_dumps_json([profile_id, entry]) + b'\n' for profile_id, entry in entries.items()])
+
+    def _compact(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the log with one record per profile"""
+        _write_bytes_atomic(self.path, self._encode_log(entries), durable=False)
+        self._load()
+
+    def rebuild(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the manifest from the profiles currently on disk"""
+        with self._lock:
+            index = get_profile_index(self.profiles_dir)
+            entries: Dict[str, Dict[str, Any]] = {}
+            # Newest first, so the newest file wins if an id is duplicated
+            for profile in index.refresh():
+                profile_id = profile.get('id')
+                if isinstance(profile_id, str) and profile_id not in entries:
+                    entries[profile_id] = {
+                        'file': profile['_filename'],
+                        'summary': self.kind.summarize(profile)
+                    }
+            self._compact(entries)
+            if self._entries is None:
+                # The log could not be read back (e.g. a read-only directory)
+                self._entries, self._order, self._inode = entries, None, None
+            self.generation = next(_manifest_generations)
+            logger.info(f"WhyDetector: Rebuilt profile manifest {self.path} ({len(entries)} entries)")
+            return self._entries
+
+    def current_generation(self) -> int:
+        """Catch up with the log and return the generation"""
+        with self._lock:
+            self._ensure()
+            return self.generation
+
+    def lookup(self, profile_id: str) -> Optional[str]:
+        """Return the file recorded for profile_id, if any"""
+        with self._lock:
+            entry = self._ensure().get(profile_id)
+            return entry['file'] if entry else None
+
+    def page(self, limit: int, after: Optional[Tuple[str, str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Return up to limit summaries ordered by (createdAt, id), newest first.
+
+        ``after`` is the sort key of the last summary on the previous page; the
+        returned key is the one to pass for the next page (None at the end).
+        """
+        with self._lock:
+            entries = self._ensure()
+            order = self._sorted_order(entries)
+
+            end = bisect.bisect_left(order, after) if after is not None else len(order)
+            start = max(0, end - limit)
+            summaries = [dict(entries[profile_id]['summary']) for _, profile_id in reversed(order[start:end])]
+            return summaries, (order[start] if start > 0 else None)
+
+    def _sorted_order(self, entries: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str]]:
+        if self._order is None:
+            self._order = sorted(self._sort_key(profile_id, entry) for profile_id, entry in entries.items())
+        return self._order
+
+    def files(self) -> List[Tuple[str, str]]:
+        """(profile_id, file) for every recorded profile, newest first by (createdAt, id)"""
+        with self._lock:
+            entries = self._ensure()
+            return [(profile_id, entries[profile_id]['file']) for _, profile_id in reversed(self._sorted_order(entries))]
+
+    def _append(self, records: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """Append records to the log and apply them; compacts the log once it has grown enough"""
+        with self._lock:
+            self._ensure()
+            payload = b''.join(_dumps_json([profile_id, entry]) + b'\n' for profile_id, entry in records)
+            for _ in range(5):
+                with open(self.path, 'ab') as f:
+                    if fcntl is not None:
+                        # Serializes appends and compaction across processes
+                        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                    # Catch up on anything appended since the first _ensure, so
+                    # the offset stays at the end of what has been applied; if
+                    # the log was replaced (compacted or rebuilt) meanwhile,
+                    # this handle points at the old file and we go again
+                    self._ensure()
+                    st = os.fstat(f.fileno())
+                    if self._inode != st.st_ino:
+                        continue
+                    if self._offset != st.st_size:
+                        # A torn record at the end (a crash mid-append); records
+                        # written after it would be unreadable, so start over
+                        # from the files on disk
+                        self.rebuild()
+                        continue
+                    f.write(payload)
+                    f.flush()
+                    # The profile files are fsynced, and list is served from
+                    # here, so the record has to be as durable as the file
+                    os.fsync(f.fileno())
+                    for profile_id, entry in records:
+                        self._apply(profile_id, entry)
+                    self._offset += len(payload)
+                    self._records += len(records)
+                    if self._records > max(PROFILE_MANIFEST_COMPACT_MIN_RECORDS, 2 * len(self._entries)):
+                        self._compact(self._entries)
+                    return
+            raise OSError(f"Profile manifest {self.path} kept being replaced while appending")
+
+    def record_many(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> List[str]:
+        """Point each (profile_id, filename, summary) in one append; returns the files they replaced"""
+        with self._lock:
+            entries = self._ensure()
+            replaced = []
+            for profile_id, filename, _ in items:
+                previous = (entries.get(profile_id) or {}).get('file')
+                if not previous or previous == filename:
+                    continue
+                # The profile moved; drop the old file so one id maps to one file
+                try:
+                    (self.profiles_dir / previous).unlink()
+                except FileNotFoundError:
+                    pass
+                replaced.append(previous)
+            self._append([(profile_id, {'file': filename, 'summary': summary}) for profile_id, filename, summary in items])
+            return replaced
+
+    def record(self, profile_id: str, filename: str, summary: Dict[str, Any]) -> Optional[str]:
+        """Point profile_id at filename; returns the file it replaced, if different"""
+        replaced = self.record_many([(profile_id, filename, summary)])
+        return replaced[0] if replaced else None
+
+    def discard(self, profile_id: str) -> None:
+        """Forget profile_id after its file has been removed"""
+        self._append([(profile_id, None)])
+
+    def discard_stale(self, profile_id: str) -> bool:
+        """Forget profile_id if its recorded file no longer exists; True if an entry was dropped"""
+        with self._lock:
+            entry = self._ensure().get(profile_id)
+            if entry is None or (self.profiles_dir / entry['file']).exists():
+                return False
+            logger.warning(f"WhyDetector: Dropping manifest entry {profile_id}, {entry['file']} is gone")
+            self._append([(profile_id, None)])
+            return True
+
+
+_profile_manifests = ScopeCache(PROFILE_CACHE_MAX_SCOPES)
+
+def get_profile_manifest(kind: ProfileKind, user_id: Optional[str] = None) -> ProfileManifest:
+    """Get the process-wide ProfileManifest for one user's profiles of a kind"""
+    profiles_dir = get_profile_scope_dir(kind, user_id)
+    return _profile_manifests.get(str(profiles_dir), lambda: ProfileManifest(profiles_dir, kind))
+
+
+# === PROFILE ENCODING ===
+# Profile files keep their .json name whatever the encoding; the reader
+# sniffs gzip/zlib magic bytes, so files written under any setting
+# (including the old indented JSON) stay readable after a switch.
+
+PROFILE_ENCODINGS = ('json', 'json-indent', 'zlib', 'gzip')
+PROFILE_COMPRESS_LEVEL = int(os.environ.get('WHYDETECTOR_PROFILE_COMPRESS_LEVEL', '6'))
+
+_profile_encoding: Optional[str] = None
+
+def _dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, through orjson when it is installed"""
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(data, default=str, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. ints wider than 64 bits; the stdlib handles them
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+def _loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity, BOMs and other input only the stdlib accepts
+    return json.loads(raw)
+
+def get_profile_encoding() -> str:
+    """Encoding used for new profile files (WHYDETECTOR_PROFILE_ENCODING, default compact json)"""
+    global _profile_encoding
+    if _profile_encoding is None:
+        name = os.environ.get('WHYDETECTOR_PROFILE_ENCODING', 'json').lower()
+        if name not in PROFILE_ENCODINGS:
+            logger.warning(f"WhyDetector: Unknown profile encoding '{name}', using json")
+            name = 'json'
+        _profile_encoding = name
+    return _profile_encoding
+
+def set_profile_encoding(name: str) -> str:
+    """Switch the encoding used for new profile files; existing files are left as they are"""
+    global _profile_encoding
+    if name not in PROFILE_ENCODINGS:
+        raise ValueError(f"Unknown profile encoding: {name}")
+    _profile_encoding = name
+    return name
+
+def encode_profile_payload(profile_data: Dict[str, Any], encoding: str = None) -> bytes:
+    """Encode a profile for disk in the given (or active) encoding"""
+    encoding = encoding or get_profile_encoding()
+    if encoding == 'json-indent':
+        return _dumps_json(profile_data, indent=True)
+    payload = _dumps_json(profile_data)
+    if encoding == 'zlib':
+        return zlib.compress(payload, PROFILE_COMPRESS_LEVEL)
+    if encoding == 'gzip':
+        # mtime=0 keeps the bytes deterministic for identical profiles
+        return gzip.compress(payload, PROFILE_COMPRESS_LEVEL, mtime=0)
+    return payload
+
+def decode_profile_payload(raw: bytes) -> Any:
+    """Decode profile file contents written in any supported encoding"""
+    if raw[:2] == b'\x1f\x8b':
+        raw = gzip.decompress(raw)
+    elif raw[:1] == b'\x78':
+        # zlib header; a JSON document can never start with 'x'
+        raw = zlib.decompress(raw)
+    return _loads_json(raw)
+
+
+def _read_profile_file(filepath: Path, filename: str = None) -> Dict[str, Any]:
+    """Read and parse one profile file"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    METRICS.add_bytes('profile_store', bytes_read=len(raw))
+    profile = decode_profile_payload(raw)
+    if not isinstance(profile, dict):
+        raise ValueError("Profile file does not contain a JSON object")
+    profile['_filename'] = filename or filepath.name
+    return profile
+
+
+_legacy_migrated: Set[str] = set()
+_legacy_migration_lock = threading.Lock()
+
+def _migrate_legacy_profiles(kind: ProfileKind, scope_dir: Path) -> None:
+    """
+    Move profiles from the old flat layout (why_profiles/*.json) into the
+    default scope's fan-out tree. Runs once per scope directory per process
+    and only costs a listing of the top-level directory once everything is
+    moved.
+    """
+    migration_key = str(scope_dir)
+    if migration_key in _legacy_migrated:
+        return
+
+    with _legacy_migration_lock:
+        if migration_key in _legacy_migrated:
+            return
+
+        root = kind.get_dir()
+        moved = 0
+        with os.scandir(root) as it:
+            legacy_files = [Path(entry.path) for entry in it if entry.name.endswith('.json') and entry.is_file()]
+
+        for filepath in legacy_files:
+            try:
+                profile = _read_profile_file(filepath)
+                profile_id = profile.get('id')
+                relpath = profile_relpath(profile_id if isinstance(profile_id, str) else filepath.stem)
+                target = scope_dir / relpath
+                if target.exists():
+                    logger.warning(f"WhyDetector: Not migrating {filepath}, {target} already exists")
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(filepath, target)
+                moved += 1
+            except Exception as e:
+                logger.warning(f"WhyDetector: Could not migrate legacy profile {filepath}: {e}")
+
+        if moved:
+            logger.info(f"WhyDetector: Migrated {moved} legacy {kind.label} profiles into {scope_dir}")
+        _legacy_migrated.add(migration_key)
+
+
+def _resolve_profile(kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Optional[Tuple[Path, Dict[str, Any]]]:
+    """
+    Resolve a profile id to its file and parsed contents.
+
+    The file location is derived from the id itself, so exactly one file
+    is opened, and only to confirm it really holds that id.
+    """
+    if not profile_id or not isinstance(profile_id, str):
+        return None
+
+    relpath = profile_relpath(profile_id)
+    scope_dir = get_profile_scope_dir(kind, user_id)
+    filepath = scope_dir / relpath
+    try:
+        profile = _read_profile_file(filepath, relpath)
+    except FileNotFoundError:
+        # Removed outside the store: drop its entry, or list would keep it forever
+        get_profile_manifest(kind, user_id).discard_stale(profile_id)
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"WhyDetector: Profile file {filepath} is unreadable: {e}")
+        return None
+    if profile.get('id') != profile_id:
+        return None
+    return filepath, profile
+
+def resolve_profile_file(kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Optional[Path]:
+    """Resolve a profile id to the file that holds it"""
+    resolved = _resolve_profile(kind, profile_id, user_id)
+    return resolved[0] if resolved else None
+
+
+def _get_profile(kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Read the single profile with profile_id"""
+    resolved = _resolve_profile(kind, profile_id, user_id)
+    if resolved is None:
+        return {'success': False, 'error': 'Profile not found', 'not_found': True}
+    return {'success': True, 'profile': resolved[1]}
+
+
+def _encode_cursor(key: Tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, profile_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(created_at, str) or not isinstance(profile_id, str):
+        raise ValueError('Invalid cursor')
+    return created_at, profile_id
+
+
+DEFAULT_LIST_LIMIT = 20
+MAX_LIST_LIMIT = 100
+
+
+def _prepare_profile(kind: ProfileKind, profile_data: Dict[str, Any], keep_saved_at: bool = False) -> Tuple[str, str]:
+    """Fill in save metadata and return (profile_id, filename) for a profile"""
+    # Files are named by id, so generated ids carry a random suffix to keep
+    # two saves in the same second apart
+    profile_id = profile_data.get('id') or \
+        f"{kind.id_prefix}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    profile_data['id'] = profile_id
+    
+    # Files are named by id in a hashed fan-out (see profile_relpath)
+    filename = profile_relpath(profile_id)
+    
+    # Add metadata
+    profile_data['_filename'] = filename
+    if not (keep_saved_at and profile_data.get('_savedAt')):
+        profile_data['_savedAt'] = datetime.datetime.now().isoformat()
+    return profile_id, filename
+
+
+class PendingProfileWrite(NamedTuple):
+    """A fully encoded profile waiting to be written to disk"""
+    kind: ProfileKind
+    user_id: Optional[str]
+    profile_id: str
+    filename: str
+    payload: bytes
+    summary: Dict[str, Any]
+
+
+def _stage_profile_write(kind: ProfileKind, profile_data: Dict[str, Any], user_id: Optional[str] = None,
+                         keep_saved_at: bool = False) -> PendingProfileWrite:
+    """Fill in save metadata and encode the profile, without touching disk"""
+    profile_id, filename = _prepare_profile(kind, profile_data, keep_saved_at)
+    return PendingProfileWrite(kind, user_id, profile_id, filename,
+                               encode_profile_payload(profile_data), kind.summarize(profile_data))
+
+def _write_profile_files(writes: List[PendingProfileWrite]) -> List[Path]:
+    """Atomically write staged profiles of one kind and scope, recorded in a single manifest update"""
+    manifest = get_profile_manifest(writes[0].kind, writes[0].user_id)
+    profiles_dir = manifest.profiles_dir
+    
+    filepaths = []
+    for write in writes:
+        filepath = profiles_dir / write.filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        _write_bytes_atomic(filepath, write.payload)
+        filepaths.append(filepath)
+    METRICS.add_bytes('profile_store', bytes_written=sum(len(write.payload) for write in writes))
+    
+    index = get_profile_index(profiles_dir)
+    for write in writes:
+        index.invalidate(write.filename)
+    for previous in manifest.record_many([(w.profile_id, w.filename, w.summary) for w in writes]):
+        index.invalidate(previous)
+    
+    if len(writes) == 1:
+        logger.info(f"WhyDetector: Saved {writes[0].kind.label} profile to {filepaths[0]}")
+    else:
+        logger.info(f"WhyDetector: Saved {len(writes)} {writes[0].kind.label} profiles to {profiles_dir}")
+    return filepaths
+
+def _write_profile_file(write: PendingProfileWrite) -> Path:
+    """Atomically write one staged profile and record it in the manifest"""
+    return _write_profile_files([write])[0]
+
+def _save_profile_file(kind: ProfileKind, profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Write one profile into the user's fan-out tree and record it in the manifest"""
+    write = _stage_profile_write(kind, profile_data, user_id)
+    filepath = _write_profile_file(write)
+    return {'success': True, 'filename': write.filename, 'path': str(filepath)}
+
+
+# Write-behind is opt-in: with the default of 0 a save is on disk before it
+# returns. A positive window trades that for coalescing bursts of saves
+PROFILE_WRITE_COALESCE_SECONDS = max(0.0, float(os.environ.get('WHYDETECTOR_PROFILE_WRITE_COALESCE_MS', '0')) / 1000)
+
+
+class ProfileWriteQueue:
+    """
+    Write-behind queue that coalesces rapid saves of the same profile.
+
+    A save is encoded immediately and parked under (kind, scope, id) for
+    ``window`` seconds; another save of the same id inside the window
+    replaces the parked payload, so a burst of saves costs one disk write.
+    A background thread writes entries as their window expires.
+
+    Reads must call ``flush(kind, user_id)`` for the scope they are about
+    to read; writes happen under one lock, so once flush returns no write
+    for that scope is still parked or in flight. A parked write that fails
+    is remembered by key until ``take_error`` hands it to the next call
+    for that profile.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._pending: Dict[Tuple[str, str, str], Tuple[float, PendingProfileWrite]] = {}
+        self._errors: Dict[Tuple[str, str, str], str] = {}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(kind: ProfileKind, user_id: Optional[str], profile_id: str) -> Tuple[str, str, str]:
+        return kind.key, profile_scope_key(user_id), profile_id
+
+    def submit(self, write: PendingProfileWrite) -> None:
+        key = self._key(write.kind, write.user_id, write.profile_id)
+        with self._cond:
+            previous = self._pending.get(key)
+            due = previous[0] if previous else time.monotonic() + self.window
+            self._pending[key] = (due, write)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='whydetector-profile-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _take(self, match: Callable[[Tuple[str, str, str], float], bool]) -> List[PendingProfileWrite]:
+        with self._cond:
+            keys = [key for key, (due, _) in self._pending.items() if match(key, due)]
+            return [self._pending.pop(key)[1] for key in keys]
+
+    def _write_all(self, writes: List[PendingProfileWrite]) -> Dict[str, Any]:
+        report: Dict[str, Any] = {'written': 0, 'errors': []}
+        for write in writes:
+            try:
+                _write_profile_file(write)
+                report['written'] += 1
+            except Exception as e:
+                logger.error(f"WhyDetector: Error writing {write.kind.label} profile {write.profile_id}: {e}")
+                report['errors'].append({'id': write.profile_id, 'error': str(e)})
+                with self._cond:
+                    self._errors[self._key(write.kind, write.user_id, write.profile_id)] = str(e)
+        return report
+
+    def take_error(self, kind: ProfileKind, user_id: Optional[str], profile_id: Any) -> Optional[str]:
+        """Pop the error of a failed deferred write of this profile, if there was one"""
+        if not self._errors or not isinstance(profile_id, str):
+            return None
+        with self._cond:
+            return self._errors.pop(self._key(kind, user_id, profile_id), None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    if not self._cond.wait(timeout=30):
+                        if not self._pending:
+                            self._thread = None
+                            return
+                next_due = min(due for due, _ in self._pending.values())
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+            with self._write_lock:
+                now = time.monotonic()
+                self._write_all(self._take(lambda key, due: due <= now))
+
+    def flush(self, kind: ProfileKind = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Write parked saves now: everything, or only one kind/scope"""
+        scope = profile_scope_key(user_id)
+        with self._write_lock:
+            if kind is None:
+                writes = self._take(lambda key, due: True)
+            else:
+                writes = self._take(lambda key, due: key[0] == kind.key and key[1] == scope)
+            return self._write_all(writes)
+
+
+_profile_write_queue = ProfileWriteQueue(PROFILE_WRITE_COALESCE_SECONDS)
+
+def flush_profile_writes() -> Dict[str, Any]:
+    """Write every parked profile save to disk; call on shutdown"""
+    report = _profile_write_queue.flush()
+    if report['written'] or report['errors']:
+        logger.info(f"WhyDetector: Flushed {report['written']} pending profile writes")
+    return report
+
+atexit.register(flush_profile_writes)
+
+
+def _delete_profile_file(kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Delete the one file holding profile_id"""
+    filepath = resolve_profile_file(kind, profile_id, user_id)
+    if filepath is None:
+        return {'success': False, 'error': 'Profile not found', 'not_found': True}
+
+    manifest = get_profile_manifest(kind, user_id)
+    filepath.unlink()
+    get_profile_index(manifest.profiles_dir).invalidate(filepath.relative_to(manifest.profiles_dir).as_posix())
+    manifest.discard(profile_id)
+
+    logger.info(f"WhyDetector: Deleted {kind.label} profile {filepath}")
+    return {'success': True, 'deleted': str(filepath)}
+
+
+# ---------------------------------------------------------------------------
+# Storage backends
+# ---------------------------------------------------------------------------
+
+class ProfileStorageBackend(ABC):
+    """
+    Interface every profile storage engine implements.
+
+    Every call is scoped to one user; user_id None addresses the default
+    scope that predates per-user storage.
+    """
+
+    name: str = ''
+
+    @abstractmethod
+    def save(self, kind: ProfileKind, profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Insert or replace one profile"""
+
+    @abstractmethod
+    def load(self, kind: ProfileKind, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return every profile of a kind, newest first"""
+
+    def load_with_errors(self, kind: ProfileKind, user_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Like load, but also return the records that could not be read"""
+        return self.load(kind, user_id), []
+
+    @abstractmethod
+    def get(self, kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return one profile by id"""
+
+    @abstractmethod
+    def delete(self, kind: ProfileKind, profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Delete one profile by id"""
+
+    @abstractmethod
+    def list_summaries(self, kind: ProfileKind, limit: int, after: Optional[Tuple[str, str]],
+                       user_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Return a page of summaries ordered by (createdAt, id) desc, plus the next page key"""
+
+    def iter_profiles(self, kind: ProfileKind, user_id: Optional[str] = None,
+                      errors: Optional[List[Dict[str, str]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every profile of a kind newest first, without loading them all at once.
+
+        Records that cannot be read are skipped and, if ``errors`` is given,
+        appended to it as {'file', 'error'}.
+        """
+        return iter(self.load(kind, user_id))
+
+    def get_many(self, kind: ProfileKind, profile_ids: List[str], user_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Return the stored profiles among profile_ids, keyed by id"""
+        found = {}
+        for profile_id in profile_ids:
+            result = self.get(kind, profile_id, user_id)
+            if result.get('success'):
+                found[profile_id] = result['profile']
+        return found
+
+    def list_ids(self, kind: ProfileKind, user_id: Optional[str] = None) -> Set[str]:
+        """Ids of every stored profile of a kind"""
+        return {profile.get('id') for profile in self.iter_profiles(kind, user_id)}
+
+    def generation(self, kind: ProfileKind, user_id: Optional[str] = None) -> Any:
+        """
+        Token that changes when the stored profiles of a kind are changed by
+        another writer (process or backend instance). Caches built from the
+        backend compare it before each use; changes made through this
+        instance may leave it as it is.
+        """
+        return frozenset(self.list_ids(kind, user_id))
+
+    def search_index_path(self, kind: ProfileKind, user_id: Optional[str] = None) -> Path:
+        """File the search index over one user's profiles of a kind is persisted to"""
+        scope_dir = get_profile_scope_dir(kind, user_id)
+        return scope_dir.parent / f"{scope_dir.name}.{self.name}.search"
+
+    def save_many(self, kind: ProfileKind, profiles: List[Dict[str, Any]], user_id: Optional[str] = None) -> int:
+        """Insert or replace profiles keeping their ids and _savedAt; returns how many were written"""
+        for profile_data in profiles:
+            self.save(kind, profile_data, user_id)
+        return len(profiles)
+
+
+class JsonFileProfileBackend(ProfileStorageBackend):
+    """One JSON file per profile under why_profiles/users/<scope>/ab/cd/"""
+
+    name = 'json'
+
+    def __init__(self, write_queue: ProfileWriteQueue = None):
+        self.write_queue = write_queue or _profile_write_queue
+
+    def save(self, kind, profile_data, user_id=None):
+        write_error = self.write_queue.take_error(kind, user_id, profile_data.get('id'))
+        if write_error is not None:
+            # The previous deferred save of this profile never reached disk;
+            # write this one through and tell the caller
+            self.write_queue.flush(kind, user_id)
+            result = _save_profile_file(kind, profile_data, user_id)
+            result['deferred_write_error'] = write_error
+            return result
+        if self.write_queue.window <= 0:
+            return _save_profile_file(kind, profile_data, user_id)
+        write = _stage_profile_write(kind, profile_data, user_id)
+        self.write_queue.submit(write)
+        filepath = get_profile_scope_dir(kind, user_id) / write.filename
+        return {'success': True, 'filename': write.filename, 'path': str(filepath), 'queued': True}
+
+    def load(self, kind, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        return get_profile_index(get_profile_scope_dir(kind, user_id)).refresh()
+
+    def load_with_errors(self, kind, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        return get_profile_index(get_profile_scope_dir(kind, user_id)).refresh_with_errors()
+
+    def get(self, kind, profile_id, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        result = _get_profile(kind, profile_id, user_id)
+        write_error = self.write_queue.take_error(kind, user_id, profile_id)
+        if write_error is not None:
+            result['deferred_write_error'] = write_error
+        return result
+
+    def delete(self, kind, profile_id, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        return _delete_profile_file(kind, profile_id, user_id)
+
+    def list_summaries(self, kind, limit, after, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        return get_profile_manifest(kind, user_id).page(limit, after)
+
+    def iter_profiles(self, kind, user_id=None, errors=None):
+        # Walks the manifest newest first and reads one profile per step:
+        # files unchanged since the ProfileIndex cached them come from the
+        # cache, anything else is read on its own when it is reached
+        self.write_queue.flush(kind, user_id)
+        manifest = get_profile_manifest(kind, user_id)
+        index = get_profile_index(manifest.profiles_dir)
+        for profile_id, filename in manifest.files():
+            profile, error = index.read(filename)
+            if profile is not None:
+                yield profile
+            elif error is not None:
+                if errors is not None:
+                    errors.append({'file': filename, 'error': error})
+            else:
+                manifest.discard_stale(profile_id)
+
+    def list_ids(self, kind, user_id=None):
+        self.write_queue.flush(kind, user_id)
+        return {profile_id for profile_id, _ in get_profile_manifest(kind, user_id).files()}
+
+    def generation(self, kind, user_id=None):
+        # Parked saves are this process's own and leave the generation alone
+        return get_profile_manifest(kind, user_id).current_generation()
+
+    def search_index_path(self, kind, user_id=None):
+        scope_dir = get_profile_scope_dir(kind, user_id)
+        return scope_dir.parent / f"{scope_dir.name}.search"
+
+    def save_many(self, kind, profiles, user_id=None):
+        if not profiles:
+            return 0
+        # A parked save of the same id must not land on top of these later
+        self.write_queue.flush(kind, user_id)
+        writes = [_stage_profile_write(kind, profile_data, user_id, keep_saved_at=True) for profile_data in profiles]
+        _write_profile_files(writes)
+        return len(writes)
+
+
+class SqliteProfileBackend(ProfileStorageBackend):
+    """
+    Embedded SQLite store (stdlib ``sqlite3``) for large profile counts.
+
+    Both profile types share one ``profiles`` table keyed by (kind, scope,
+    id), where scope is profile_scope_key(user_id). The full profile and its
+    summary header are JSON columns; createdAt and sourceWhyProfileId are
+    lifted into indexed columns so listing and lookups never scan. The
+    database runs in WAL mode so readers do not block the writer.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS profiles (
+            kind TEXT NOT NULL,
+            scope TEXT NOT NULL DEFAULT 'default',
+            id TEXT NOT NULL,
+            name TEXT,
+            created_at TEXT NOT NULL DEFAULT '',
+            source_why_profile_id TEXT,
+            saved_at TEXT,
+            summary JSON NOT NULL,
+            body JSON NOT NULL,
+            PRIMARY KEY (kind, scope, id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_profiles_scope_created ON profiles(kind, scope, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_profiles_source_why ON profiles(source_why_profile_id)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+
+    def __init__(self, db_path: Path = None, migrate: bool = True):
+        self.db_path = Path(db_path) if db_path else get_plugin_dir() / "profiles.sqlite3"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for stmt in self.SCHEMA:
+                self._conn.execute(stmt)
+        if migrate:
+            migrate_json_profiles_to_sqlite(self)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _row_values(self, kind: ProfileKind, scope: str, profile_id: str, profile_data: Dict[str, Any]) -> Tuple:
+        return (
+            kind.key,
+            scope,
+            profile_id,
+            profile_data.get('name'),
+            str(profile_data.get('createdAt') or ''),
+            profile_data.get('sourceWhyProfileId'),
+            profile_data.get('_savedAt'),
+            _dumps_json(kind.summarize(profile_data)).decode('utf-8'),
+            _dumps_json(profile_data).decode('utf-8'),
+        )
+
+    _UPSERT = """
+        INSERT OR REPLACE INTO profiles
+        (kind, scope, id, name, created_at, source_why_profile_id, saved_at, summary, body)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def save(self, kind, profile_data, user_id=None):
+        profile_id, filename = _prepare_profile(kind, profile_data)
+        row = self._row_values(kind, profile_scope_key(user_id), profile_id, profile_data)
+        with self._lock, self._conn:
+            self._conn.execute(self._UPSERT, row)
+        METRICS.add_bytes('profile_store', bytes_written=len(row[-1]))
+        logger.info(f"WhyDetector: Saved {kind.label} profile {profile_id} to {self.db_path}")
+        return {'success': True, 'filename': filename, 'path': str(self.db_path)}
+
+    def insert_many(self, kind: ProfileKind, profiles: List[Dict[str, Any]], scope: str = 'default',
+                    replace: bool = False) -> int:
+        """Insert already-saved profiles as-is; returns the number of rows written"""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        rows = [
+            self._row_values(kind, scope, profile['id'], profile)
+            for profile in profiles
+            if isinstance(profile.get('id'), str)
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(self._UPSERT.replace("INSERT OR REPLACE", verb), rows)
+            written = self._conn.total_changes - before
+        METRICS.add_bytes('profile_store', bytes_written=sum(len(row[-1]) for row in rows))
+        return written
+
+    def load(self, kind, user_id=None):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM profiles WHERE kind = ? AND scope = ? ORDER BY created_at DESC, id DESC",
+                (kind.key, profile_scope_key(user_id))
+            ).fetchall()
+        METRICS.add_bytes('profile_store', bytes_read=sum(len(body) for (body,) in rows))
+        return [_loads_json(body) for (body,) in rows]
+
+    def get(self, kind, profile_id, user_id=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM profiles WHERE kind = ? AND scope = ? AND id = ?",
+                (kind.key, profile_scope_key(user_id), profile_id)
+            ).fetchone()
+        if row is None:
+            return {'success': False, 'error': 'Profile not found', 'not_found': True}
+        METRICS.add_bytes('profile_store', bytes_read=len(row[0]))
+        return {'success': True, 'profile': _loads_json(row[0])}
+
+    def delete(self, kind, profile_id, user_id=None):
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM profiles WHERE kind = ? AND scope = ? AND id = ?",
+                (kind.key, profile_scope_key(user_id), profile_id)
+            )
+        if cursor.rowcount == 0:
+            return {'success': False, 'error': 'Profile not found', 'not_found': True}
+        logger.info(f"WhyDetector: Deleted {kind.label} profile {profile_id} from {self.db_path}")
+        return {'success': True, 'deleted': profile_id}
+
+    def list_summaries(self, kind, limit, after, user_id=None):
+        query = "SELECT created_at, id, summary FROM profiles WHERE kind = ? AND scope = ?"
+        params: List[Any] = [kind.key, profile_scope_key(user_id)]
+        if after is not None:
+            query += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params += [after[0], after[0], after[1]]
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        next_key = (rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return [_loads_json(summary) for _, _, summary in rows[:limit]], next_key
+
+    # Rows fetched per query when streaming, and ids per IN (...) lookup
+    CHUNK_SIZE = 500
+
+    def iter_profiles(self, kind, user_id=None, errors=None):
+        # Keyset over idx_profiles_scope_created, so the lock is never held
+        # while the caller consumes rows
+        scope = profile_scope_key(user_id)
+        after = None
+        while True:
+            query = "SELECT created_at, id, body FROM profiles WHERE kind = ? AND scope = ?"
+            params: List[Any] = [kind.key, scope]
+            if after is not None:
+                query += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+                params += [after[0], after[0], after[1]]
+            query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params.append(self.CHUNK_SIZE)
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+            METRICS.add_bytes('profile_store', bytes_read=sum(len(body) for _, _, body in rows))
+            for _, _, body in rows:
+                yield _loads_json(body)
+            if len(rows) < self.CHUNK_SIZE:
+                return
+            after = (rows[-1][0], rows[-1][1])
+
+    def get_many(self, kind, profile_ids, user_id=None):
+        scope = profile_scope_key(user_id)
+        found = {}
+        for start in range(0, len(profile_ids), self.CHUNK_SIZE):
+            chunk = profile_ids[start:start + self.CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, body FROM profiles WHERE kind = ? AND scope = ? AND id IN ({placeholders})",
+                    (kind.key, scope, *chunk)
+                ).fetchall()
+            METRICS.add_bytes('profile_store', bytes_read=sum(len(body) for _, body in rows))
+            found.update((profile_id, _loads_json(body)) for profile_id, body in rows)
+        return found
+
+    def list_ids(self, kind, user_id=None):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM profiles WHERE kind = ? AND scope = ?",
+                (kind.key, profile_scope_key(user_id))
+            ).fetchall()
+        return {profile_id for (profile_id,) in rows}
+
+    def generation(self, kind, user_id=None):
+        # data_version moves on commits from any other connection to the
+        # database, never on this connection's own
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def search_index_path(self, kind, user_id=None):
+        return Path(f"{self.db_path}.search") / kind.key / f"{profile_scope_key(user_id)}.search"
+
+    def save_many(self, kind, profiles, user_id=None):
+        for profile_data in profiles:
+            _prepare_profile(kind, profile_data, keep_saved_at=True)
+        written = self.insert_many(kind, profiles, profile_scope_key(user_id), replace=True)
+        logger.info(f"WhyDetector: Saved {written} {kind.label} profiles to {self.db_path}")
+        return written
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def iter_profile_scope_dirs(kind: ProfileKind):
+    """Yield (scope_key, directory) for every user scope of a kind on disk"""
+    get_profile_scope_dir(kind)  # pulls any legacy flat files into the default scope
+    users_dir = kind.get_dir() / 'users'
+    with os.scandir(users_dir) as it:
+        for entry in it:
+            if entry.is_dir() and not entry.name.startswith('.'):
+                yield entry.name, Path(entry.path)
+
+
+def migrate_json_profiles_to_sqlite(backend: SqliteProfileBackend, force: bool = False) -> Dict[str, Any]:
+    """
+    One-shot import of the JSON profile trees (every user scope) into SQLite.
+
+    Rows already in the database win over files with the same id, and the
+    JSON files are left in place. A marker in the meta table stops the
+    import from running again unless force is set.
+    """
+    if not force and backend.get_meta('json_migrated_at'):
+        return {'success': True, 'skipped': True}
+
+    flush_profile_writes()
+    report: Dict[str, Any] = {'success': True, 'migrated': {}, 'total': {}}
+    for kind in PROFILE_KINDS.values():
+        report['total'][kind.key] = 0
+        report['migrated'][kind.key] = 0
+        for scope, scope_dir in iter_profile_scope_dirs(kind):
+            profiles = get_profile_index(scope_dir).refresh()
+            report['total'][kind.key] += len(profiles)
+            report['migrated'][kind.key] += backend.insert_many(kind, profiles, scope)
+
+    backend.set_meta('json_migrated_at', datetime.datetime.now().isoformat())
+    logger.info(f"WhyDetector: Migrated JSON profiles into {backend.db_path}: {report['migrated']}")
+    return report
+
+
+PROFILE_BACKENDS: Dict[str, Callable[[], ProfileStorageBackend]] = {
+    JsonFileProfileBackend.name: JsonFileProfileBackend,
+    SqliteProfileBackend.name: SqliteProfileBackend,
+}
+
+_profile_backend: Optional[ProfileStorageBackend] = None
+_profile_backend_lock = threading.Lock()
+
+def get_profile_backend() -> ProfileStorageBackend:
+    """
+    Get the active profile storage backend.
+
+    Defaults to the JSON-file backend; set WHYDETECTOR_PROFILE_BACKEND=sqlite
+    (or call set_profile_backend) to use the embedded SQLite store.
+    """
+    global _profile_backend
+    if _profile_backend is None:
+        with _profile_backend_lock:
+            if _profile_backend is None:
+                name = os.environ.get('WHYDETECTOR_PROFILE_BACKEND', JsonFileProfileBackend.name).lower()
+                if name not in PROFILE_BACKENDS:
+                    logger.warning(f"WhyDetector: Unknown profile backend '{name}', using json")
+                    name = JsonFileProfileBackend.name
+                _profile_backend = PROFILE_BACKENDS[name]()
+                logger.info(f"WhyDetector: Using '{name}' profile storage backend")
+    return _profile_backend
+
+def set_profile_backend(backend) -> ProfileStorageBackend:
+    """Switch the active backend, given a backend instance or a registered name"""
+    global _profile_backend
+    if isinstance(backend, str):
+        if backend not in PROFILE_BACKENDS:
+            raise ValueError(f"Unknown profile backend: {backend}")
+        backend = PROFILE_BACKENDS[backend]()
+    with _profile_backend_lock:
+        _profile_backend = backend
+    return backend
+
+
+# A projection is a tree of the requested paths: {'love': {'bullets': None}}
+# where None means "the whole value". 'id' is always kept.
+FieldProjection = Dict[str, Any]
+
+@functools.lru_cache(maxsize=256)
+def _compile_fields(fields: Tuple[str, ...]) -> FieldProjection:
+    tree: FieldProjection = {'id': None}
+    for path in fields:
+        parts = path.strip().split('.')
+        if not all(parts):
+            raise ValueError(f"Invalid field path: {path!r}")
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break  # a parent path is already selected whole
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+def compile_field_projection(fields: Any) -> Optional[FieldProjection]:
+    """
+    Parse a ``fields`` option (list of dotted paths, or a comma-separated
+    string) into a projection; None or empty means no projection
+    """
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    if not isinstance(fields, (list, tuple)) or not all(isinstance(path, str) for path in fields):
+        raise ValueError("fields must be a list of dotted paths")
+    return _compile_fields(tuple(path for path in fields if path.strip()))
+
+def project_profile(value: Any, projection: Optional[FieldProjection]) -> Any:
+    """Copy only the projected paths out of a profile (lists of objects are projected item by item)"""
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [project_profile(item, projection) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: project_profile(value[key], sub)
+        for key, sub in projection.items()
+        if key in value
+    }
+
+
+def list_profile_summaries(kind: ProfileKind, limit: int = DEFAULT_LIST_LIMIT, cursor: str = None,
+                           user_id: Optional[str] = None, fields: Any = None) -> Dict[str, Any]:
+    """Return one page of profile summaries, newest first, without reading profile bodies"""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return {'success': False, 'error': f'Invalid limit: {limit}'}
+    limit = max(1, min(limit, MAX_LIST_LIMIT))
+
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+
+    projection = compile_field_projection(fields)
+    summaries, next_key = get_profile_backend().list_summaries(kind, limit, after, user_id)
+    return {
+        'success': True,
+        'profiles': project_profile(summaries, projection),
+        'next_cursor': _encode_cursor(next_key) if next_key else None
+    }
+
+def load_profiles_response(kind: ProfileKind, user_id: Optional[str] = None, fields: Any = None) -> Dict[str, Any]:
+    """Load every profile of a kind as an API response, including per-file read errors"""
+    projection = compile_field_projection(fields)
+    if projection is None:
+        profiles, errors = get_profile_backend().load_with_errors(kind, user_id)
+    else:
+        # Stream and trim one profile at a time so full bodies are never held together
+        errors = []
+        profiles = [project_profile(profile_data, projection)
+                    for profile_data in iter_profiles_sorted(kind, user_id, errors)]
+    logger.info(f"WhyDetector: Loaded {len(profiles)} {kind.label} profiles ({len(errors)} unreadable)")
+    return {'success': True, 'profiles': profiles, 'errors': errors}
+
+PROFILE_STREAM_CHUNK_SIZE = 50
+
+def iter_profiles_sorted(kind: ProfileKind, user_id: Optional[str] = None,
+                         errors: Optional[List[Dict[str, str]]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield profiles newest first, reading each one only when it is reached"""
+    return get_profile_backend().iter_profiles(kind, user_id, errors)
+
+def iter_load_response_chunks(kind: ProfileKind, user_id: Optional[str] = None,
+                              chunk_size: int = PROFILE_STREAM_CHUNK_SIZE, fields: Any = None) -> Iterator[str]:
+    """
+    Yield the 'load' response as JSON text, chunk_size profiles per chunk.
+
+    Joined together the chunks are the same document load_profiles_response
+    produces ({"success", "profiles", "errors"}), so a client can parse the
+    streamed body unchanged. The first chunk goes out before the second
+    batch of profiles has been read.
+    """
+    chunk_size = max(1, int(chunk_size))
+    projection = compile_field_projection(fields)
+    errors: List[Dict[str, str]] = []
+    count = 0
+    buffer: List[str] = []
+    yield '{"success":true,"profiles":['
+    for profile_data in iter_profiles_sorted(kind, user_id, errors):
+        buffer.append(_dumps_json(project_profile(profile_data, projection)).decode('utf-8'))
+        count += 1
+        if len(buffer) >= chunk_size:
+            yield (',' if count > len(buffer) else '') + ','.join(buffer)
+            buffer = []
+    if buffer:
+        yield (',' if count > len(buffer) else '') + ','.join(buffer)
+    yield '],"errors":' + _dumps_json(errors).decode('utf-8') + '}'
+    logger.info(f"WhyDetector: Streamed {count} {kind.label} profiles ({len(errors)} unreadable)")
+
+def _get_profile_action(get: Callable[[str, Optional[str]], Dict[str, Any]], data: Dict[str, Any],
+                        user_id: Optional[str]) -> Dict[str, Any]:
+    projection = compile_field_projection(data.get('fields'))
+    result = get(data.get('id'), user_id)
+    if projection is not None and result.get('success'):
+        result['profile'] = project_profile(result['profile'], projection)
+    return result
+
+def _load_profiles_action(kind: ProfileKind, data: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    if not data.get('stream'):
+        return load_profiles_response(kind, user_id, data.get('fields'))
+    compile_field_projection(data.get('fields'))  # reject bad fields before streaming starts
+    chunks = iter_load_response_chunks(kind, user_id, data.get('chunk_size', PROFILE_STREAM_CHUNK_SIZE),
+                                       data.get('fields'))
+    return {'success': True, 'content_type': 'application/json', 'stream': chunks}
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+
+_SEARCH_TOKEN_RE = re.compile(r"[^\W_]+")
+SEARCH_PERSIST_DELAY_SECONDS = max(0.0, float(os.environ.get('WHYDETECTOR_SEARCH_PERSIST_MS', '1000')) / 1000)
+
+def tokenize_search_text(value: str) -> List[str]:
+    """Lower-cased word tokens; single letters are dropped, single digits kept"""
+    return [token for token in _SEARCH_TOKEN_RE.findall(value.lower()) if len(token) > 1 or token.isdigit()]
+
+def _term_frequencies(texts: List[str]) -> Dict[str, int]:
+    freqs: Dict[str, int] = {}
+    for chunk in texts:
+        for token in tokenize_search_text(chunk):
+            freqs[token] = freqs.get(token, 0) + 1
+    return freqs
+
+
+class ProfileSearchIndex:
+    """
+    BM25-ranked inverted index over one user's profiles of a kind.
+
+    Per profile, the persisted file (the backend's ``search_index_path``,
+    e.g. ``users/<scope>.search`` next to the manifest) keeps its term
+    frequencies and list summary; postings are rebuilt from that in memory
+    on first use. Saves and deletes made in this process update the index
+    in place, so queries never read profile files; the file itself is
+    rewritten at most once per SEARCH_PERSIST_DELAY_SECONDS. Every use
+    first compares the backend's generation, and the index is rebuilt from
+    the backend when another writer changed the profiles, or when the file
+    is missing, was written for a different backend, or its ids no longer
+    match the stored profiles (e.g. files added by hand).
+    """
+
+    VERSION = 1
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, kind: ProfileKind, user_id: Optional[str], backend_name: str, path: Path):
+        self.kind = kind
+        self.user_id = user_id
+        self.backend_name = backend_name
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._docs: Optional[Dict[str, Dict[str, Any]]] = None
+        # Backend generation the in-memory docs were validated against
+        self._generation: Any = None
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self._persist_timer: Optional[threading.Timer] = None
+
+    def _add(self, profile_id: str, doc: Dict[str, Any]) -> None:
+        self._remove(profile_id)
+        self._docs[profile_id] = doc
+        length = 0
+        for term, tf in doc['terms'].items():
+            self._postings.setdefault(term, {})[profile_id] = tf
+            length += tf
+        self._lengths[profile_id] = length
+        self._total_length += length
+
+    def _remove(self, profile_id: str) -> None:
+        doc = self._docs.pop(profile_id, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(profile_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(profile_id, 0)
+
+    def _load(self, docs: Dict[str, Dict[str, Any]]) -> None:
+        self._docs, self._postings, self._lengths, self._total_length = {}, {}, {}, 0
+        for profile_id, doc in docs.items():
+            self._add(profile_id, doc)
+
+    def _doc(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {'terms': _term_frequencies(self.kind.search_text(profile_data)),
+                'summary': self.kind.summarize(profile_data)}
+
+    def _write(self) -> None:
+        _write_json_atomic(self.path, {'version': self.VERSION, 'backend': self.backend_name, 'docs': self._docs})
+
+    def _schedule_write(self) -> None:
+        if SEARCH_PERSIST_DELAY_SECONDS <= 0:
+            self._write()
+        elif self._persist_timer is None:
+            self._persist_timer = threading.Timer(SEARCH_PERSIST_DELAY_SECONDS, self.persist)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def persist(self) -> None:
+        """Write pending changes to disk now"""
+        with self._lock:
+            timer, self._persist_timer = self._persist_timer, None
+            if timer is None:
+                return
+            timer.cancel()
+            if self._docs is not None:
+                self._write()
+
+    def _read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.path, 'rb') as f:
+                data = _loads_json(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != self.VERSION or data.get('backend') != self.backend_name:
+            return None
+        return data['docs'] if isinstance(data.get('docs'), dict) else None
+
+    def _ensure(self, backend: ProfileStorageBackend) -> None:
+        generation = backend.generation(self.kind, self.user_id)
+        if self._docs is not None:
+            if generation == self._generation:
+                return
+            # Another writer changed the profiles; the persisted file may lag
+            # behind them too, so re-index from the backend
+            self.rebuild(backend)
+        else:
+            docs = self._read()
+            if docs is not None and set(docs) == backend.list_ids(self.kind, self.user_id):
+                self._load(docs)
+            else:
+                self.rebuild(backend)
+        self._generation = generation
+
+    def rebuild(self, backend: ProfileStorageBackend) -> None:
+        """Re-index every stored profile"""
+        with self._lock:
+            self._load({})
+            for profile_data in backend.iter_profiles(self.kind, self.user_id):
+                if isinstance(profile_data.get('id'), str):
+                    self._add(profile_data['id'], self._doc(profile_data))
+            self._write()
+            logger.info(f"WhyDetector: Rebuilt search index {self.path} ({len(self._docs)} profiles)")
+
+    def invalidate(self) -> None:
+        """Drop the in-memory copy; the next use re-validates it against the backend"""
+        with self._lock:
+            if self._persist_timer is not None:
+                self._persist_timer.cancel()
+                self._persist_timer = None
+            self._docs = None
+
+    def update(self, backend: ProfileStorageBackend, saved: List[Dict[str, Any]] = (),
+               deleted: List[str] = ()) -> None:
+        """Apply saved profiles and deleted ids, then persist once"""
+        with self._lock:
+            self._ensure(backend)
+            for profile_data in saved:
+                self._add(profile_data['id'], self._doc(profile_data))
+            for profile_id in deleted:
+                self._remove(profile_id)
+            self._schedule_write()
+
+    def search(self, backend: ProfileStorageBackend, query: str, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Return the top ``limit`` summaries (with 'score') for query, and the number of matches"""
+        with self._lock:
+            self._ensure(backend)
+            count = len(self._docs)
+            if not count:
+                return [], 0
+            avg_length = self._total_length / count or 1
+            scores: Dict[str, float] = {}
+            for term in set(tokenize_search_text(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for profile_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[profile_id] / avg_length)
+                    scores[profile_id] = scores.get(profile_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [dict(self._docs[profile_id]['summary'], score=round(score, 4)) for profile_id, score in top], len(scores)
+
+
+# Keyed by index file, so two backends (or two SQLite databases) never share
+# one; an evicted index is persisted first so its pending changes are not lost
+_profile_search_indexes = ScopeCache(PROFILE_CACHE_MAX_SCOPES, on_evict=lambda index: index.persist())
+
+def get_profile_search_index(kind: ProfileKind, user_id: Optional[str] = None) -> ProfileSearchIndex:
+    """Get the process-wide search index for one user's profiles of a kind under the active backend"""
+    backend = get_profile_backend()
+    path = backend.search_index_path(kind, user_id)
+    return _profile_search_indexes.get(str(path), lambda: ProfileSearchIndex(kind, user_id, backend.name, path))
+
+def flush_search_indexes() -> None:
+    """Persist every search index with pending changes; call on shutdown"""
+    for index in _profile_search_indexes.values():
+        index.persist()
+
+atexit.register(flush_search_indexes)
+
+def _update_search_index(kind: ProfileKind, user_id: Optional[str], saved: List[Dict[str, Any]] = (),
+                         deleted: List[str] = ()) -> None:
+    # A failed index update must not fail the save/delete it follows;
+    # dropping the in-memory copy makes the next query re-validate
+    index = get_profile_search_index(kind, user_id)
+    try:
+        index.update(get_profile_backend(), saved, deleted)
+    except Exception as e:
+        logger.warning(f"WhyDetector: Search index update failed for {kind.label} profiles: {e}")
+        index.invalidate()
+
+def search_profiles(query: str, profile_type: str = 'all', limit: int = DEFAULT_LIST_LIMIT,
+                    user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Rank a user's profiles against query; each result is a list summary plus 'type' and 'score'"""
+    limit = max(1, min(int(limit), MAX_LIST_LIMIT))
+    backend = get_profile_backend()
+    results: List[Dict[str, Any]] = []
+    total = 0
+    for kind in _profile_kinds_for(profile_type):
+        hits, matches = get_profile_search_index(kind, user_id).search(backend, query or '', limit)
+        results.extend(dict(hit, type=kind.key) for hit in hits)
+        total += matches
+    results = heapq.nlargest(limit, results, key=lambda hit: hit['score'])
+    return {'success': True, 'results': results, 'total': total}
+
+
+# WHY PROFILES
+def save_why_profile(profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Save a Why profile through the active storage backend"""
+    try:
+        result = get_profile_backend().save(WHY_PROFILES, profile_data, user_id)
+        _update_search_index(WHY_PROFILES, user_id, saved=[profile_data])
+        return result
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error saving Why profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+def load_why_profiles(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load all Why profiles through the active storage backend"""
+    try:
+        profiles = get_profile_backend().load(WHY_PROFILES, user_id)
+        
+        logger.info(f"WhyDetector: Loaded {len(profiles)} Why profiles")
+        return profiles
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error loading Why profiles: {e}")
+        return []
+
+def get_why_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Get a single Why profile by id"""
+    try:
+        return get_profile_backend().get(WHY_PROFILES, profile_id, user_id)
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error reading Why profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+def delete_why_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Delete a Why profile by id"""
+    try:
+        result = get_profile_backend().delete(WHY_PROFILES, profile_id, user_id)
+        if result.get('success'):
+            _update_search_index(WHY_PROFILES, user_id, deleted=[profile_id])
+        return result
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error deleting Why profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+# IKIGAI PROFILES
+def save_ikigai_profile(profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Save an Ikigai profile through the active storage backend"""
+    try:
+        result = get_profile_backend().save(IKIGAI_PROFILES, profile_data, user_id)
+        _update_search_index(IKIGAI_PROFILES, user_id, saved=[profile_data])
+        return result
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error saving Ikigai profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+def load_ikigai_profiles(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load all Ikigai profiles through the active storage backend"""
+    try:
+        profiles = get_profile_backend().load(IKIGAI_PROFILES, user_id)
+        
+        logger.info(f"WhyDetector: Loaded {len(profiles)} Ikigai profiles")
+        return profiles
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error loading Ikigai profiles: {e}")
+        return []
+
+def get_ikigai_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Get a single Ikigai profile by id"""
+    try:
+        return get_profile_backend().get(IKIGAI_PROFILES, profile_id, user_id)
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error reading Ikigai profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+def delete_ikigai_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Delete an Ikigai profile by id"""
+    try:
+        result = get_profile_backend().delete(IKIGAI_PROFILES, profile_id, user_id)
+        if result.get('success'):
+            _update_search_index(IKIGAI_PROFILES, user_id, deleted=[profile_id])
+        return result
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: Error deleting Ikigai profile: {e}")
+        return {'success': False, 'error': str(e)}
+
+
+# ---------------------------------------------------------------------------
+# NDJSON export / import
+# ---------------------------------------------------------------------------
+# One record per line: {"type": "why" | "ikigai", "profile": {...}}
+
+PROFILE_IMPORT_POLICIES = ('skip', 'overwrite', 'newest-wins')
+PROFILE_IMPORT_BATCH_SIZE = 500
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+def _profile_kinds_for(profile_type: str) -> List[ProfileKind]:
+    if profile_type in (None, 'all'):
+        return list(PROFILE_KINDS.values())
+    if profile_type not in PROFILE_KINDS:
+        raise ValueError(f"Unknown profile type: {profile_type}")
+    return [PROFILE_KINDS[profile_type]]
+
+def _profile_version(profile_data: Dict[str, Any]) -> str:
+    """Timestamp used by the newest-wins import policy"""
+    return str(profile_data.get('updatedAt') or profile_data.get('_savedAt') or profile_data.get('createdAt') or '')
+
+def iter_profiles_ndjson(profile_type: str = 'all', user_id: Optional[str] = None,
+                         counts: Dict[str, int] = None) -> Iterator[str]:
+    """
+    Yield one NDJSON line per stored profile.
+
+    Profiles are read from the backend one at a time as lines are
+    consumed, so only one profile body is held at once; the JSON backend
+    keeps just the scope's manifest ids in memory. ``counts``, if given, is
+    filled with the number of lines yielded per type.
+    """
+    backend = get_profile_backend()
+    for kind in _profile_kinds_for(profile_type):
+        if counts is not None:
+            counts.setdefault(kind.key, 0)
+        for profile_data in backend.iter_profiles(kind, user_id):
+            profile_data.pop('_filename', None)  # local layout detail, recomputed on import
+            yield _dumps_json({'type': kind.key, 'profile': profile_data}).decode('utf-8') + '\n'
+            if counts is not None:
+                counts[kind.key] += 1
+
+def export_profiles_ndjson(out: IO[str], profile_type: str = 'all', user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Write every profile of profile_type ('why', 'ikigai' or 'all') to a text stream as NDJSON"""
+    counts: Dict[str, int] = {}
+    for line in iter_profiles_ndjson(profile_type, user_id, counts):
+        out.write(line)
+    logger.info(f"WhyDetector: Exported profiles {counts}")
+    return {'success': True, 'exported': counts}
+
+def _apply_import_batch(backend: ProfileStorageBackend, kind: ProfileKind, batch: Dict[str, Dict[str, Any]],
+                        policy: str, user_id: Optional[str], report: Dict[str, Any]) -> None:
+    existing = backend.get_many(kind, list(batch), user_id)
+    accepted = []
+    for profile_id, profile_data in batch.items():
+        current = existing.get(profile_id)
+        if current is not None:
+            if policy == 'skip' or (policy == 'newest-wins' and _profile_version(profile_data) <= _profile_version(current)):
+                report['skipped'][kind.key] += 1
+                continue
+            report['replaced'][kind.key] += 1
+        accepted.append(profile_data)
+    report['imported'][kind.key] += backend.save_many(kind, accepted, user_id)
+    if accepted:
+        _update_search_index(kind, user_id, saved=accepted)
+
+def import_profiles_ndjson(lines: Iterable[Any], policy: str = 'skip', user_id: Optional[str] = None,
+                           batch_size: int = PROFILE_IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Import NDJSON profile records into the active backend.
+
+    Records are grouped per type and applied batch_size at a time: one
+    existence lookup and one bulk write per batch. ``policy`` decides what
+    happens when an id already exists: 'skip' keeps the stored profile,
+    'overwrite' replaces it, and 'newest-wins' keeps whichever has the
+    later updatedAt/_savedAt/createdAt. Duplicate ids inside the input are
+    resolved with the same policy. Bad lines are reported, not fatal.
+    """
+    if policy not in PROFILE_IMPORT_POLICIES:
+        return {'success': False, 'error': f"Unknown import policy: {policy}"}
+    batch_size = max(1, int(batch_size))
+
+    backend = get_profile_backend()
+    kinds = list(PROFILE_KINDS.values())
+    report: Dict[str, Any] = {
+        'success': True,
+        'policy': policy,
+        'read': 0,
+        'imported': {kind.key: 0 for kind in kinds},
+        'replaced': {kind.key: 0 for kind in kinds},
+        'skipped': {kind.key: 0 for kind in kinds},
+        'errors': []
+    }
+    batches: Dict[str, Dict[str, Dict[str, Any]]] = {kind.key: {} for kind in kinds}
+
+    def apply(kind: ProfileKind) -> None:
+        batch, batches[kind.key] = batches[kind.key], {}
+        if not batch:
+            return
+        try:
+            _apply_import_batch(backend, kind, batch, policy, user_id, report)
+        except Exception as e:
+            logger.error(f"WhyDetector: Error importing {len(batch)} {kind.label} profiles: {e}")
+            report['errors'].append({'type': kind.key, 'profiles': len(batch), 'error': str(e)})
+
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = _loads_json(line)
+            if not isinstance(record, dict):
+                raise ValueError("Record is not a JSON object")
+            kind = PROFILE_KINDS.get(record.get('type'))
+            if kind is None:
+                raise ValueError(f"Unknown profile type: {record.get('type')}")
+            profile_data = record.get('profile')
+            if not isinstance(profile_data, dict) or not isinstance(profile_data.get('id'), str) or not profile_data['id']:
+                raise ValueError("Record has no profile with a string id")
+        except ValueError as e:
+            report['errors'].append({'line': line_no, 'error': str(e)})
+            continue
+
+        report['read'] += 1
+        batch = batches[kind.key]
+        profile_id = profile_data['id']
+        queued = batch.get(profile_id)
+        if queued is not None and (policy == 'skip' or (policy == 'newest-wins' and _profile_version(profile_data) <= _profile_version(queued))):
+            report['skipped'][kind.key] += 1
+            continue
+        if queued is not None:
+            report['skipped'][kind.key] += 1  # the earlier duplicate is dropped
+        batch[profile_id] = profile_data
+        if len(batch) >= batch_size:
+            apply(kind)
+
+    for kind in kinds:
+        apply(kind)
+
+    logger.info(f"WhyDetector: Imported profiles {report['imported']} "
+                f"(replaced {report['replaced']}, skipped {report['skipped']}, {len(report['errors'])} errors)")
+    return report
+
+def export_profiles_to_file(path: Any, profile_type: str = 'all', user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Write an NDJSON backup to a local path; for the command line, never reachable from the API"""
+    # Stream into a temp file so a failed export never leaves a truncated backup behind
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            result = export_profiles_ndjson(f, profile_type, user_id)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    result['path'] = str(path)
+    return result
+
+# Server-side paths would let API callers read and write arbitrary files
+# (and import other users' backups), so the API only streams NDJSON out and
+# takes it inline; local files are handled by profile_cli
+PATH_NOT_ALLOWED_ERROR = "'path' is not accepted by the profile API; use the command line for files"
+
+def _export_profiles_action(profile_type: str, data: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    if 'path' in data:
+        return {'success': False, 'error': PATH_NOT_ALLOWED_ERROR}
+    _profile_kinds_for(profile_type)  # fail fast on a bad type rather than mid-stream
+    return {'success': True, 'content_type': NDJSON_CONTENT_TYPE,
+            'stream': iter_profiles_ndjson(profile_type, user_id)}
+
+def _import_profiles_action(data: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    if 'path' in data:
+        return {'success': False, 'error': PATH_NOT_ALLOWED_ERROR}
+    ndjson = data.get('ndjson')
+    if ndjson is None:
+        return {'success': False, 'error': "Import needs 'ndjson'"}
+    lines = ndjson.splitlines() if isinstance(ndjson, str) else ndjson
+    return import_profiles_ndjson(lines, data.get('policy', 'skip'), user_id,
+                                  data.get('batch_size', PROFILE_IMPORT_BATCH_SIZE))
+
+
+# API endpoint handlers (called via BrainDrive plugin API)
+
+# Metric label values; anything else is recorded as 'invalid'
+PROFILE_API_ACTIONS = ('save', 'load', 'list', 'get', 'delete', 'search', 'export', 'import')
+PROFILE_API_TYPES = ('why', 'ikigai', 'all')
+
+def handle_profile_api(action: str, profile_type: str, data: Dict[str, Any] = None,
+                       user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Handle profile API requests.
+    
+    Args:
+        action: 'save', 'load', 'list', 'get', 'delete', 'search', 'export', 'import'
+        profile_type: 'why' or 'ikigai' ('all' is also accepted by search/export/import)
+        data: Profile data for save, {'id': ...} for get/delete,
+              {'limit': ..., 'cursor': ...} for list, {'stream': True,
+              'chunk_size': ...} (optional) for load,
+              plus an optional 'fields' list of dotted paths (e.g.
+              'love.bullets') on load/get/list to return only those fields,
+              {'ndjson', 'policy', 'batch_size'} for import,
+              or {'query': ..., 'limit': ...} for search
+        user_id: Owner of the profiles; None addresses the shared default scope
+    
+    Returns:
+        Response dict with success status and data/error. A streamed load
+        and an export return a chunk iterator under 'stream' with its
+        'content_type'. Server-side file paths are rejected; profile_cli
+        handles local files.
+    """
+    started = time.perf_counter()
+    response = _dispatch_profile_api(action, profile_type, data, user_id)
+    # A streamed response is timed up to handing back its iterator
+    METRICS.observe('profile_api', time.perf_counter() - started, response.get('success') is False, labels=(
+        ('action', action if action in PROFILE_API_ACTIONS else 'invalid'),
+        ('profile_type', profile_type if profile_type in PROFILE_API_TYPES else 'invalid'),
+    ))
+    return response
+
+def _dispatch_profile_api(action: str, profile_type: str, data: Optional[Dict[str, Any]],
+                          user_id: Optional[str]) -> Dict[str, Any]:
+    try:
+        if action == 'export':
+            return _export_profiles_action(profile_type, data or {}, user_id)
+        elif action == 'import':
+            return _import_profiles_action(data or {}, user_id)
+        elif action == 'search':
+            data = data or {}
+            return search_profiles(data.get('query', ''), profile_type, data.get('limit', DEFAULT_LIST_LIMIT), user_id)
+        
+        if profile_type == 'why':
+            if action == 'save':
+                return save_why_profile(data, user_id)
+            elif action == 'load':
+                return _load_profiles_action(WHY_PROFILES, data or {}, user_id)
+            elif action == 'get':
+                return _get_profile_action(get_why_profile, data or {}, user_id)
+            elif action == 'list':
+                data = data or {}
+                return list_profile_summaries(WHY_PROFILES, data.get('limit', DEFAULT_LIST_LIMIT), data.get('cursor'), user_id,
+                                              data.get('fields'))
+            elif action == 'delete':
+                return delete_why_profile(data.get('id'), user_id)
+        elif profile_type == 'ikigai':
+            if action == 'save':
+                return save_ikigai_profile(data, user_id)
+            elif action == 'load':
+                return _load_profiles_action(IKIGAI_PROFILES, data or {}, user_id)
+            elif action == 'get':
+                return _get_profile_action(get_ikigai_profile, data or {}, user_id)
+            elif action == 'list':
+                data = data or {}
+                return list_profile_summaries(IKIGAI_PROFILES, data.get('limit', DEFAULT_LIST_LIMIT), data.get('cursor'), user_id,
+                                              data.get('fields'))
+            elif action == 'delete':
+                return delete_ikigai_profile(data.get('id'), user_id)
+        
+        return {'success': False, 'error': f'Invalid action or profile type: {action}/{profile_type}'}
+        
+    except Exception as e:
+        logger.error(f"WhyDetector: API error: {e}")
+        return {'success': False, 'error': str(e)}
+
+
+# ---------------------------------------------------------------------------
+# Async profile API
+# ---------------------------------------------------------------------------
+
+PROFILE_IO_WORKERS = max(1, int(os.environ.get('WHYDETECTOR_PROFILE_IO_WORKERS', '4')))
+PROFILE_IO_MAX_PENDING = max(1, int(os.environ.get('WHYDETECTOR_PROFILE_IO_MAX_PENDING', str(PROFILE_IO_WORKERS * 8))))
+PROFILE_IO_ADMIT_TIMEOUT = float(os.environ.get('WHYDETECTOR_PROFILE_IO_ADMIT_TIMEOUT', '30'))
+
+
+class ProfileStoreBusy(RuntimeError):
+    """Raised when the profile I/O executor stays saturated past the admit timeout"""
+
+
+_profile_io_gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_profile_io_lock = threading.Lock()
+
+def get_profile_io_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool that runs blocking profile I/O"""
+    return _get_executor('profile-io', PROFILE_IO_WORKERS)
+
+def shutdown_profile_io(wait: bool = True) -> None:
+    """Stop the profile I/O thread pool (it is recreated on next use)"""
+    _shutdown_executor('profile-io', wait)
+
+def _profile_io_gate(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    import asyncio
+    with _profile_io_lock:
+        gate = _profile_io_gates.get(loop)
+        if gate is None:
+            gate = asyncio.Semaphore(PROFILE_IO_MAX_PENDING)
+            _profile_io_gates[loop] = gate
+        return gate
+
+async def run_profile_io(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking profile-store call on the profile I/O executor.
+
+    At most PROFILE_IO_MAX_PENDING calls per event loop are admitted to the
+    executor at once; further callers wait for a slot, and give up with
+    ProfileStoreBusy after PROFILE_IO_ADMIT_TIMEOUT seconds.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    gate = _profile_io_gate(loop)
+    try:
+        await asyncio.wait_for(gate.acquire(), PROFILE_IO_ADMIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ProfileStoreBusy('Profile store is busy, retry later')
+    try:
+        return await loop.run_in_executor(get_profile_io_executor(), functools.partial(func, *args))
+    finally:
+        gate.release()
+
+
+async def async_save_why_profile(profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of save_why_profile"""
+    return await run_profile_io(save_why_profile, profile_data, user_id)
+
+async def async_load_why_profiles(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Async counterpart of load_why_profiles"""
+    return await run_profile_io(load_why_profiles, user_id)
+
+async def async_get_why_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of get_why_profile"""
+    return await run_profile_io(get_why_profile, profile_id, user_id)
+
+async def async_delete_why_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of delete_why_profile"""
+    return await run_profile_io(delete_why_profile, profile_id, user_id)
+
+async def async_save_ikigai_profile(profile_data: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of save_ikigai_profile"""
+    return await run_profile_io(save_ikigai_profile, profile_data, user_id)
+
+async def async_load_ikigai_profiles(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Async counterpart of load_ikigai_profiles"""
+    return await run_profile_io(load_ikigai_profiles, user_id)
+
+async def async_get_ikigai_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of get_ikigai_profile"""
+    return await run_profile_io(get_ikigai_profile, profile_id, user_id)
+
+async def async_delete_ikigai_profile(profile_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async counterpart of delete_ikigai_profile"""
+    return await run_profile_io(delete_ikigai_profile, profile_id, user_id)
+
+async def aiter_profile_stream(stream: Iterator[str]):
+    """Async iterator over a response 'stream'; each chunk is produced on the profile I/O executor"""
+    done = object()
+    while True:
+        chunk = await run_profile_io(next, stream, done)
+        if chunk is done:
+            return
+        yield chunk
+
+async def async_handle_profile_api(action: str, profile_type: str, data: Dict[str, Any] = None,
+                                   user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Event-loop-safe counterpart of handle_profile_api.
+
+    The whole request runs on the profile I/O executor, so the caller's
+    loop never blocks on disk. A saturated executor yields a 'busy' error
+    response instead of queueing without bound. A 'stream' in the response
+    comes back as an async iterator whose chunks are also read off-loop.
+    """
+    try:
+        result = await run_profile_io(handle_profile_api, action, profile_type, data, user_id)
+        if 'stream' in result:
+            result['stream'] = aiter_profile_stream(result['stream'])
+        return result
+    except ProfileStoreBusy as e:
+        logger.warning(f"WhyDetector: Rejected {action}/{profile_type}: {e}")
+        return {'success': False, 'error': str(e), 'busy': True}
+
+
+def profile_cli(argv: List[str]) -> int:
+    """
+    Command line export/import of profiles:
+
+        python lifecycle_manager.py export FILE [--type all|why|ikigai] [--user ID]
+        python lifecycle_manager.py import FILE [--policy skip|overwrite|newest-wins] [--batch-size N] [--user ID]
+
+    FILE may be '-' for stdout/stdin. Reports are printed to stderr as JSON.
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='lifecycle_manager.py', description='WhyDetector profile export/import')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help='Write profiles as NDJSON')
+    export_parser.add_argument('file')
+    export_parser.add_argument('--type', default='all', choices=['all', *PROFILE_KINDS])
+    export_parser.add_argument('--user', default=None)
+    import_parser = commands.add_parser('import', help='Read profiles from NDJSON')
+    import_parser.add_argument('file')
+    import_parser.add_argument('--policy', default='skip', choices=PROFILE_IMPORT_POLICIES)
+    import_parser.add_argument('--batch-size', type=int, default=PROFILE_IMPORT_BATCH_SIZE)
+    import_parser.add_argument('--user', default=None)
+    args = parser.parse_args(argv)
+    
+    if args.command == 'export':
+        if args.file == '-':
+            result = export_profiles_ndjson(sys.stdout, args.type, args.user)
+        else:
+            result = export_profiles_to_file(args.file, args.type, args.user)
+    elif args.file == '-':
+        result = import_profiles_ndjson(sys.stdin, args.policy, args.user, args.batch_size)
+    else:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            result = import_profiles_ndjson(f, args.policy, args.user, args.batch_size)
+    flush_profile_writes()
+    print(json.dumps(result, indent=2), file=sys.stderr)
+    return 0 if result.get('success') and not result.get('errors') else 1
+
+
+# Test script
+if __name__ == "__main__":
+    import asyncio
+    
+    if len(sys.argv) > 1:
+        sys.exit(profile_cli(sys.argv[1:]))
     
     async def main():
         print("BrainDriveWhyDetector Plugin Lifecycle Manager - Test Mode")
         print("=" * 60)
         
-        manager = BrainDriveWhyDetectorLifecycleManager()
+        manager = _lifecycle_manager_class()()
         print(f"Plugin: {manager.plugin_data['name']}")
         print(f"Version: {manager.plugin_data['version']}")
         print(f"Slug: {manager.plugin_data['plugin_slug']}")
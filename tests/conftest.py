@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import lifecycle_manager as lm  # noqa: E402
+# The lifecycle tables come from the benchmark suite, so the two cannot drift apart
+from suite import LIFECYCLE_SCHEMA  # noqa: E402
+
+
+@pytest.fixture
+def profile_store(tmp_path, monkeypatch):
+    """Point the profile store at an empty plugin directory with a fresh JSON backend"""
+    monkeypatch.setattr(lm, 'get_plugin_dir', lambda: tmp_path)
+    monkeypatch.setattr(lm, '_profile_backend', lm.JsonFileProfileBackend())
+    yield tmp_path
+    lm.flush_profile_writes()
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def any_backend(request, profile_store, monkeypatch):
+    """The profile store on each backend in turn"""
+    if request.param == 'json':
+        yield lm.get_profile_backend()
+        return
+    backend = lm.SqliteProfileBackend(migrate=False)
+    monkeypatch.setattr(lm, '_profile_backend', backend)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def run_lifecycle(tmp_path):
+    """
+    Run ``scenario(db, manager)`` against an in-memory SQLite database with
+    the plugin, module and pages tables, and a manager rooted in tmp_path.
+    Extra SQL (e.g. triggers) can be passed as ``setup``.
+    """
+    pytest.importorskip('aiosqlite')
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    plugins_base_dir = str(tmp_path / 'plugins')
+
+    def run(scenario, setup=()):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            try:
+                async with engine.begin() as conn:
+                    for statement in LIFECYCLE_SCHEMA + tuple(setup):
+                        await conn.execute(sqlalchemy.text(statement))
+                async with AsyncSession(engine) as db:
+                    return await scenario(db, lm.get_lifecycle_manager(plugins_base_dir))
+            finally:
+                await engine.dispose()
+        return asyncio.run(main())
+
+    yield run
+    lm.invalidate_lifecycle_managers(plugins_base_dir)
+
+
+async def count_rows(db, table: str, column: str, user_id: str) -> int:
+    from sqlalchemy import text
+    result = await db.execute(text(f"SELECT COUNT(*) FROM {table} WHERE {column} = :user_id"), {'user_id': user_id})
+    return result.scalar()
+
+
+async def installed_rows(db, user_id: str):
+    """(plugin, module, page) row counts for one user"""
+    return (await count_rows(db, 'plugin', 'user_id', user_id),
+            await count_rows(db, 'module', 'user_id', user_id),
+            await count_rows(db, 'pages', 'creator_id', user_id))
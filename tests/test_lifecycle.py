@@ -0,0 +1,115 @@
+import pytest
+
+import lifecycle_manager as lm
+from conftest import installed_rows
+
+text = pytest.importorskip('sqlalchemy').text
+
+# Makes the page insert for one user fail inside the install transaction
+FAIL_PAGE_FOR_U2 = """
+CREATE TRIGGER fail_page_u2 BEFORE INSERT ON pages
+WHEN NEW.creator_id = 'u2'
+BEGIN SELECT RAISE(ABORT, 'page insert rejected'); END
+"""
+
+
+def test_install_creates_plugin_modules_and_page(run_lifecycle):
+    async def scenario(db, manager):
+        result = await manager.install_plugin('u1', db)
+        assert result['success'], result
+        assert result['plugin_id'] == 'u1_BrainDriveWhyDetector'
+        assert await installed_rows(db, 'u1') == (1, len(manager.module_data), 1)
+    run_lifecycle(scenario)
+
+
+def test_failed_page_insert_rolls_back_the_whole_install(run_lifecycle):
+    async def scenario(db, manager):
+        result = await manager.install_plugin('u2', db)
+        assert not result['success']
+        assert await installed_rows(db, 'u2') == (0, 0, 0)
+        # The session is usable afterwards
+        assert (await manager.install_plugin('u1', db))['success']
+    run_lifecycle(scenario, setup=[FAIL_PAGE_FOR_U2])
+
+
+def test_second_install_is_rejected_without_touching_rows(run_lifecycle):
+    async def scenario(db, manager):
+        assert (await manager.install_plugin('u1', db))['success']
+        result = await manager.install_plugin('u1', db)
+        assert not result['success']
+        assert result['error'] == 'Plugin already installed'
+        assert await installed_rows(db, 'u1') == (1, len(manager.module_data), 1)
+    run_lifecycle(scenario)
+
+
+def test_delete_removes_every_row(run_lifecycle):
+    async def scenario(db, manager):
+        assert (await manager.install_plugin('u1', db))['success']
+        assert (await manager.delete_plugin('u1', db))['success']
+        assert await installed_rows(db, 'u1') == (0, 0, 0)
+        assert not (await manager.delete_plugin('u1', db))['success']
+    run_lifecycle(scenario)
+
+
+def test_bulk_install_skips_installed_users(run_lifecycle):
+    async def scenario(db, manager):
+        assert (await manager.install_plugin('u1', db))['success']
+        result = await manager.install_plugin_bulk(['u1', 'u2', 'u3', 'u2'], db, batch_size=2)
+        assert result['total'] == 3
+        assert result['succeeded'] == 2
+        assert result['results']['u1']['error'] == 'Plugin already installed'
+        for user_id in ('u1', 'u2', 'u3'):
+            assert await installed_rows(db, user_id) == (1, len(manager.module_data), 1)
+    run_lifecycle(scenario)
+
+
+def test_failed_bulk_batch_is_retried_per_user(run_lifecycle):
+    async def scenario(db, manager):
+        result = await manager.install_plugin_bulk(['u1', 'u2', 'u3'], db)
+        assert (result['succeeded'], result['failed']) == (2, 1)
+        assert not result['results']['u2']['success']
+        assert await installed_rows(db, 'u2') == (0, 0, 0)
+        assert await installed_rows(db, 'u1') == (1, len(manager.module_data), 1)
+        assert await installed_rows(db, 'u3') == (1, len(manager.module_data), 1)
+    run_lifecycle(scenario, setup=[FAIL_PAGE_FOR_U2])
+
+
+def test_bulk_delete_and_status_many(run_lifecycle):
+    async def scenario(db, manager):
+        assert (await manager.install_plugin_bulk(['u1', 'u2'], db))['success']
+        statuses = await manager.get_plugin_status_many(['u1', 'u2', 'u3'], db)
+        assert statuses['u1']['exists'] and statuses['u2']['exists']
+        assert statuses['u3'] == {'exists': False, 'status': 'not_installed'}
+
+        result = await manager.delete_plugin_bulk(['u1', 'u2', 'u3'], db)
+        assert (result['succeeded'], result['failed']) == (2, 1)
+        assert result['results']['u3']['error'] == 'Plugin not found for user'
+        for user_id in ('u1', 'u2'):
+            assert await installed_rows(db, user_id) == (0, 0, 0)
+    run_lifecycle(scenario)
+
+
+def test_reinstall_after_rows_removed_elsewhere(run_lifecycle):
+    # The manager outlives requests; its in-memory active_users must not
+    # block a reinstall once the rows are gone
+    async def scenario(db, manager):
+        assert (await manager.install_plugin('u1', db))['success']
+        for statement in ("DELETE FROM module WHERE user_id = 'u1'",
+                          "DELETE FROM plugin WHERE user_id = 'u1'",
+                          "DELETE FROM pages WHERE creator_id = 'u1'"):
+            await db.execute(text(statement))
+        await db.commit()
+
+        result = await manager.install_plugin('u1', db)
+        assert result['success'], result
+        assert await installed_rows(db, 'u1') == (1, len(manager.module_data), 1)
+    run_lifecycle(scenario)
+
+
+def test_get_lifecycle_manager_is_reused_until_invalidated(tmp_path):
+    plugins_base_dir = str(tmp_path / 'plugins')
+    manager = lm.get_lifecycle_manager(plugins_base_dir)
+    assert lm.get_lifecycle_manager(plugins_base_dir) is manager
+    lm.invalidate_lifecycle_managers(plugins_base_dir)
+    assert lm.get_lifecycle_manager(plugins_base_dir) is not manager
+    lm.invalidate_lifecycle_managers(plugins_base_dir)
@@ -0,0 +1,75 @@
+import pytest
+
+import lifecycle_manager as lm
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    registry = lm.MetricsRegistry()
+    monkeypatch.setattr(lm, 'METRICS', registry)
+    return registry
+
+
+def test_snapshot_counts_errors_and_cumulative_buckets(metrics):
+    for seconds in (0.0003, 0.003, 0.003, 0.3):
+        metrics.observe('op', seconds)
+    metrics.observe('op', 20.0, failed=True, bytes_read=10, bytes_written=5)
+    metrics.add_bytes('op', bytes_read=1)
+
+    stats = lm.get_metrics_snapshot()['operations']['op']
+    assert (stats['count'], stats['errors']) == (5, 1)
+    assert (stats['bytes_read'], stats['bytes_written']) == (11, 5)
+    assert stats['seconds_total'] == pytest.approx(20.3063)
+    buckets = stats['latency_buckets']
+    assert list(buckets) == [repr(bound) for bound in lm.METRICS_LATENCY_BUCKETS] + ['+Inf']
+    assert (buckets['0.0005'], buckets['0.001'], buckets['0.005'], buckets['0.25'], buckets['0.5']) == (1, 1, 3, 3, 4)
+    assert (buckets['10.0'], buckets['+Inf']) == (4, 5)
+
+    lm.reset_metrics()
+    assert lm.get_metrics_snapshot() == {'operations': {}}
+
+
+def test_prometheus_output(metrics):
+    metrics.observe('op', 0.002, labels=(('action', 'say "hi"'),))
+    metrics.observe('op', 0.002, failed=True, labels=(('action', 'say "hi"'),))
+    metrics.add_bytes('store', bytes_written=7)
+
+    lines = lm.render_metrics_prometheus().splitlines()
+    labels = '{operation="op",action="say \\"hi\\""'
+    assert f'whydetector_operation_duration_seconds_bucket{labels},le="0.001"}} 0' in lines
+    assert f'whydetector_operation_duration_seconds_bucket{labels},le="0.0025"}} 2' in lines
+    assert f'whydetector_operation_duration_seconds_bucket{labels},le="+Inf"}} 2' in lines
+    assert f'whydetector_operation_duration_seconds_count{labels}}} 2' in lines
+    assert f'whydetector_operation_errors_total{labels}}} 1' in lines
+    assert 'whydetector_operation_bytes_written_total{operation="store"} 7' in lines
+    # Byte-only operations have no histogram or error series
+    assert not any(line.startswith('whydetector_operation_errors_total{operation="store"') for line in lines)
+    assert '# TYPE whydetector_operation_duration_seconds histogram' in lines
+
+
+def test_profile_api_calls_are_recorded(profile_store, metrics):
+    for n in range(3):
+        lm.handle_profile_api('save', 'why', {'id': f'p{n}', 'name': 'Test'})
+    lm.handle_profile_api('get', 'why', {'id': 'missing'})
+    lm.handle_profile_api('explode', 'nope', {})
+
+    operations = lm.get_metrics_snapshot()['operations']
+    assert operations['profile_api.save.why']['count'] == 3
+    assert operations['profile_api.save.why']['errors'] == 0
+    assert operations['profile_api.get.why']['errors'] == 1
+    assert operations['profile_api.invalid.invalid']['labels'] == {'action': 'invalid', 'profile_type': 'invalid'}
+    assert operations['profile_store']['bytes_written'] > 0
+
+
+def test_lifecycle_calls_are_recorded(run_lifecycle, metrics):
+    async def scenario(db, manager):
+        assert (await manager.install_plugin('u1', db))['success']
+        assert not (await manager.install_plugin('u1', db))['success']
+    run_lifecycle(scenario)
+
+    operations = lm.get_metrics_snapshot()['operations']
+    # The second install is turned away by create_database_records itself
+    records = operations['create_database_records']
+    assert (records['count'], records['errors']) == (2, 1)
+    assert operations['create_plugin_page']['count'] == 1
+    assert operations['copy_plugin_files']['errors'] == 0
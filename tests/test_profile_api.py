@@ -0,0 +1,123 @@
+import base64
+import json
+
+import pytest
+
+import lifecycle_manager as lm
+
+
+def save_dated(count, start=0):
+    for n in range(start, start + count):
+        profile = {'id': f'p{n:02d}', 'name': f'Profile {n}', 'createdAt': f'2026-01-{n + 1:02d}T00:00:00',
+                   'whyStatement': f'Statement {n}'}
+        assert lm.handle_profile_api('save', 'why', profile)['success']
+
+
+def list_page(limit, cursor=None):
+    data = {'limit': limit}
+    if cursor is not None:
+        data['cursor'] = cursor
+    result = lm.handle_profile_api('list', 'why', data)
+    assert result['success'], result
+    return [summary['id'] for summary in result['profiles']], result['next_cursor']
+
+
+def test_pages_cover_every_profile_once(any_backend):
+    save_dated(7)
+    seen, cursor = [], None
+    pages = 0
+    while True:
+        ids, cursor = list_page(3, cursor)
+        seen.extend(ids)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == [f'p{n:02d}' for n in reversed(range(7))]
+
+
+def test_exact_multiple_of_the_page_size_ends_without_an_empty_page(any_backend):
+    save_dated(4)
+    first, cursor = list_page(2)
+    second, cursor = list_page(2, cursor)
+    assert (first, second, cursor) == (['p03', 'p02'], ['p01', 'p00'], None)
+
+
+def test_cursor_is_stable_when_saves_land_mid_walk(any_backend):
+    save_dated(6)
+    first, cursor = list_page(2)
+    assert first == ['p05', 'p04']
+
+    # A newer profile sorts before the cursor, an older one after it
+    save_dated(1, start=20)
+    lm.handle_profile_api('save', 'why', {'id': 'old', 'name': 'Old', 'createdAt': '2025-12-31T00:00:00'})
+    lm.handle_profile_api('save', 'why', {'id': 'p02', 'name': 'Edited', 'createdAt': '2026-01-03T00:00:00'})
+
+    rest = []
+    while cursor is not None:
+        ids, cursor = list_page(2, cursor)
+        rest.extend(ids)
+    assert rest == ['p03', 'p02', 'p01', 'p00', 'old']
+
+
+def test_limit_is_clamped(any_backend):
+    save_dated(3)
+    assert len(list_page(0)[0]) == 1
+    assert not lm.handle_profile_api('list', 'why', {'limit': 'many'})['success']
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    base64.urlsafe_b64encode(b'{"created": 1}').decode('ascii'),
+    base64.urlsafe_b64encode(b'[1, 2]').decode('ascii'),
+])
+def test_invalid_cursor_is_rejected(any_backend, cursor):
+    save_dated(2)
+    result = lm.handle_profile_api('list', 'why', {'limit': 1, 'cursor': cursor})
+    assert not result['success']
+    assert result['error'] == 'Invalid cursor'
+
+
+IKIGAI = {'id': 'i1', 'name': 'Ikigai', 'createdAt': '2026-01-01T00:00:00', 'whyStatement': 'To build',
+          'love': {'bullets': ['Music', 'Code'], 'notes': 'long notes'},
+          'overlaps': [{'name': 'passion', 'text': 'a'}, {'name': 'mission', 'text': 'b'}]}
+
+
+@pytest.fixture
+def ikigai_saved(any_backend):
+    assert lm.handle_profile_api('save', 'ikigai', dict(IKIGAI))['success']
+
+
+def test_get_projects_nested_fields_and_keeps_id(ikigai_saved):
+    result = lm.handle_profile_api('get', 'ikigai', {'id': 'i1', 'fields': ['love.bullets', 'overlaps.name']})
+    assert result['profile'] == {'id': 'i1', 'love': {'bullets': ['Music', 'Code']},
+                                 'overlaps': [{'name': 'passion'}, {'name': 'mission'}]}
+
+
+def test_load_and_streamed_load_project_the_same_fields(ikigai_saved):
+    loaded = lm.handle_profile_api('load', 'ikigai', {'fields': 'name,love.missing'})
+    assert loaded['profiles'] == [{'id': 'i1', 'name': 'Ikigai', 'love': {}}]
+
+    streamed = lm.handle_profile_api('load', 'ikigai', {'fields': 'name,love.missing', 'stream': True})
+    assert json.loads(''.join(streamed['stream']))['profiles'] == loaded['profiles']
+
+    rejected = lm.handle_profile_api('load', 'ikigai', {'fields': ['a..b'], 'stream': True})
+    assert not rejected['success'] and 'stream' not in rejected
+
+
+def test_list_projects_summaries(ikigai_saved):
+    result = lm.handle_profile_api('list', 'ikigai', {'fields': ['whyStatement']})
+    assert result['profiles'] == [{'id': 'i1', 'whyStatement': 'To build'}]
+
+
+def test_parent_path_wins_over_a_child_path(ikigai_saved):
+    result = lm.handle_profile_api('get', 'ikigai', {'id': 'i1', 'fields': ['love.bullets', 'love']})
+    assert result['profile']['love'] == IKIGAI['love']
+
+
+@pytest.mark.parametrize('fields', [['a..b'], ['.love'], ['love.'], 'name,,x..y', 5, [1]])
+@pytest.mark.parametrize('action', ['get', 'load', 'list'])
+def test_invalid_field_paths_are_rejected(ikigai_saved, action, fields):
+    result = lm.handle_profile_api(action, 'ikigai', {'id': 'i1', 'fields': fields})
+    assert not result['success']
+    assert 'field' in result['error']
@@ -0,0 +1,252 @@
+import json
+
+import pytest
+
+import lifecycle_manager as lm
+
+WHY = lm.WHY_PROFILES
+
+
+def why_profile(profile_id=None, **fields):
+    profile = {'name': 'Test', 'createdAt': '2026-01-01T00:00:00', 'whyStatement': 'To help', **fields}
+    if profile_id is not None:
+        profile['id'] = profile_id
+    return profile
+
+
+def test_save_get_list_delete_roundtrip(profile_store):
+    assert lm.save_why_profile(why_profile('p1'), user_id='alice')['success']
+    assert lm.get_why_profile('p1', user_id='alice')['profile']['whyStatement'] == 'To help'
+    assert not lm.get_why_profile('p1', user_id='bob')['success']
+
+    listed = lm.list_profile_summaries(WHY, user_id='alice')
+    assert [summary['id'] for summary in listed['profiles']] == ['p1']
+
+    assert lm.delete_why_profile('p1', user_id='alice')['success']
+    assert not lm.get_why_profile('p1', user_id='alice')['success']
+    assert lm.list_profile_summaries(WHY, user_id='alice')['profiles'] == []
+
+
+def test_ids_that_sanitize_alike_are_stored_apart(profile_store):
+    assert lm.profile_relpath('a/b') != lm.profile_relpath('a_b')
+    lm.save_why_profile(why_profile('a/b', name='slash'))
+    lm.save_why_profile(why_profile('a_b', name='underscore'))
+    assert lm.get_why_profile('a/b')['profile']['name'] == 'slash'
+    assert lm.get_why_profile('a_b')['profile']['name'] == 'underscore'
+    assert len(lm.load_why_profiles()) == 2
+
+
+def test_saves_without_an_id_get_distinct_ids(profile_store):
+    first, second = why_profile(), why_profile()
+    lm.save_why_profile(first)
+    lm.save_why_profile(second)
+    assert first['id'] != second['id']
+    assert len(lm.load_why_profiles()) == 2
+
+
+def test_manifest_instances_see_each_others_changes(profile_store):
+    lm.save_why_profile(why_profile('p1'))
+    writer = lm.get_profile_manifest(WHY)
+    reader = lm.ProfileManifest(writer.profiles_dir, WHY)
+    assert reader.lookup('p1') == lm.profile_relpath('p1')
+
+    lm.save_why_profile(why_profile('p2', createdAt='2026-02-01T00:00:00'))
+    lm.delete_why_profile('p1')
+    assert reader.lookup('p1') is None
+    assert [profile_id for profile_id, _ in reader.files()] == ['p2']
+
+
+def test_manifest_log_is_compacted(profile_store, monkeypatch):
+    monkeypatch.setattr(lm, 'PROFILE_MANIFEST_COMPACT_MIN_RECORDS', 10)
+    for n in range(30):
+        lm.save_why_profile(why_profile('p1', whyStatement=f'revision {n}'))
+    manifest = lm.get_profile_manifest(WHY)
+    lines = manifest.path.read_bytes().splitlines()
+    assert json.loads(lines[0]) == {'version': lm.ProfileManifest.VERSION}
+    assert len(lines) <= 11
+    assert lm.ProfileManifest(manifest.profiles_dir, WHY).files() == [('p1', lm.profile_relpath('p1'))]
+
+
+def test_corrupt_manifest_is_rebuilt_from_the_files(profile_store):
+    lm.save_why_profile(why_profile('p1'))
+    lm.save_why_profile(why_profile('p2'))
+    manifest = lm.get_profile_manifest(WHY)
+    manifest.path.write_bytes(b'not a manifest\n')
+
+    fresh = lm.ProfileManifest(manifest.profiles_dir, WHY)
+    assert sorted(profile_id for profile_id, _ in fresh.files()) == ['p1', 'p2']
+    assert json.loads(manifest.path.read_bytes().splitlines()[0]) == {'version': lm.ProfileManifest.VERSION}
+
+
+def test_scope_caches_are_bounded(profile_store, monkeypatch):
+    evicted = []
+    cache = lm.ScopeCache(2, on_evict=evicted.append)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get(key, lambda key=key: key.upper())
+    assert sorted(cache.values()) == ['A', 'C']
+    assert evicted == ['B']
+
+    monkeypatch.setattr(lm, '_profile_manifests', lm.ScopeCache(2))
+    for user_id in ('u1', 'u2', 'u3'):
+        lm.save_why_profile(why_profile('p1'), user_id=user_id)
+    assert len(lm._profile_manifests) == 2
+    for user_id in ('u1', 'u2', 'u3'):
+        assert [profile_id for profile_id, _ in lm.get_profile_manifest(WHY, user_id).files()] == ['p1']
+
+
+def test_legacy_flat_profiles_are_migrated_per_plugin_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lm, '_profile_backend', lm.JsonFileProfileBackend())
+    for plugin_dir in (tmp_path / 'one', tmp_path / 'two'):
+        legacy_dir = plugin_dir / 'why_profiles'
+        legacy_dir.mkdir(parents=True)
+        (legacy_dir / 'legacy.json').write_text(json.dumps(why_profile('legacy')))
+
+        monkeypatch.setattr(lm, 'get_plugin_dir', lambda plugin_dir=plugin_dir: plugin_dir)
+        assert lm.get_why_profile('legacy')['success']
+        assert not (legacy_dir / 'legacy.json').exists()
+        assert lm.get_profile_manifest(WHY).lookup('legacy') == lm.profile_relpath('legacy')
+
+
+def test_failed_deferred_write_is_reported(profile_store, monkeypatch):
+    backend = lm.JsonFileProfileBackend(lm.ProfileWriteQueue(60))
+    monkeypatch.setattr(lm, '_profile_backend', backend)
+    # The first save builds the search index, which flushes parked writes
+    lm.save_why_profile(why_profile('p0'))
+    assert lm.save_why_profile(why_profile('p1'))['queued']
+
+    def disk_full(path, payload, durable=True):
+        raise OSError('disk full')
+    with monkeypatch.context() as patch:
+        patch.setattr(lm, '_write_bytes_atomic', disk_full)
+        assert backend.write_queue.flush()['errors']
+
+    result = lm.get_why_profile('p1')
+    assert not result['success']
+    assert result['deferred_write_error'] == 'disk full'
+
+
+def test_write_behind_is_off_by_default(profile_store):
+    if lm.PROFILE_WRITE_COALESCE_SECONDS:
+        pytest.skip('WHYDETECTOR_PROFILE_WRITE_COALESCE_MS is set')
+    result = lm.save_why_profile(why_profile('p1'))
+    assert 'queued' not in result
+    assert lm.resolve_profile_file(WHY, 'p1').exists()
+
+
+@pytest.mark.parametrize('action', ['export', 'import'])
+def test_profile_api_rejects_server_side_paths(profile_store, action):
+    result = lm.handle_profile_api(action, 'all', {'path': '/etc/passwd'})
+    assert not result['success']
+    assert result['error'] == lm.PATH_NOT_ALLOWED_ERROR
+
+
+def test_entry_of_a_file_removed_outside_the_store_is_dropped(profile_store):
+    lm.save_why_profile(why_profile('p1'))
+    lm.save_why_profile(why_profile('p2'))
+    lm.resolve_profile_file(WHY, 'p1').unlink()
+    manifest = lm.get_profile_manifest(WHY)
+
+    assert not lm.get_why_profile('p1')['success']
+    assert [summary['id'] for summary in lm.list_profile_summaries(WHY)['profiles']] == ['p2']
+    assert lm.ProfileManifest(manifest.profiles_dir, WHY).lookup('p1') is None
+
+    lm.save_why_profile(why_profile('p3'))
+    (manifest.profiles_dir / lm.profile_relpath('p3')).unlink()
+    assert lm.delete_why_profile('p3').get('not_found')
+    assert manifest.lookup('p3') is None
+
+
+def test_torn_manifest_tail_is_rebuilt_before_appending(profile_store):
+    lm.save_why_profile(why_profile('p1'))
+    manifest = lm.get_profile_manifest(WHY)
+    with open(manifest.path, 'ab') as f:
+        f.write(b'["p2", {"file": "x')
+
+    lm.save_why_profile(why_profile('p3'))
+    fresh = lm.ProfileManifest(manifest.profiles_dir, WHY)
+    assert sorted(profile_id for profile_id, _ in fresh.files()) == ['p1', 'p3']
+    assert manifest.path.read_bytes().endswith(b'\n')
+
+
+def count_file_reads(monkeypatch):
+    reads = []
+    read_profile_file = lm._read_profile_file
+
+    def counting(filepath, filename=None):
+        reads.append(filename)
+        return read_profile_file(filepath, filename)
+    monkeypatch.setattr(lm, '_read_profile_file', counting)
+    return reads
+
+
+def save_dated_profiles(count):
+    for n in range(count):
+        lm.save_why_profile(why_profile(f'p{n:03d}', createdAt=f'2026-01-01T00:00:{n:02d}'))
+
+
+def test_streamed_load_reads_files_as_chunks_go_out(profile_store, monkeypatch):
+    save_dated_profiles(40)
+    lm.get_profile_index(lm.get_profile_manifest(WHY).profiles_dir).invalidate()
+    reads = count_file_reads(monkeypatch)
+
+    chunks = lm.iter_load_response_chunks(WHY, chunk_size=10)
+    head, first = next(chunks), next(chunks)
+    assert len(reads) == 10
+    rest = list(chunks)
+    assert len(reads) == 40
+
+    document = json.loads(head + first + ''.join(rest))
+    assert [profile['id'] for profile in document['profiles']] == [f'p{n:03d}' for n in reversed(range(40))]
+    assert document['errors'] == []
+
+
+def test_streamed_load_uses_cached_profiles(profile_store, monkeypatch):
+    save_dated_profiles(20)
+    assert len(lm.load_why_profiles()) == 20
+    reads = count_file_reads(monkeypatch)
+    assert len(list(lm.iter_profiles_sorted(WHY))) == 20
+    assert reads == []
+
+
+def test_export_reads_one_profile_per_line(profile_store, monkeypatch):
+    save_dated_profiles(30)
+    lm.get_profile_index(lm.get_profile_manifest(WHY).profiles_dir).invalidate()
+    reads = count_file_reads(monkeypatch)
+
+    lines = lm.iter_profiles_ndjson('why')
+    first = json.loads(next(lines))
+    assert first == {'type': 'why', 'profile': first['profile']}
+    assert first['profile']['id'] == 'p029'
+    assert len(reads) == 1
+    assert len(list(lines)) == 29
+    assert len(reads) == 30
+
+
+ENCODING_PREFIXES = {'json': b'{', 'json-indent': b'{\n', 'zlib': b'\x78', 'gzip': b'\x1f\x8b'}
+
+
+@pytest.mark.parametrize('encoding', lm.PROFILE_ENCODINGS)
+def test_profiles_read_back_in_every_encoding(profile_store, monkeypatch, encoding):
+    monkeypatch.setattr(lm, '_profile_encoding', None)
+    lm.set_profile_encoding(encoding)
+    profile = why_profile('p1', whatYouLove=['Music', 'Ünïcode ✓'])
+    lm.save_why_profile(profile)
+
+    assert lm.resolve_profile_file(WHY, 'p1').read_bytes().startswith(ENCODING_PREFIXES[encoding])
+    assert lm.get_why_profile('p1')['profile']['whatYouLove'] == ['Music', 'Ünïcode ✓']
+    assert [loaded['id'] for loaded in lm.load_why_profiles()] == ['p1']
+
+
+def test_profiles_written_under_different_encodings_load_together(profile_store, monkeypatch):
+    monkeypatch.setattr(lm, '_profile_encoding', None)
+    for n, encoding in enumerate(lm.PROFILE_ENCODINGS):
+        lm.set_profile_encoding(encoding)
+        lm.save_why_profile(why_profile(f'p{n}', createdAt=f'2026-01-0{n + 1}T00:00:00', whyStatement=encoding))
+
+    lm.set_profile_encoding('json')
+    statements = {profile['id']: profile['whyStatement'] for profile in lm.load_why_profiles()}
+    assert statements == {f'p{n}': encoding for n, encoding in enumerate(lm.PROFILE_ENCODINGS)}
+    lines = list(lm.iter_profiles_ndjson('why'))
+    assert len(lines) == len(lm.PROFILE_ENCODINGS)
+    for n, encoding in enumerate(lm.PROFILE_ENCODINGS):
+        assert lm.get_why_profile(f'p{n}')['profile']['whyStatement'] == encoding
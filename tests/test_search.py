@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import lifecycle_manager as lm
+
+WHY = lm.WHY_PROFILES
+
+
+def why_profile(profile_id, statement, **fields):
+    return {'id': profile_id, 'name': profile_id, 'createdAt': '2026-01-01T00:00:00',
+            'whyStatement': statement, **fields}
+
+
+def search_ids(query, **kwargs):
+    result = lm.search_profiles(query, 'why', **kwargs)
+    assert result['success']
+    return [hit['id'] for hit in result['results']]
+
+
+@pytest.fixture
+def sqlite_backend(profile_store, monkeypatch):
+    backends = []
+
+    def make(name='profiles.sqlite3'):
+        backend = lm.SqliteProfileBackend(profile_store / name, migrate=False)
+        backends.append(backend)
+        return backend
+    yield make
+    for backend in backends:
+        backend.close()
+
+
+def test_results_are_ranked_by_relevance(profile_store):
+    lm.save_why_profile(why_profile('music', 'Music music and teaching music'))
+    lm.save_why_profile(why_profile('mixed', 'Teaching children music'))
+    lm.save_why_profile(why_profile('other', 'Building bridges'))
+
+    assert search_ids('music') == ['music', 'mixed']
+    assert search_ids('bridges') == ['other']
+    assert search_ids('music', limit=1) == ['music']
+    assert lm.search_profiles('music', 'why')['total'] == 2
+    assert search_ids('nothing matches') == []
+
+
+def test_saves_and_deletes_update_the_index(profile_store):
+    lm.save_why_profile(why_profile('p1', 'Gardening'))
+    assert search_ids('gardening') == ['p1']
+
+    lm.save_why_profile(why_profile('p1', 'Cooking'))
+    assert search_ids('gardening') == []
+    assert search_ids('cooking') == ['p1']
+
+    lm.delete_why_profile('p1')
+    assert search_ids('cooking') == []
+
+
+def test_index_is_reloaded_from_its_file(profile_store, monkeypatch):
+    lm.save_why_profile(why_profile('p1', 'Gardening'))
+    lm.save_why_profile(why_profile('p2', 'Cooking'))
+    lm.flush_search_indexes()
+    path = lm.get_profile_backend().search_index_path(WHY)
+    assert path.exists()
+
+    def no_rebuild(self, backend):
+        raise AssertionError('index should have been read from its file')
+    monkeypatch.setattr(lm, '_profile_search_indexes', lm.ScopeCache(8))
+    monkeypatch.setattr(lm.ProfileSearchIndex, 'rebuild', no_rebuild)
+    assert search_ids('cooking') == ['p2']
+
+
+def test_saves_from_another_process_are_searchable(profile_store):
+    lm.save_why_profile(why_profile('p1', 'Gardening'))
+    assert search_ids('sailing') == []
+
+    script = textwrap.dedent(f"""
+        import sys
+        from pathlib import Path
+        sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(lm.__file__)))!r})
+        import lifecycle_manager as lm
+        lm.get_plugin_dir = lambda: Path({str(profile_store)!r})
+        lm.JsonFileProfileBackend().save(lm.WHY_PROFILES, {why_profile('p2', 'Sailing')!r})
+    """)
+    subprocess.run([sys.executable, '-c', script], check=True, capture_output=True)
+
+    assert search_ids('sailing') == ['p2']
+    assert search_ids('gardening') == ['p1']
+
+
+def test_each_sqlite_database_has_its_own_index(sqlite_backend, monkeypatch):
+    first, second = sqlite_backend('first.sqlite3'), sqlite_backend('second.sqlite3')
+    monkeypatch.setattr(lm, '_profile_backend', first)
+    lm.save_why_profile(why_profile('p1', 'Gardening'))
+    assert search_ids('gardening') == ['p1']
+
+    monkeypatch.setattr(lm, '_profile_backend', second)
+    assert search_ids('gardening') == []
+    lm.save_why_profile(why_profile('p2', 'Gardening at night'))
+    assert search_ids('gardening') == ['p2']
+    assert first.search_index_path(WHY) != second.search_index_path(WHY)
+
+
+def test_sqlite_writes_from_another_connection_are_searchable(sqlite_backend, monkeypatch):
+    backend = sqlite_backend()
+    monkeypatch.setattr(lm, '_profile_backend', backend)
+    lm.save_why_profile(why_profile('p1', 'Gardening'))
+    assert search_ids('sailing') == []
+
+    sqlite_backend().save(WHY, why_profile('p2', 'Sailing'))
+    assert search_ids('sailing') == ['p2']
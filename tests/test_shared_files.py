@@ -0,0 +1,132 @@
+import asyncio
+import os
+
+import lifecycle_manager as lm
+
+
+def write_plugin(source_dir, main_js: str):
+    # Replace rather than rewrite: the shared copy may be a hardlink to the source
+    (source_dir / 'dist').mkdir(parents=True, exist_ok=True)
+    (source_dir / 'dist' / 'main.js').unlink(missing_ok=True)
+    (source_dir / 'dist' / 'main.js').write_text(main_js)
+    if not (source_dir / 'package.json').exists():
+        (source_dir / 'dist' / 'remoteEntry.js').write_text('remote')
+        (source_dir / 'package.json').write_text('{"name": "whyfinder"}')
+
+
+def fail_copies_of(relpath: str, monkeypatch):
+    link_or_copy_file = lm._link_or_copy_file
+
+    def failing(source, target):
+        if target.as_posix().endswith(relpath):
+            raise OSError(f"disk full writing {relpath}")
+        return link_or_copy_file(source, target)
+    monkeypatch.setattr(lm, '_link_or_copy_file', failing)
+
+
+def test_failed_copy_keeps_the_old_file_and_is_retried(tmp_path, monkeypatch):
+    manager = lm._lifecycle_manager_class()(str(tmp_path / 'plugins'))
+    source_dir, target_dir = tmp_path / 'source', tmp_path / 'shared'
+    write_plugin(source_dir, 'v1')
+
+    async def scenario():
+        first = await manager._materialize_shared_files(source_dir, target_dir)
+        assert first['failed_files'] == []
+
+        write_plugin(source_dir, 'v2')
+        fail_copies_of('dist/main.js', monkeypatch)
+        failed = await manager._materialize_shared_files(source_dir, target_dir)
+        assert failed['failed_files'] == ['dist/main.js']
+        assert failed['removed_files'] == []
+        assert failed['progress']['files_failed'] == 1
+        assert (target_dir / 'dist' / 'main.js').read_text() == 'v1'
+        assert (await manager._verify_shared_files(target_dir))['ok']
+
+        monkeypatch.undo()
+        retried = await manager._materialize_shared_files(source_dir, target_dir)
+        assert retried['copied_files'] == ['dist/main.js']
+        assert (target_dir / 'dist' / 'main.js').read_text() == 'v2'
+        assert (await manager._verify_shared_files(target_dir))['ok']
+
+    asyncio.run(scenario())
+
+
+def test_copy_plugin_files_reports_failed_copies(tmp_path, monkeypatch):
+    manager = lm._lifecycle_manager_class()(str(tmp_path / 'plugins'))
+    fail_copies_of('dist/remoteEntry.js', monkeypatch)
+
+    result = asyncio.run(manager._copy_plugin_files_impl('u1', tmp_path / 'shared', update=True))
+    assert not result['success']
+    assert result['failed_files'] == ['dist/remoteEntry.js']
+    assert 'dist/remoteEntry.js' in result['error']
+
+
+def test_profile_store_data_is_not_materialized(tmp_path, monkeypatch):
+    manager = lm._lifecycle_manager_class()(str(tmp_path / 'plugins'))
+    source_dir, target_dir = tmp_path / 'source', tmp_path / 'shared'
+    write_plugin(source_dir, 'v1')
+
+    monkeypatch.setattr(lm, 'get_plugin_dir', lambda: source_dir)
+    monkeypatch.setattr(lm, '_profile_backend', lm.JsonFileProfileBackend())
+    lm.save_why_profile({'id': 'p1', 'name': 'Test', 'whyStatement': 'To help'}, user_id='alice')
+    lm.save_ikigai_profile({'id': 'p2', 'name': 'Test'}, user_id='alice')
+    lm.search_profiles('help', 'all', user_id='alice')
+    lm.flush_search_indexes()
+    backend = lm.SqliteProfileBackend(migrate=False)
+    try:
+        backend.save(lm.WHY_PROFILES, {'id': 'p3', 'name': 'Test'})
+        monkeypatch.setattr(lm, '_profile_backend', backend)
+        lm.search_profiles('test', 'why')
+        lm.flush_search_indexes()
+        stored = {path.relative_to(source_dir).parts[0] for path in source_dir.rglob('*') if path.is_file()}
+        assert {'why_profiles', 'ikigai_profiles', 'profiles.sqlite3', 'profiles.sqlite3.search'} <= stored
+
+        result = asyncio.run(manager._materialize_shared_files(source_dir, target_dir))
+    finally:
+        backend.close()
+    assert result['failed_files'] == []
+    materialized = sorted(path.relative_to(target_dir).as_posix() for path in target_dir.rglob('*') if path.is_file())
+    assert materialized == [lm.SHARED_FILES_MANIFEST, 'dist/main.js', 'dist/remoteEntry.js', 'package.json']
+
+
+def materialized_plugin(tmp_path):
+    manager = lm._lifecycle_manager_class()(str(tmp_path / 'plugins'))
+    source_dir, target_dir = tmp_path / 'source', tmp_path / 'shared'
+    write_plugin(source_dir, 'v1')
+    asyncio.run(manager._materialize_shared_files(source_dir, target_dir))
+    return manager, target_dir
+
+
+def test_health_cache_is_trusted_until_the_ttl_expires(tmp_path, monkeypatch):
+    manager, target_dir = materialized_plugin(tmp_path)
+    now = [1000.0]
+    monkeypatch.setattr(lm.time, 'monotonic', lambda: now[0])
+    assert asyncio.run(manager._get_plugin_health_impl(None, target_dir))['healthy']
+
+    (target_dir / 'dist' / 'remoteEntry.js').unlink()
+    now[0] += lm.PLUGIN_HEALTH_TTL - 1
+    assert asyncio.run(manager._get_plugin_health_impl(None, target_dir))['healthy']
+
+    now[0] += 2
+    health = asyncio.run(manager._get_plugin_health_impl(None, target_dir))
+    assert not health['healthy']
+    assert not health['details']['bundle_exists']
+
+
+def test_deep_verify_reports_changed_dist_files(tmp_path):
+    manager, target_dir = materialized_plugin(tmp_path)
+    health = asyncio.run(manager._get_plugin_health_impl(None, target_dir, deep_verify=True))
+    assert health['healthy']
+    assert health['details']['integrity']['files_verified'] == 2
+
+    # Same size and mtime, different content: only a rehash notices
+    main_js = target_dir / 'dist' / 'main.js'
+    st = main_js.stat()
+    main_js.write_text('v9')
+    os.utime(main_js, ns=(st.st_atime_ns, st.st_mtime_ns))
+    (target_dir / 'dist' / 'remoteEntry.js').unlink()
+
+    health = asyncio.run(manager._get_plugin_health_impl(None, target_dir, deep_verify=True))
+    assert not health['healthy']
+    assert health['details']['integrity']['mismatched'] == ['dist/main.js']
+    assert health['details']['integrity']['missing'] == ['dist/remoteEntry.js']
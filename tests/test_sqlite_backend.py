@@ -0,0 +1,68 @@
+import pytest
+
+import lifecycle_manager as lm
+
+WHY, IKIGAI = lm.WHY_PROFILES, lm.IKIGAI_PROFILES
+
+
+def why_profile(profile_id, created_at='2026-01-01T00:00:00', **fields):
+    return {'id': profile_id, 'name': profile_id, 'createdAt': created_at, 'whyStatement': 'To help', **fields}
+
+
+@pytest.fixture
+def sqlite_store(profile_store, monkeypatch):
+    backend = lm.SqliteProfileBackend(migrate=False)
+    monkeypatch.setattr(lm, '_profile_backend', backend)
+    yield backend
+    backend.close()
+
+
+def test_sqlite_roundtrip(sqlite_store):
+    assert lm.save_why_profile(why_profile('p1', '2026-01-01T00:00:00'), user_id='alice')['success']
+    assert lm.save_why_profile(why_profile('p2', '2026-02-01T00:00:00'), user_id='alice')['success']
+    assert lm.save_ikigai_profile({'id': 'i1', 'name': 'Ikigai', 'createdAt': '2026-01-01'}, user_id='alice')['success']
+
+    assert lm.get_why_profile('p1', user_id='alice')['profile']['whyStatement'] == 'To help'
+    assert not lm.get_why_profile('p1', user_id='bob')['success']
+    assert [profile['id'] for profile in lm.load_why_profiles(user_id='alice')] == ['p2', 'p1']
+    assert [profile['id'] for profile in lm.load_ikigai_profiles(user_id='alice')] == ['i1']
+
+    listed = lm.list_profile_summaries(WHY, limit=1, user_id='alice')
+    assert [summary['id'] for summary in listed['profiles']] == ['p2']
+    following = lm.list_profile_summaries(WHY, limit=1, cursor=listed['next_cursor'], user_id='alice')
+    assert [summary['id'] for summary in following['profiles']] == ['p1']
+    assert following['next_cursor'] is None
+
+    lm.save_why_profile(why_profile('p1', '2026-01-01T00:00:00', whyStatement='Changed'), user_id='alice')
+    assert lm.get_why_profile('p1', user_id='alice')['profile']['whyStatement'] == 'Changed'
+
+    assert lm.delete_why_profile('p1', user_id='alice')['success']
+    assert not lm.delete_why_profile('p1', user_id='alice')['success']
+    assert [profile['id'] for profile in lm.load_why_profiles(user_id='alice')] == ['p2']
+
+
+def test_json_profiles_migrate_into_sqlite(profile_store, monkeypatch):
+    lm.save_why_profile(why_profile('p1'))
+    lm.save_why_profile(why_profile('p2'), user_id='alice')
+    lm.save_ikigai_profile({'id': 'i1', 'name': 'Ikigai', 'createdAt': '2026-01-01'}, user_id='alice')
+
+    backend = lm.set_profile_backend('sqlite')
+    try:
+        assert [profile['id'] for profile in lm.load_why_profiles()] == ['p1']
+        assert [profile['id'] for profile in lm.load_why_profiles(user_id='alice')] == ['p2']
+        assert lm.get_ikigai_profile('i1', user_id='alice')['success']
+        assert backend.get_meta('json_migrated_at')
+
+        # Rows already in SQLite win, and the marker stops a second import
+        lm.save_why_profile(why_profile('p1', whyStatement='Edited in SQLite'))
+        assert lm.migrate_json_profiles_to_sqlite(backend)['skipped']
+        report = lm.migrate_json_profiles_to_sqlite(backend, force=True)
+        assert report['total'] == {'why': 2, 'ikigai': 1}
+        assert report['migrated'] == {'why': 0, 'ikigai': 0}
+        assert lm.get_why_profile('p1')['profile']['whyStatement'] == 'Edited in SQLite'
+    finally:
+        backend.close()
+
+    # The JSON files are left in place for the JSON backend
+    monkeypatch.setattr(lm, '_profile_backend', lm.JsonFileProfileBackend())
+    assert lm.get_why_profile('p1')['profile']['whyStatement'] == 'To help'